@@ -0,0 +1,63 @@
+import sys
+import argparse
+
+from src.utils import profiling
+from src.utils.batch_render import find_workbooks, build_jobs, run_batch, print_summary
+
+
+def parse_mapping(items):
+    """Convierte ['Fecha Inicio=Inicio', ...] en {'Fecha Inicio': 'Inicio', ...}."""
+    if not items:
+        return None
+    mapping = {}
+    for item in items:
+        field, sep, column = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Mapeo no válido: {item!r} (se espera CAMPO=COLUMNA)")
+        mapping[field.strip()] = column.strip()
+    return mapping
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los Gantt de varios libros Excel sin interfaz gráfica.")
+    parser.add_argument("paths", nargs="+", help="Libros Excel o directorios que los contienen")
+    parser.add_argument("--sheet", action="append", dest="sheets", help="Hoja a dibujar (repetible; por defecto todas)")
+    parser.add_argument("--header", type=int, help="Fila de cabecera (0-based; por defecto se detecta)")
+    parser.add_argument("--map", action="append", dest="mapping", metavar="CAMPO=COLUMNA",
+                        help="Columna del Excel para un campo, p.ej. 'Fecha Inicio=Inicio' (por defecto se detecta)")
+    parser.add_argument("--output-dir", help="Directorio de salida (por defecto, junto a cada libro)")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "pdf"])
+    parser.add_argument("--workers", type=int, help="Procesos en paralelo (por defecto, uno por CPU)")
+    parser.add_argument("--force", action="store_true", help="Regenera aunque la salida sea más nueva que el libro")
+    parser.add_argument("--engine", choices=["cache", "stream"], help="Motor de lectura del Excel (por defecto, LOAD_ENGINE)")
+    parser.add_argument("--no-cache", action="store_true", help="No usa la caché de tareas en disco")
+    parser.add_argument("--profile", action="store_true", help="Mide tiempo y memoria de cada etapa (también GANTT_PROFILE=1)")
+    parser.add_argument("--cprofile", action="store_true", help="Como --profile y además guarda un volcado de cProfile por hoja")
+    args = parser.parse_args(argv)
+    if args.profile or args.cprofile:
+        # Los procesos del pool lo heredan a través de GANTT_PROFILE
+        profiling.enable(cprofile=args.cprofile)
+
+    try:
+        column_mapping = parse_mapping(args.mapping)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    jobs, up_to_date = build_jobs(
+        find_workbooks(args.paths),
+        sheets=args.sheets,
+        header=args.header,
+        column_mapping=column_mapping,
+        output_dir=args.output_dir,
+        fmt=args.format,
+        force=args.force,
+        use_cache=False if args.no_cache else None,
+        engine=args.engine
+    )
+    results, elapsed = run_batch(jobs, workers=args.workers)
+    print_summary(results, elapsed, up_to_date)
+    return 1 if any(r["status"] == "error" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Prueba de carga del servicio de render (server.py): lanza peticiones
+concurrentes y mide rendimiento y latencias.
+
+    python -m benchmarks.load_test --start-server                 # arranca una instancia local
+    python -m benchmarks.load_test --url http://127.0.0.1:8765 --requests 200 --concurrency 16
+    python -m benchmarks.load_test --start-server --distinct 20 --rows 5000 --format svg
+
+Con --distinct N las peticiones se reparten entre N títulos distintos: la
+primera de cada uno se dibuja y el resto sale de la caché del servicio.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import statistics
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.workbook_generator import generate_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def post(url, data, params, timeout):
+    """Una petición; devuelve (código, X-Cache, segundos, bytes de respuesta)."""
+    request = Request(f"{url}/render?{urlencode(params, doseq=True)}", data=data, method="POST",
+                      headers={"Content-Type": "application/octet-stream"})
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            return response.status, response.headers.get("X-Cache"), time.perf_counter() - start, len(body)
+    except HTTPError as e:
+        e.read()
+        return e.code, None, time.perf_counter() - start, 0
+    except (URLError, OSError):
+        return None, None, time.perf_counter() - start, 0
+
+
+def wait_ready(url, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urlopen(f"{url}/health", timeout=1) as response:
+                return json.loads(response.read())
+        except (URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"el servicio no responde en {url}")
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def report(results, elapsed):
+    latencies = [r[2] for r in results if r[0] == 200]
+    codes = {}
+    for r in results:
+        key = r[0] if r[0] == 200 else (r[0] or "sin conexión")
+        codes[key] = codes.get(key, 0) + 1
+    outcomes = {}
+    for r in results:
+        if r[1]:
+            outcomes[r[1]] = outcomes.get(r[1], 0) + 1
+
+    print(f"{len(results)} peticiones en {elapsed:.2f}s: {len(results) / elapsed:.1f} peticiones/s")
+    print(f"Respuestas: {codes}; caché: {outcomes}")
+    if latencies:
+        print(
+            f"Latencia (200): media {statistics.mean(latencies) * 1000:.0f} ms, "
+            f"p50 {percentile(latencies, 0.5) * 1000:.0f} ms, p90 {percentile(latencies, 0.9) * 1000:.0f} ms, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms, máx. {max(latencies) * 1000:.0f} ms"
+        )
+    for outcome in ("miss", "hit"):
+        subset = [r[2] for r in results if r[1] == outcome]
+        if subset:
+            print(f"  {outcome}: p50 {percentile(subset, 0.5) * 1000:.0f} ms ({len(subset)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de render de Gantt.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="Servicio a probar")
+    parser.add_argument("--start-server", action="store_true",
+                        help="Arranca server.py en un puerto libre con una caché temporal y lo para al terminar")
+    parser.add_argument("--workers", type=int, default=2, help="Con --start-server: procesos del servicio")
+    parser.add_argument("--workbook", help="Libro a subir (por defecto, uno sintético)")
+    parser.add_argument("--sheet", help="Hoja del libro (por defecto, la primera)")
+    parser.add_argument("--rows", type=int, default=2000, help="Libro sintético: filas")
+    parser.add_argument("--tasks", type=int, default=400, help="Libro sintético: tareas distintas")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "pdf"])
+    parser.add_argument("--requests", type=int, default=100, help="Peticiones en total")
+    parser.add_argument("--concurrency", type=int, default=8, help="Peticiones simultáneas")
+    parser.add_argument("--distinct", type=int, default=4, help="Renders distintos entre los que se reparten")
+    parser.add_argument("--timeout", type=float, default=300, help="Espera máxima por petición (s)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.workbook:
+            with open(args.workbook, "rb") as f:
+                data = f.read()
+            base = {"sheet": args.sheet} if args.sheet else {}
+        else:
+            path = os.path.join(tmp, "carga.xlsx")
+            info = generate_workbook(path, rows=args.rows, tasks=args.tasks)
+            with open(path, "rb") as f:
+                data = f.read()
+            base = {"sheet": info["sheet_name"], "header": info["header"],
+                    "map": [f"{field}={column}" for field, column in info["column_mapping"].items()]}
+        base["format"] = args.format
+
+        server = None
+        url = args.url.rstrip("/")
+        if args.start_server:
+            import socket
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+            server = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, "server.py"), "--port", str(port),
+                 "--workers", str(args.workers), "--cache-dir", os.path.join(tmp, "cache")],
+                cwd=ROOT
+            )
+            url = f"http://127.0.0.1:{port}"
+        try:
+            wait_ready(url)
+            params = [dict(base, title=f"carga {i % args.distinct}") for i in range(args.requests)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                results = list(pool.map(lambda p: post(url, data, p, args.timeout), params))
+            elapsed = time.perf_counter() - start
+            report(results, elapsed)
+            with urlopen(f"{url}/health", timeout=5) as response:
+                print(f"Servicio: {json.loads(response.read())}")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    return 0 if all(r[0] == 200 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Mide por etapas la carga, agrupación y dibujo del Gantt sobre libros
+sintéticos, sin ventana (backend Agg), y compara con una línea base.
+
+    python -m benchmarks.run_benchmarks                      # todos los escenarios
+    python -m benchmarks.run_benchmarks --scenario medium --repeat 5
+    python -m benchmarks.run_benchmarks --rows 50000 --tasks 8000 --string-dates
+    python -m benchmarks.run_benchmarks --save-baseline      # fija la línea base
+
+La línea base depende de la máquina: tras cambiar de equipo hay que volver a
+fijarla con --save-baseline antes de comparar.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.workbook_generator import generate_workbook
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+STAGES = ["parse", "coerce", "group", "build", "savefig", "window", "hover"]
+STAGE_NAMES = {
+    "parse": "lectura del Excel",
+    "coerce": "conversión de fechas",
+    "group": "agrupación",
+    "build": "figura exportable",
+    "savefig": "savefig a 300 dpi",
+    "window": "ventana y primer dibujado",
+    "hover": "eventos de hover",
+}
+
+# Parámetros de generate_workbook y motor de lectura de cada escenario
+SCENARIOS = {
+    "bundled": dict(rows=12, responsables=3, tasks=10, span_days=120),
+    "medium": dict(rows=2000, responsables=8, tasks=400, span_days=365),
+    "medium-text": dict(rows=2000, responsables=8, tasks=400, span_days=365, string_dates=True),
+    "large": dict(rows=20000, responsables=20, tasks=3000, span_days=1095),
+    "large-stream": dict(rows=20000, responsables=20, tasks=3000, span_days=1095, engine="stream"),
+}
+
+# Empeoramiento relativo admitido por etapa antes de darlo por regresión
+DEFAULT_THRESHOLD = 0.25
+STAGE_THRESHOLDS = {"hover": 0.5, "window": 0.35}
+# Diferencias por debajo de este tiempo son ruido aunque superen el umbral
+MIN_DELTA_S = 0.01
+
+HOVER_EVENTS = 500
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _simulate_hover(fig, n_events, rng):
+    """Movimientos del ratón en posiciones aleatorias del área de dibujo, por el mismo camino que los reales."""
+    from matplotlib.backend_bases import MouseEvent
+
+    ax = fig.axes[0]
+    x0, y0, x1, y1 = ax.bbox.extents
+    points = rng.uniform((x0, y0), (x1, y1), size=(n_events, 2))
+    for x, y in points:
+        event = MouseEvent("motion_notify_event", fig.canvas, x, y)
+        fig.canvas.callbacks.process(event.name, event)
+
+
+def run_once(info, file_path, engine, hover_events, rng, output_dir):
+    """Una pasada completa por el proceso; devuelve los segundos de cada etapa."""
+    import matplotlib.pyplot as plt
+    from src.utils.workbook_cache import workbook_cache
+    from src.utils.task_loader import _read_tasks, _prepare_tasks, group_tasks_by_group
+    from src.utils.gantt_utils import _build_gantt_figure, render_gantt, save_figure
+
+    # Cada pasada lee el libro del disco, como la primera carga de la GUI
+    workbook_cache.clear()
+    times = {}
+    mapping = info["column_mapping"]
+    raw, times["parse"] = _timed(_read_tasks, file_path, info["sheet_name"], info["header"], None, None, mapping, engine)
+    tasks, times["coerce"] = _timed(_prepare_tasks, raw, mapping)
+    grouped, times["group"] = _timed(group_tasks_by_group, tasks)
+
+    output_path = os.path.join(output_dir, "gantt.png")
+    title = "benchmark"
+    fig, times["build"] = _timed(render_gantt, grouped, title, info["sheet_name"])
+    _, times["savefig"] = _timed(save_figure, fig, output_path)
+
+    def open_window():
+        fig = _build_gantt_figure(grouped.copy(), title, info["sheet_name"], window=True)
+        fig.canvas.draw()
+        return fig
+
+    fig, times["window"] = _timed(open_window)
+    _, times["hover"] = _timed(_simulate_hover, fig, hover_events, rng)
+    plt.close(fig)
+    return times, len(tasks), len(grouped)
+
+
+def run_scenario(name, params, repeat, hover_events, workdir):
+    from config.settings import LOAD_ENGINE
+
+    params = dict(params)
+    engine = params.pop("engine", LOAD_ENGINE)
+    file_path = os.path.join(workdir, f"{name}.xlsx")
+    info, generate_time = _timed(generate_workbook, file_path, **params)
+    rng = np.random.default_rng(0)
+
+    runs = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        times, n_rows, n_grouped = run_once(info, file_path, engine, hover_events, rng, workdir)
+        for stage, elapsed in times.items():
+            runs[stage].append(elapsed)
+
+    stages = {
+        stage: {"min": min(values), "median": statistics.median(values), "runs": values}
+        for stage, values in runs.items()
+    }
+    summary = ", ".join(f"{stage} {stages[stage]['min']:.3f}s" for stage in STAGES)
+    print(f"{name} [{engine}]: {n_rows} filas, {n_grouped} barras (libro generado en {generate_time:.2f}s) - {summary}")
+    return {
+        "params": dict(params, engine=engine),
+        "rows": n_rows,
+        "bars": n_grouped,
+        "hover_events": hover_events,
+        "stages": stages,
+    }
+
+
+def environment():
+    import pandas as pd
+    import matplotlib
+    import openpyxl
+
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "openpyxl": openpyxl.__version__,
+        "backend": matplotlib.get_backend(),
+    }
+
+
+def compare(results, baseline, threshold=None):
+    """
+    Compara el mínimo de cada etapa con el de la línea base. Devuelve las
+    regresiones como (escenario, etapa, base, actual).
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            print(f"{name}: sin línea base")
+            continue
+        if base["params"] != current["params"] or base["hover_events"] != current["hover_events"]:
+            print(f"{name}: los parámetros no coinciden con la línea base, no se compara")
+            continue
+        print(f"\n{name}")
+        for stage in STAGES:
+            if stage not in base["stages"]:
+                continue
+            before = base["stages"][stage]["min"]
+            after = current["stages"][stage]["min"]
+            limit = threshold if threshold is not None else STAGE_THRESHOLDS.get(stage, DEFAULT_THRESHOLD)
+            regressed = after > before * (1 + limit) and after - before > MIN_DELTA_S
+            ratio = after / before if before else float("inf")
+            mark = "  REGRESIÓN" if regressed else ""
+            print(f"  {STAGE_NAMES[stage]:<27} {before:8.3f}s -> {after:8.3f}s  x{ratio:.2f} (máx. x{1 + limit:.2f}){mark}")
+            if regressed:
+                regressions.append((name, stage, before, after))
+    return regressions
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapas de la carga y el dibujo del Gantt (sin ventana).")
+    parser.add_argument("--scenario", action="append", dest="scenarios", choices=list(SCENARIOS),
+                        help="Escenario a medir (repetible; por defecto todos)")
+    parser.add_argument("--rows", type=int, help="Escenario propio: filas del libro")
+    parser.add_argument("--responsables", type=int, default=8, help="Escenario propio: responsables distintos")
+    parser.add_argument("--tasks", type=int, default=500, help="Escenario propio: tareas distintas")
+    parser.add_argument("--span-days", type=int, default=365, help="Escenario propio: días entre el primer y el último inicio")
+    parser.add_argument("--string-dates", action="store_true", help="Escenario propio: fechas como texto y no nativas")
+    parser.add_argument("--engine", choices=["cache", "stream"], help="Escenario propio: motor de lectura (por defecto, LOAD_ENGINE)")
+    parser.add_argument("--repeat", type=int, default=3, help="Pasadas por escenario; se compara la más rápida")
+    parser.add_argument("--hover-events", type=int, default=HOVER_EVENTS, help="Movimientos de ratón simulados")
+    parser.add_argument("--output", default="benchmark_results.json", help="Fichero JSON de resultados")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Línea base con la que comparar")
+    parser.add_argument("--save-baseline", action="store_true", help="Guarda los resultados como línea base en lugar de comparar")
+    parser.add_argument("--threshold", type=float, help="Empeoramiento relativo admitido en todas las etapas (p.ej. 0.25)")
+    parser.add_argument("--workdir", help="Directorio para los libros generados (por defecto, uno temporal)")
+    args = parser.parse_args(argv)
+
+    # Sin ventana: todo se dibuja en memoria, también en máquinas sin pantalla
+    import matplotlib
+    matplotlib.use("Agg")
+    # Los botones de la ventana no admiten tight_layout; el aviso sale en cada pasada
+    warnings.filterwarnings("ignore", message="This figure includes Axes that are not compatible with tight_layout")
+
+    if args.rows is not None:
+        custom = dict(rows=args.rows, responsables=args.responsables, tasks=args.tasks,
+                      span_days=args.span_days, string_dates=args.string_dates)
+        if args.engine:
+            custom["engine"] = args.engine
+        scenarios = {"custom": custom}
+    else:
+        scenarios = {name: SCENARIOS[name] for name in args.scenarios or SCENARIOS}
+
+    results = {"environment": environment(), "repeat": args.repeat, "scenarios": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        for name, params in scenarios.items():
+            results["scenarios"][name] = run_scenario(name, params, args.repeat, args.hover_events, workdir)
+
+    _write_json(args.output, results)
+    print(f"\nResultados en {args.output}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, results)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No hay línea base en {args.baseline}: usa --save-baseline para crearla")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} etapas más lentas que la línea base")
+        return 1
+    print("\nSin regresiones respecto a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import openpyxl
+
+from config.settings import DATE_FORMAT
+
+SHEET_NAME = "versión 1"
+# Como en los libros 'Gant mejoras': dos filas vacías antes de la cabecera
+HEADER = 2
+COLUMNS = ["Tareas", "Responsable", "Fecha Inicio", "Duracion (semanas)", "Fecha Fin"]
+COLUMN_MAPPING = {
+    "Tareas": "Tareas",
+    "Responsable": "Responsable",
+    "Fecha Inicio": "Fecha Inicio",
+    "Fecha Fin": "Fecha Fin",
+    "Duración": "Duracion (semanas)",
+}
+
+FIRST_DAY = datetime(2024, 3, 4)
+MAX_WEEKS = 8
+
+
+def _responsable_names(n, rng):
+    """Nombres con variantes de espacios y mayúsculas, como los escritos a mano en el Excel."""
+    names = []
+    for i in range(n):
+        name = f"responsable {i + 1:02d}"
+        variants = [name.title(), name, f" {name.title()} ", name.upper()]
+        names.append(variants[rng.integers(len(variants))] if i % 3 == 0 else variants[0])
+    return names
+
+
+def generate_workbook(file_path, rows=1000, responsables=8, tasks=200, span_days=365,
+                      string_dates=False, week_columns=21, seed=0):
+    """
+    Escribe un libro con la forma de las hojas 'versión N' de los Gantt de
+    mejoras: dos filas vacías, la cabecera, una fila por tramo de tarea y la
+    rejilla semanal de 0/1 a la derecha (los valores que dejan las fórmulas).
+
+    Cada una de las tasks tareas distintas pertenece a un responsable y se
+    repite en varios tramos hasta sumar rows filas; los inicios se reparten
+    en span_days días. Con string_dates las fechas se escriben como texto en
+    DATE_FORMAT en lugar de fechas nativas de Excel. Devuelve la hoja, la
+    fila de cabecera y el mapeo de columnas para load_tasks.
+    """
+    rng = np.random.default_rng(seed)
+    owners = _responsable_names(responsables, rng)
+    task_owner = rng.integers(responsables, size=tasks)
+    task_names = [f"- Mejora {i + 1:05d}: revisión del circuito de {owners[o].strip().lower()}"
+                  for i, o in enumerate(task_owner)]
+
+    task_ids = rng.integers(tasks, size=rows)
+    offsets = rng.integers(span_days, size=rows)
+    weeks = rng.integers(1, MAX_WEEKS + 1, size=rows)
+    grid = [FIRST_DAY + timedelta(weeks=w) for w in range(week_columns)]
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_NAME)
+    for _ in range(HEADER):
+        ws.append([])
+    ws.append(COLUMNS + grid)
+
+    for task_id, offset, n_weeks in zip(task_ids, offsets, weeks):
+        start = FIRST_DAY + timedelta(days=int(offset))
+        end = start + timedelta(weeks=int(n_weeks))
+        marks = [int(start <= day < end) for day in grid]
+        if string_dates:
+            start, end = start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)
+        ws.append([task_names[task_id], owners[task_owner[task_id]], start, int(n_weeks), end] + marks)
+
+    wb.save(file_path)
+    return {"sheet_name": SHEET_NAME, "header": HEADER, "column_mapping": dict(COLUMN_MAPPING)}
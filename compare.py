@@ -0,0 +1,73 @@
+import sys
+import argparse
+
+from src.utils import profiling
+from src.utils.batch_render import load_sheet
+from src.utils.dashboard import sheet_title
+from batch import parse_mapping
+
+
+def _load(parser, file_path, sheet_name, header, column_mapping, use_cache, engine):
+    """Tareas agrupadas de una hoja (por defecto, la primera del libro); sale con error si no hay."""
+    from src.utils.workbook_cache import get_sheet_names
+
+    sheet_name = sheet_name or get_sheet_names(file_path)[0]
+    tasks, reason = load_sheet(file_path, sheet_name, header, column_mapping, use_cache=use_cache, engine=engine)
+    if tasks is None:
+        parser.error(f"{sheet_title(file_path, sheet_name)}: {reason}")
+    return sheet_name, tasks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compara dos versiones de un plan: el Gantt actual con el plan base como barras fantasma.")
+    parser.add_argument("base", help="Libro Excel del plan base")
+    parser.add_argument("current", help="Libro Excel del plan actual")
+    parser.add_argument("--sheet", help="Hoja del plan actual (por defecto, la primera)")
+    parser.add_argument("--base-sheet", help="Hoja del plan base (por defecto, la de --sheet o la primera)")
+    parser.add_argument("--header", type=int, help="Fila de cabecera (0-based; por defecto se detecta)")
+    parser.add_argument("--map", action="append", dest="mapping", metavar="CAMPO=COLUMNA",
+                        help="Columna del Excel para un campo, p.ej. 'Fecha Inicio=Inicio' (por defecto se detecta)")
+    parser.add_argument("--output", help="Fichero de salida (.png, .svg o .pdf); sin él se abre una ventana")
+    parser.add_argument("--table", help="Guarda además la tabla de cambios (.xlsx o .csv)")
+    parser.add_argument("--engine", choices=["cache", "stream"], help="Motor de lectura del Excel (por defecto, LOAD_ENGINE)")
+    parser.add_argument("--no-cache", action="store_true", help="No usa la caché de tareas en disco")
+    parser.add_argument("--profile", action="store_true", help="Mide tiempo y memoria de cada etapa (también GANTT_PROFILE=1)")
+    parser.add_argument("--cprofile", action="store_true", help="Como --profile y además guarda un volcado de cProfile")
+    args = parser.parse_args(argv)
+    if args.profile or args.cprofile:
+        profiling.enable(cprofile=args.cprofile)
+
+    try:
+        column_mapping = parse_mapping(args.mapping)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    use_cache = False if args.no_cache else None
+    base_sheet, baseline = _load(parser, args.base, args.base_sheet or args.sheet, args.header, column_mapping,
+                                 use_cache, args.engine)
+    sheet_name, tasks = _load(parser, args.current, args.sheet, args.header, column_mapping, use_cache, args.engine)
+
+    if args.table:
+        from src.utils.plan_diff import diff_plans, write_diff
+
+        write_diff(diff_plans(baseline, tasks), args.table)
+        print(f"Tabla de cambios guardada en {args.table}")
+
+    if args.output:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from src.utils.gantt_utils import plot_gantt
+
+    title = f"{sheet_title(args.current, sheet_name)} vs {sheet_title(args.base, base_sheet)}"
+    plot_gantt(tasks, TITLE=title, output_path=args.output, baseline=baseline)
+    if args.output:
+        print(f"Comparación guardada en {args.output}")
+    else:
+        plt.show()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
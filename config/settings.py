@@ -16,6 +16,62 @@ MONTH_FONT_SIZE = 10
 MONTH_FONT_WEIGHT = "bold"
 
 BAR_COLOR = "#30C7DC"  # Color por defecto si no hay responsable
+CRITICAL_COLOR = "#D62728"  # Contorno de las tareas de la ruta crítica
+LINK_COLOR = "#A0A0A0"  # Líneas de dependencia entre tareas
+OVERLOAD_COLOR = "#D62728"  # Rayado de la carga por encima de la capacidad
+BASELINE_COLOR = "#D9D9D9"  # Barras fantasma del plan base al comparar dos versiones
 
 FONT_FAMILY = "sans-serif"
-FONT_SANS_SERIF = ["Arial", "Roboto", "DejaVu Sans"]
\ No newline at end of file
+FONT_SANS_SERIF = ["Arial", "Roboto", "DejaVu Sans"]
+
+# cache
+WORKBOOK_CACHE_MAX_MB = 256  # Memoria máxima para hojas Excel ya parseadas
+
+TASK_CACHE_ENABLED = True  # Caché en disco de las tareas ya cargadas (GANTT_NO_CACHE=1 la desactiva)
+TASK_CACHE_DIR = ".gantt_cache"  # Relativa: junto al libro Excel
+
+# arranque
+WARM_IMPORTS = True  # Precarga pandas/matplotlib en segundo plano al abrir la ventana
+
+# carga
+LOAD_ENGINE = "cache"  # "cache": hoja completa vía workbook_cache; "stream": solo columnas mapeadas
+STREAM_EMPTY_ROWS = 20  # El motor "stream" se detiene tras estas filas vacías seguidas
+
+# recarga
+LIVE_RELOAD = True  # Vigila el libro de cada gráfico abierto y aplica los cambios al guardarlo
+LIVE_RELOAD_INTERVAL_MS = 1000  # Cada cuánto se comprueba la fecha de modificación del libro
+
+# nivel de detalle
+LOD_MAX_BARS = 2000  # Con más barras visibles, cada responsable se resume en tramos
+LOD_MERGE_GAP_PT = 1.0  # Huecos menores (en puntos) se funden en un mismo tramo
+LOD_ROW_PT = 1.0  # Alto mínimo (en puntos) de una banda de filas en el resumen
+DAY_TICK_SPACING_PT = 14  # Separación mínima entre los lunes del eje X
+MONTH_TICK_SPACING_PT = 45  # Separación mínima entre los meses del eje secundario
+
+# eje de tareas
+VISIBLE_ROWS = 30  # Filas visibles en la ventana; con más, el eje Y se desplaza con la rueda y AvPág/RePág
+ROW_LABEL_SPACING_PT = 11  # Separación mínima entre etiquetas de tarea; con menos se muestra una de cada k
+EXPORT_MAX_HEIGHT_IN = 40  # Alto máximo de una imagen exportada con todas las filas
+
+# perfilado
+PROFILE_ENABLED = False  # Tiempos y memoria por etapa (también con GANTT_PROFILE=1 o --profile)
+PROFILE_MEMORY = True  # Pico de memoria por etapa con tracemalloc; ralentiza las etapas que reservan mucho
+PROFILE_DIR = "gantt_profile"  # Relativa al directorio de trabajo: profile.jsonl y los volcados de cProfile
+
+# exportación
+EXPORT_FORMAT = "png"  # Formato inicial del botón Guardar: "png", "svg" o "pdf" (vectoriales, más rápidos con muchas barras)
+EXPORT_CACHE_MAX_MB = 256  # Imagen exportada que se conserva para Guardar/Copiar mientras no cambie el gráfico
+
+# servicio de render
+SERVICE_HOST = "127.0.0.1"  # Solo accesible desde este equipo; "0.0.0.0" lo abre a la red
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2  # Procesos que dibujan a la vez
+SERVICE_MAX_PENDING = 16  # Renders distintos en cola o en curso; por encima se responde 503
+SERVICE_MAX_UPLOAD_MB = 50  # Tamaño máximo del libro subido
+SERVICE_TIMEOUT_S = 120  # Tiempo máximo de espera por un render
+SERVICE_CACHE_DIR = "gantt_render_cache"  # Relativa al directorio de trabajo: imágenes ya dibujadas
+SERVICE_CACHE_MAX_MB = 512  # Al superarlo se borran las imágenes usadas hace más tiempo
+
+# carga de responsables
+SHOW_RESOURCE_LOAD = False  # Panel con las tareas simultáneas de cada responsable bajo las barras
+RESOURCE_CAPACITY = 1  # Tareas a la vez que admite un responsable; por encima, sobrecarga
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+
+from src.utils import profiling
+from src.utils.batch_render import find_workbooks
+from src.utils.dashboard import build_sources, load_sources, print_results, dashboard_title, sheet_title
+from batch import parse_mapping
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Dibuja varias hojas o libros Excel como un dashboard: Gantt apilados con el mismo eje de fechas.")
+    parser.add_argument("paths", nargs="+", help="Libros Excel o directorios que los contienen")
+    parser.add_argument("--sheet", action="append", dest="sheets", help="Hoja a incluir (repetible; por defecto todas)")
+    parser.add_argument("--header", type=int, help="Fila de cabecera (0-based; por defecto se detecta)")
+    parser.add_argument("--map", action="append", dest="mapping", metavar="CAMPO=COLUMNA",
+                        help="Columna del Excel para un campo, p.ej. 'Fecha Inicio=Inicio' (por defecto se detecta)")
+    parser.add_argument("--output", help="Fichero de salida (.png, .svg o .pdf); sin él se abre una ventana")
+    parser.add_argument("--workers", type=int, help="Hojas que se cargan en paralelo (por defecto, una por CPU)")
+    parser.add_argument("--engine", choices=["cache", "stream"], help="Motor de lectura del Excel (por defecto, LOAD_ENGINE)")
+    parser.add_argument("--no-cache", action="store_true", help="No usa la caché de tareas en disco")
+    parser.add_argument("--profile", action="store_true", help="Mide tiempo y memoria de cada etapa (también GANTT_PROFILE=1)")
+    parser.add_argument("--cprofile", action="store_true", help="Como --profile y además guarda un volcado de cProfile")
+    args = parser.parse_args(argv)
+    if args.profile or args.cprofile:
+        profiling.enable(cprofile=args.cprofile)
+
+    try:
+        column_mapping = parse_mapping(args.mapping)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    sources = build_sources(find_workbooks(args.paths), args.sheets, args.header, column_mapping)
+    if not sources:
+        parser.error("no hay hojas que dibujar")
+
+    start = time.perf_counter()
+    results = load_sources(sources, workers=args.workers,
+                           use_cache=False if args.no_cache else None, engine=args.engine)
+    print_results(results, time.perf_counter() - start)
+    panels = [(sheet_title(r["file_path"], r["sheet_name"]), r["tasks"]) for r in results if r["status"] == "ok"]
+    if not panels:
+        print("Ninguna hoja tiene tareas que dibujar")
+        return 1
+
+    if args.output:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from src.utils.gantt_utils import plot_dashboard
+
+    plot_dashboard(panels, TITLE=dashboard_title(sources), output_path=args.output,
+                   file_path=os.path.abspath(sources[0]["file_path"]))
+    if args.output:
+        print(f"Dashboard guardado en {args.output}")
+    else:
+        plt.show()
+    return 1 if any(r["status"] == "error" for r in results) else 0
+
+
+if __name__ == "__main__":
+    # El ejecutable de PyInstaller relanza el programa en cada proceso del pool
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,17 +1,73 @@
-from src.utils.gantt_utils import load_tasks, group_tasks_by_group, plot_gantt
+import time
+import argparse
+import threading
+import multiprocessing
+from functools import partial
+
+from config.settings import WARM_IMPORTS
+from src.utils import profiling
 from src.utils.excel_config_gui import show_excel_config
 
-def generate_gantt(config):
-    tasks = load_tasks(
+def _warm_imports():
+    """Importa pandas y matplotlib en segundo plano mientras se elige el archivo."""
+    try:
+        import src.utils.task_cache  # noqa: F401
+        import src.utils.gantt_utils  # noqa: F401
+    except Exception as e:
+        print(f"Error precargando módulos: {e}")
+
+def load_gantt_tasks(config):
+    """Tareas agrupadas de la hoja configurada; se ejecuta en un hilo de trabajo de la ventana."""
+    from src.utils.task_cache import load_grouped_tasks
+
+    _, grouped_tasks = load_grouped_tasks(
         file_path=config["file_path"],
         sheet_name=config["sheet_name"],
         header=config["header"],
         column_mapping=config["column_mapping"]
     )
-    
-    grouped_tasks = group_tasks_by_group(tasks)
+    return grouped_tasks
+
+def generate_gantt(config, grouped_tasks):
+    # Importación diferida: la ventana de configuración no espera a pandas/matplotlib
+    from src.utils.gantt_utils import plot_gantt
+
     TITLE= config["file_path"].split("/")[-1].rsplit(".", 1)[0]
-    plot_gantt(grouped_tasks, TITLE=TITLE, sheet_name=config["sheet_name"], output_path=None, file_path=config["file_path"])
+    with profiling.stage("generate_gantt"):
+        plot_gantt(grouped_tasks, TITLE=TITLE, sheet_name=config["sheet_name"], output_path=None,
+                   file_path=config["file_path"], reload=partial(load_gantt_tasks, config))
+
+def load_dashboard(sources):
+    """Carga en paralelo las hojas del dashboard; se ejecuta en un hilo de trabajo de la ventana."""
+    from src.utils.dashboard import load_sources, print_results
+
+    start = time.perf_counter()
+    results = load_sources(sources)
+    print_results(results, time.perf_counter() - start)
+    return results
+
+def generate_dashboard(sources, results):
+    from src.utils.dashboard import dashboard_title, sheet_title
+    from src.utils.gantt_utils import plot_dashboard
+
+    panels = [(sheet_title(r["file_path"], r["sheet_name"]), r["tasks"]) for r in results if r["status"] == "ok"]
+    if not panels:
+        print("Ninguna hoja tiene tareas que dibujar")
+        return
+    with profiling.stage("generate_dashboard"):
+        plot_dashboard(panels, TITLE=dashboard_title(sources), output_path=None, file_path=sources[0]["file_path"])
 
 if __name__ == "__main__":
-    show_excel_config(on_load=generate_gantt)
\ No newline at end of file
+    # El ejecutable de PyInstaller relanza el programa en cada proceso del pool de carga
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Genera un Gantt a partir de un libro Excel.")
+    parser.add_argument("--profile", action="store_true", help="Mide tiempo y memoria de cada etapa (también GANTT_PROFILE=1)")
+    parser.add_argument("--cprofile", action="store_true", help="Como --profile y además guarda un volcado de cProfile por etapa")
+    args = parser.parse_args()
+    if args.profile or args.cprofile:
+        profiling.enable(cprofile=args.cprofile)
+
+    if WARM_IMPORTS:
+        threading.Thread(target=_warm_imports, daemon=True).start()
+    show_excel_config(on_load=generate_gantt, on_dashboard=generate_dashboard,
+                      load=load_gantt_tasks, load_dashboard=load_dashboard)
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Servicio HTTP local que dibuja el Gantt de un libro Excel subido.
+
+    python server.py --port 8765 --workers 4
+
+    POST /render?sheet=versión 1&header=2&format=svg    (cuerpo: el libro tal cual)
+    POST /render    (multipart/form-data: campo 'file' con el libro y el resto como campos)
+    GET  /health    (estado del pool y de la caché, en JSON)
+
+Parámetros: sheet (por defecto la primera hoja), header (fila de cabecera
+0-based; por defecto se detecta), map=CAMPO=COLUMNA (repetible; por
+defecto se detecta), format (png, svg o pdf) y title (por defecto, el
+nombre del fichero subido). La cabecera X-Cache indica si la imagen
+venía de la caché (hit), se ha dibujado (miss) o se ha compartido con
+otra petición igual en curso (shared).
+"""
+import sys
+import json
+import signal
+import traceback
+import argparse
+import multiprocessing
+from email import policy
+from email.parser import BytesParser
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from config.settings import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_MAX_PENDING,
+    SERVICE_MAX_UPLOAD_MB, SERVICE_CACHE_DIR, SERVICE_CACHE_MAX_MB
+)
+from src.utils.render_service import RenderService, ResultCache, RenderError, ServiceBusy, FORMATS
+from batch import parse_mapping
+
+
+class BadRequest(Exception):
+    pass
+
+
+def parse_multipart(content_type, body):
+    """Campos y fichero de un cuerpo multipart/form-data: ({campo: [valores]}, nombre, bytes)."""
+    message = BytesParser(policy=policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    if not message.is_multipart():
+        raise BadRequest("cuerpo multipart no válido")
+    fields, filename, data = {}, None, None
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if part.get_filename() is not None or name == "file":
+            filename, data = part.get_filename(), part.get_payload(decode=True)
+        else:
+            fields.setdefault(name, []).append(part.get_content().strip())
+    if data is None:
+        raise BadRequest("falta el campo 'file' con el libro")
+    return fields, filename, data
+
+
+def render_params(fields):
+    """Parámetros de RenderService.render a partir de los campos de la petición."""
+    def first(name):
+        values = fields.get(name)
+        return values[0] if values else None
+
+    header = first("header")
+    try:
+        header = int(header) if header not in (None, "") else None
+    except ValueError:
+        raise BadRequest(f"header no válido: {header!r}")
+    fmt = (first("format") or "png").lower()
+    if fmt not in FORMATS:
+        raise BadRequest(f"formato no válido: {fmt!r} (png, svg o pdf)")
+    try:
+        column_mapping = parse_mapping(fields.get("map"))
+    except argparse.ArgumentTypeError as e:
+        raise BadRequest(str(e))
+    return {
+        "sheet_name": first("sheet") or None,
+        "header": header,
+        "column_mapping": column_mapping,
+        "fmt": fmt,
+        "title": first("title") or None,
+    }
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = "GanttRender/1"
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self._send_json(200, dict(self.server.service.status(), status="ok"))
+        else:
+            self._send_json(404, {"error": "no encontrado"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/render":
+            self._send_json(404, {"error": "no encontrado"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = 0
+        if length <= 0:
+            self._send_json(411, {"error": "falta el libro en el cuerpo (Content-Length)"})
+            return
+        if length > SERVICE_MAX_UPLOAD_MB * 1024 * 1024:
+            self._send_json(413, {"error": f"el libro supera {SERVICE_MAX_UPLOAD_MB} MB"})
+            self.close_connection = True
+            return
+        body = self.rfile.read(length)
+
+        try:
+            fields = parse_qs(url.query)
+            filename = fields.pop("filename", [None])[0]
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith("multipart/form-data"):
+                form, filename, body = parse_multipart(content_type, body)
+                fields.update(form)
+            params = render_params(fields)
+            image, outcome, key = self.server.service.render(body, filename or "libro.xlsx", **params)
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except RenderError as e:
+            self._send_json(422, {"error": str(e)})
+        except ServiceBusy as e:
+            self._send_json(503, {"error": f"servicio ocupado: {e}"}, {"Retry-After": "5"})
+        except TimeoutError as e:
+            self._send_json(504, {"error": str(e)})
+        except Exception:
+            # El detalle (rutas, tipos internos) queda en el registro del servidor, no en la respuesta
+            self.log_error("error en %s:\n%s", self.path, traceback.format_exc())
+            self._send_json(500, {"error": "error interno al dibujar el Gantt"})
+        else:
+            self._send(200, image, FORMATS[params["fmt"]], {"X-Cache": outcome, "ETag": f'"{key}"'})
+
+    def _send_json(self, code, payload, headers=None):
+        self._send(code, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                   "application/json; charset=utf-8", headers)
+
+    def _send(self, code, data, content_type, headers=None):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP local que dibuja el Gantt de un libro Excel subido.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Procesos que dibujan a la vez")
+    parser.add_argument("--max-pending", type=int, default=SERVICE_MAX_PENDING,
+                        help="Renders distintos en curso antes de responder 503")
+    parser.add_argument("--cache-dir", default=SERVICE_CACHE_DIR, help="Directorio de la caché de imágenes")
+    parser.add_argument("--cache-max-mb", type=int, default=SERVICE_CACHE_MAX_MB)
+    args = parser.parse_args(argv)
+
+    service = RenderService(
+        workers=args.workers,
+        cache=ResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024),
+        max_pending=args.max_pending
+    )
+    server = ThreadingHTTPServer((args.host, args.port), RenderHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"Servicio de render en http://{args.host}:{server.server_port} ({args.workers} procesos)", flush=True)
+    # Parado con SIGTERM también se cierra el pool: sus procesos no quedan huérfanos
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.task_loader import normalize_name
+
+
+class BarFilter:
+    """
+    Barras que se ven en una ventana: las de los responsables no ocultos
+    desde la leyenda cuyo nombre de tarea contiene el texto buscado.
+
+    reset() guarda por layout los códigos de responsable y de tarea; con
+    ellos, visible() es una máscara en numpy y solo recorre en Python los
+    responsables y los nombres distintos, no las barras. Los nombres se
+    normalizan una vez por layout, la primera vez que se busca un texto.
+    """
+
+    def __init__(self, layout=None):
+        self.hidden = set()
+        self.text = ''
+        self.reset(layout)
+
+    def reset(self, layout):
+        """Sustituye las barras filtradas (p.ej. al recargar) conservando el filtro."""
+        if layout is None:
+            layout = pd.DataFrame({'Responsable': [], 'Tareas': []})
+        self.owner_codes, owners = pd.factorize(layout['Responsable'])
+        self.owners = list(owners)
+        self.name_codes, self.names = pd.factorize(layout['Tareas'])
+        self._normalized = None
+
+    @property
+    def active(self):
+        return bool(self.hidden or self.text)
+
+    def toggle(self, owner):
+        self.hidden ^= {owner}
+
+    def solo(self, owner):
+        """Deja solo owner a la vista; si ya era el único, vuelve a mostrar todos."""
+        others = set(self.owners) - {owner}
+        self.hidden = set() if self.hidden == others else others
+
+    def set_text(self, text):
+        self.text = normalize_name(text)
+
+    def visible(self):
+        """Máscara de las barras del layout que se ven."""
+        visible = np.ones(len(self.owner_codes), dtype=bool)
+        if self.hidden:
+            hidden = np.array([owner in self.hidden for owner in self.owners], dtype=bool)
+            visible &= ~hidden[self.owner_codes]
+        if self.text:
+            if self._normalized is None:
+                self._normalized = [normalize_name(name) for name in self.names]
+            found = np.array([self.text in name for name in self._normalized], dtype=bool)
+            visible &= found[self.name_codes]
+        return visible
+
+
+def compact_rows(y, visible, n_rows):
+    """
+    Filas sin huecos para las barras visibles: (fila nueva de cada barra,
+    filas de antes que se conservan, en orden). Las filas sin ninguna barra
+    visible desaparecen y las demás mantienen su orden.
+    """
+    present = np.zeros(n_rows, dtype=bool)
+    present[y[visible]] = True
+    new_row = np.cumsum(present) - 1
+    return new_row[y], np.flatnonzero(present)
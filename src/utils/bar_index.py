@@ -0,0 +1,64 @@
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+
+class BarIndex:
+    """
+    Índice espacial para saber qué barra hay bajo el cursor.
+
+    Las barras se agrupan por fila del eje Y y, dentro de cada fila, se
+    ordenan por inicio; una búsqueda es una bisección sobre esos inicios.
+    Trabaja en coordenadas de datos, así que zoom y desplazamiento no lo
+    invalidan: solo hay que llamar a reset() cuando cambian las barras.
+    """
+
+    def __init__(self, layout=None, height=0.6):
+        self.half = height / 2
+        self.reset(layout)
+
+    def reset(self, layout):
+        """Sustituye las barras indexadas; el índice se reconstruye en la siguiente consulta."""
+        self.layout = layout
+        self._built = False
+
+    def _build(self):
+        layout = self.layout
+        x0 = layout['x0'].to_numpy(dtype=float)
+        x1 = layout['x1'].to_numpy(dtype=float)
+        rows = layout['y'].to_numpy(dtype=int)
+
+        order = np.lexsort((x0, rows))
+        sorted_rows = rows[order]
+        ends = x1[order]
+        n_rows = int(rows.max()) + 1 if len(rows) else 0
+
+        self._order = order.tolist()
+        self._starts = x0[order].tolist()
+        self._ends = ends.tolist()
+        # Fin más lejano alcanzado hasta cada posición dentro de su fila
+        self._reach = pd.Series(ends).groupby(sorted_rows).cummax().tolist()
+        self._row_bounds = np.searchsorted(sorted_rows, np.arange(n_rows + 1)).tolist()
+        self._n_rows = n_rows
+        self._built = True
+
+    def find(self, x, y):
+        """Devuelve la posición en el layout de la barra en (x, y), o None."""
+        if self.layout is None or x is None or y is None:
+            return None
+        if not self._built:
+            self._build()
+
+        row = int(np.floor(y + 0.5))
+        if not 0 <= row < self._n_rows or abs(y - row) > self.half:
+            return None
+
+        lo, hi = self._row_bounds[row], self._row_bounds[row + 1]
+        pos = bisect_right(self._starts, x, lo, hi) - 1
+        found = None
+        while pos >= lo and self._reach[pos] >= x:
+            if self._ends[pos] >= x and (found is None or self._order[pos] < found):
+                found = self._order[pos]
+            pos -= 1
+        return found
@@ -0,0 +1,163 @@
+import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+EXCEL_PATTERNS = ("*.xlsx", "*.xlsm", "*.xls")
+
+
+def find_workbooks(paths):
+    """Expande directorios a los libros Excel que contienen (sin temporales ~$ de Office)."""
+    workbooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in EXCEL_PATTERNS:
+                workbooks.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            workbooks.append(path)
+    return [wb for wb in workbooks if not os.path.basename(wb).startswith("~$")]
+
+
+def output_file(file_path, sheet_name, output_dir=None, fmt="png"):
+    """Mismo nombre que usa el botón Guardar: '<libro> (<hoja>).<fmt>'."""
+    title = os.path.splitext(os.path.basename(file_path))[0]
+    directory = output_dir or os.path.dirname(os.path.abspath(file_path))
+    return os.path.join(directory, f"{title} ({sheet_name}).{fmt}")
+
+
+def is_up_to_date(output_path, file_path):
+    return os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(file_path)
+
+
+def _init_worker():
+    # Cada proceso dibuja sin ventana
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_sheet(job):
+    """Carga y dibuja una hoja. Se ejecuta en un proceso del pool."""
+    from src.utils.profiling import stage
+
+    title = os.path.splitext(os.path.basename(job["file_path"]))[0]
+    with stage(f"render_sheet {title} ({job['sheet_name']})"):
+        return _render_sheet(job)
+
+
+def load_sheet(file_path, sheet_name, header=None, column_mapping=None, use_cache=None, engine=None):
+    """
+    Tareas agrupadas de una hoja; cabecera y columnas se detectan si no se
+    indican. Devuelve (tareas, None) o (None, motivo) si no hay nada que dibujar.
+    """
+    from src.utils.profiling import stage
+    from src.utils.sheet_detection import detect_header, sheet_columns, detect_column_mapping
+    from src.utils.task_cache import load_grouped_tasks
+
+    if header is None:
+        with stage("detect_header"):
+            header = detect_header(file_path, sheet_name)
+        if header is None:
+            return None, "sin cabecera"
+
+    if column_mapping is None:
+        with stage("detect_columns"):
+            column_mapping = detect_column_mapping(sheet_columns(file_path, sheet_name, header))
+    missing = [c for c in ("Fecha Inicio", "Fecha Fin") if c not in column_mapping]
+    if missing:
+        return None, f"faltan columnas {missing}"
+
+    _, grouped = load_grouped_tasks(
+        file_path, sheet_name, header,
+        column_mapping=column_mapping, use_cache=use_cache, engine=engine
+    )
+    if grouped.empty:
+        return None, "sin tareas"
+    return grouped, None
+
+
+def _render_sheet(job):
+    from src.utils.profiling import stage
+
+    # Solo pesa en la primera hoja de cada proceso
+    with stage("imports"):
+        import src.utils.task_cache  # noqa: F401
+        from src.utils.gantt_utils import plot_gantt
+
+    result = {"file_path": job["file_path"], "sheet_name": job["sheet_name"], "output_path": job["output_path"]}
+    start = time.perf_counter()
+    try:
+        grouped, reason = load_sheet(
+            job["file_path"], job["sheet_name"], job["header"], job["column_mapping"],
+            use_cache=job["use_cache"], engine=job["engine"]
+        )
+        if grouped is None:
+            return dict(result, status="skipped", reason=reason)
+        load_time = time.perf_counter() - start
+
+        title = os.path.splitext(os.path.basename(job["file_path"]))[0]
+        plot_gantt(grouped, TITLE=title, sheet_name=job["sheet_name"], output_path=job["output_path"])
+        return dict(
+            result,
+            status="ok",
+            tasks=len(grouped),
+            load_time=load_time,
+            render_time=time.perf_counter() - start - load_time
+        )
+    except Exception as e:
+        return dict(result, status="error", reason=str(e))
+
+
+def build_jobs(workbooks, sheets=None, header=None, column_mapping=None,
+               output_dir=None, fmt="png", force=False, use_cache=None, engine=None):
+    """Una tarea por hoja; las salidas más nuevas que su libro se omiten salvo con force."""
+    from src.utils.workbook_cache import get_sheet_names
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    jobs, up_to_date = [], []
+    for file_path in workbooks:
+        for sheet_name in sheets or get_sheet_names(file_path):
+            output_path = output_file(file_path, sheet_name, output_dir, fmt)
+            if not force and is_up_to_date(output_path, file_path):
+                up_to_date.append(output_path)
+                continue
+            jobs.append({
+                "file_path": file_path,
+                "sheet_name": sheet_name,
+                "header": header,
+                "column_mapping": column_mapping,
+                "output_path": output_path,
+                "use_cache": use_cache,
+                "engine": engine,
+            })
+    return jobs, up_to_date
+
+
+def run_batch(jobs, workers=None):
+    """Reparte las hojas en un pool de procesos e imprime el tiempo de cada una."""
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(render_sheet, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            name = f"{os.path.basename(result['file_path'])} [{result['sheet_name']}]"
+            if result["status"] == "ok":
+                print(f"{name}: {result['tasks']} tareas, carga {result['load_time']:.2f}s, "
+                      f"dibujo {result['render_time']:.2f}s -> {result['output_path']}")
+            else:
+                print(f"{name}: {result['status']} ({result['reason']})")
+    return results, time.perf_counter() - start
+
+
+def print_summary(results, elapsed, up_to_date):
+    done = [r for r in results if r["status"] == "ok"]
+    tasks = sum(r["tasks"] for r in done)
+    errors = sum(r["status"] == "error" for r in results)
+    skipped = sum(r["status"] == "skipped" for r in results)
+    print(
+        f"\n{len(done)} gráficos, {tasks} tareas en {elapsed:.2f}s "
+        f"({len(done) / elapsed if elapsed else 0:.2f} gráficos/s, {tasks / elapsed if elapsed else 0:.0f} tareas/s); "
+        f"{len(up_to_date)} al día, {skipped} omitidas, {errors} errores"
+    )
@@ -0,0 +1,91 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.utils.batch_render import load_sheet
+from src.utils.profiling import stage
+
+
+def sheet_title(file_path, sheet_name):
+    """Título de un panel: '<libro> (<hoja>)', como la ventana de una sola hoja."""
+    return f"{os.path.splitext(os.path.basename(file_path))[0]} ({sheet_name})"
+
+
+def dashboard_title(sources):
+    """Título de la ventana y nombre del fichero de Guardar: los libros del dashboard."""
+    titles = dict.fromkeys(os.path.splitext(os.path.basename(s["file_path"]))[0] for s in sources)
+    return "Dashboard " + " + ".join(titles)
+
+
+def build_sources(workbooks, sheets=None, header=None, column_mapping=None):
+    """Una fuente por hoja (por defecto todas las de cada libro), en el orden de los paneles."""
+    from src.utils.workbook_cache import get_sheet_names
+
+    return [
+        {"file_path": file_path, "sheet_name": sheet_name, "header": header, "column_mapping": column_mapping}
+        for file_path in workbooks
+        for sheet_name in sheets or get_sheet_names(file_path)
+    ]
+
+
+def _load_source(source, use_cache=None, engine=None):
+    """Carga una fuente. Se ejecuta en un proceso del pool; los errores vuelven como motivo."""
+    start = time.perf_counter()
+    try:
+        with stage(f"load_sheet {sheet_title(source['file_path'], source['sheet_name'])}"):
+            tasks, reason = load_sheet(
+                source["file_path"], source["sheet_name"], source.get("header"), source.get("column_mapping"),
+                use_cache=use_cache, engine=engine
+            )
+        status = "ok" if tasks is not None else "skipped"
+    except Exception as e:
+        tasks, reason, status = None, str(e), "error"
+    return dict(source, status=status, tasks=tasks, reason=reason, load_time=time.perf_counter() - start)
+
+
+def _from_cache(source, use_cache=None):
+    """La hoja ya cargada antes con la misma cabecera y columnas: se lee de la caché sin lanzar un proceso."""
+    from src.utils.task_cache import cached_tasks
+
+    if source.get("header") is None or source.get("column_mapping") is None:
+        return None
+    start = time.perf_counter()
+    cached = cached_tasks(source["file_path"], source["sheet_name"], source["header"],
+                          source["column_mapping"], use_cache=use_cache)
+    if cached is None or cached[1].empty:
+        return None
+    return dict(source, status="ok", tasks=cached[1], reason=None, load_time=time.perf_counter() - start)
+
+
+def load_sources(sources, workers=None, use_cache=None, engine=None):
+    """
+    Carga varias hojas a la vez, una por proceso: leer un Excel con openpyxl
+    no suelta el GIL y con hilos se cargarían de una en una. Así el total se
+    acerca al de la hoja más lenta más el arranque del pool, no a la suma.
+    Las hojas que ya están en la caché de tareas se leen aquí sin pool.
+    Devuelve un resultado por fuente y en su orden, con status 'ok' y las
+    tareas agrupadas en tasks, o 'skipped'/'error' y el motivo en reason.
+    """
+    with stage("load_sources"):
+        results = [_from_cache(source, use_cache) for source in sources]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if len(pending) == 1:
+            results[pending[0]] = _load_source(sources[pending[0]], use_cache, engine)
+        elif pending:
+            workers = min(workers or os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {i: pool.submit(_load_source, sources[i], use_cache, engine) for i in pending}
+                for i, future in futures.items():
+                    results[i] = future.result()
+    return results
+
+
+def print_results(results, elapsed):
+    for r in results:
+        if r["status"] == "ok":
+            print(f"{sheet_title(r['file_path'], r['sheet_name'])}: {len(r['tasks'])} tareas en {r['load_time']:.2f}s")
+        else:
+            print(f"{sheet_title(r['file_path'], r['sheet_name'])}: {r['status']} ({r['reason']})")
+    slowest = max((r["load_time"] for r in results), default=0)
+    total = sum(r["load_time"] for r in results)
+    print(f"Carga en {elapsed:.2f}s (hoja más lenta {slowest:.2f}s, suma de las hojas {total:.2f}s)")
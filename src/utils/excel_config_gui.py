@@ -1,21 +1,125 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.profiling import profiled
+
+# pandas y openpyxl (vía workbook_cache) se importan al leer el primer
+# archivo, no al abrir la ventana
+NO_COLUMN = "(ninguno)"
+# Cada cuánto se recogen en el hilo de Tk los resultados de las lecturas
+POLL_INTERVAL_MS = 50
+# Espera tras la última tecla en la fila de cabecera antes de leer las columnas
+HEADER_DEBOUNCE_MS = 300
+# Texto de estado mientras hay lecturas en marcha, por tipo de petición
+STATUS = {
+    "sheets": "Leyendo hojas…",
+    "header": "Buscando la cabecera…",
+    "columns": "Leyendo columnas…",
+    "load": "Cargando tareas…",
+}
+
+
+class BackgroundTasks:
+    """
+    Lecturas del libro fuera del hilo de Tk, para que la ventana no se
+    congele con un Excel grande.
+
+    Cada petición tiene un tipo ('sheets', 'columns'...) y una nueva del
+    mismo tipo sustituye a la anterior: si aún no ha empezado se cancela y
+    si ya está en marcha su resultado se descarta. Los resultados se
+    entregan en el hilo de Tk (root.after), nunca desde el hilo de trabajo.
+    Dos hilos: una lectura ya sustituida no retrasa a la que la sustituye.
+    """
+
+    def __init__(self, root, on_change=None, workers=2):
+        self.root = root
+        self.on_change = on_change
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.current = {}
+        self.pending = []
+        self.after_id = None
+
+    def submit(self, kind, func, *args, on_done=None, on_error=None):
+        self.cancel(kind)
+        future = self.executor.submit(func, *args)
+        self.current[kind] = future
+        self.pending.append((kind, future, on_done, on_error))
+        if self.after_id is None:
+            self.after_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+        self._changed()
+        return future
+
+    def cancel(self, *kinds):
+        for kind in kinds:
+            future = self.current.pop(kind, None)
+            if future is not None:
+                future.cancel()
+        self._changed()
+
+    def running(self, *kinds):
+        return any(kind in self.current for kind in kinds)
+
+    def _poll(self):
+        self.after_id = None
+        for item in [p for p in self.pending if p[1].done()]:
+            self.pending.remove(item)
+            kind, future, on_done, on_error = item
+            if self.current.get(kind) is not future:
+                # Sustituida o cancelada: nadie espera ya este resultado
+                continue
+            del self.current[kind]
+            error = future.exception()
+            if error is None:
+                if on_done is not None:
+                    on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                print(f"Error en segundo plano ({kind}): {error}")
+        if self.pending:
+            self.after_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+        self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(list(self.current))
+
+    def shutdown(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 
 class ExcelConfigGUI:
-    def __init__(self, on_load=None):
+    """
+    Ventana de configuración. La lectura del libro (hojas, cabecera,
+    columnas y, si se indica load, la carga de las tareas) va a hilos de
+    trabajo: load(config) se ejecuta fuera de Tk y on_load(config, datos)
+    dentro, ya con el resultado. Sin load, on_load(config) hace toda la
+    carga en el hilo de Tk, como antes. Igual con load_dashboard y
+    on_dashboard para las hojas de un dashboard.
+    """
+
+    def __init__(self, on_load=None, on_dashboard=None, load=None, load_dashboard=None):
         self.on_load = on_load
+        self.on_dashboard = on_dashboard
+        self.load = load
+        self.load_dashboard = load_dashboard
         self.file_path = None
         self.sheets = []
         self.columns = []
+        self._header_after = None
         
         self.root = tk.Tk()
         self.root.title("Configuracion de Gantt")
-        self.root.geometry("375x400")
+        self.root.geometry("375x450")
         self.root.resizable(True, True)
+        self.root.protocol("WM_DELETE_WINDOW", self._cancel)
         
         self._create_widgets()
+        self.tasks = BackgroundTasks(self.root, on_change=self._show_status)
         
     def _create_widgets(self):
         main_frame = ttk.Frame(self.root, padding="10")
@@ -63,7 +167,7 @@ class ExcelConfigGUI:
         self.column_combos = {}
         
         required_columns = ["Fecha Inicio", "Fecha Fin"]
-        optional_columns = ["Tareas", "Responsable", "Duración"]
+        optional_columns = ["Tareas", "Responsable", "Duración", "Predecesoras"]
         
         ttk.Label(columns_frame, text="Obligatorias:", font=("", 9, "bold")).grid(row=0, column=0, columnspan=2, sticky=tk.W)
         
@@ -87,12 +191,18 @@ class ExcelConfigGUI:
             self.column_combos[col] = combo
             row += 1
         
+        # Estado de las lecturas en segundo plano
+        self.status_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.status_var, foreground="gray").pack(fill=tk.X)
+        
         # Botones
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(button_frame, text="Cancelar", command=self._cancel).pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="Cargar", command=self._confirm).pack(side=tk.RIGHT)
+        if self.on_dashboard:
+            ttk.Button(button_frame, text="Dashboard…", command=self._open_dashboard).pack(side=tk.LEFT)
         
     def _select_file(self):
         path = filedialog.askopenfilename(
@@ -104,16 +214,24 @@ class ExcelConfigGUI:
             self.file_label.config(text=path.split("/")[-1].split("\\")[-1])
             self._load_sheets()
     
+    def _show_status(self, kinds):
+        self.status_var.set(STATUS.get(kinds[-1], STATUS["sheets"]) if kinds else "")
+    
     def _load_sheets(self):
-        try:
-            xl = pd.ExcelFile(self.file_path)
-            self.sheets = xl.sheet_names
-            self.sheet_combo["values"] = self.sheets
-            if self.sheets:
-                self.sheet_combo.current(0)
-                self._on_sheet_change(None)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al leer el archivo: {e}")
+        # Lo pendiente de la hoja del libro anterior ya no sirve
+        self.tasks.cancel("header", "columns")
+        self.tasks.submit(
+            "sheets", _get_sheet_names, self.file_path,
+            on_done=self._on_sheets_loaded,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al leer el archivo: {e}")
+        )
+    
+    def _on_sheets_loaded(self, sheets):
+        self.sheets = sheets
+        self.sheet_combo["values"] = self.sheets
+        if self.sheets:
+            self.sheet_combo.current(0)
+            self._on_sheet_change(None)
     
     def _on_sheet_change(self, event):
         self._autodetect_header()
@@ -121,62 +239,51 @@ class ExcelConfigGUI:
     def _autodetect_header(self):
         if not self.file_path or not self.sheet_var.get():
             return
-        try:
-            df = pd.read_excel(self.file_path, sheet_name=self.sheet_var.get(), header=None, nrows=20)
-            for idx, row in df.iterrows():
-                non_empty = row.dropna()
-                if len(non_empty) >= 2:
-                    self.header_var.set(str(idx+1))
-                    self._load_columns()
-                    return
-        except Exception:
-            pass
+        self.tasks.cancel("columns")
+        self.tasks.submit(
+            "header", _detect_header, self.file_path, self.sheet_var.get(),
+            on_done=self._on_header_detected,
+            on_error=lambda e: None
+        )
+    
+    def _on_header_detected(self, header):
+        if header is not None:
+            self.header_var.set(str(header+1))
+            self._load_columns()
     
     def _on_header_change(self, event=None):
-        self.root.after(100, self._load_columns)
+        # Una sola lectura cuando se deja de teclear, no una por tecla
+        if self._header_after is not None:
+            self.root.after_cancel(self._header_after)
+        self.tasks.cancel("columns")
+        self._header_after = self.root.after(HEADER_DEBOUNCE_MS, self._load_columns)
     
     def _load_columns(self):
+        self._header_after = None
         if not self.file_path or not self.sheet_var.get():
             return
         try:
             header_row = int(self.header_var.get()) - 1
-            df = pd.read_excel(
-                self.file_path, 
-                sheet_name=self.sheet_var.get(), 
-                header=header_row, 
-                nrows=1
-            )
-            self.columns = ["(ninguno)"] + list(df.columns.astype(str))
-            
-            keywords = {
-                "Fecha Inicio": ["inicio", "start", "fecha inicio"],
-                "Fecha Fin": ["fin", "end", "fecha fin", "termino"],
-                "Tareas": ["tarea", "task", "actividad", "descripcion", "fase", "phase", "etapa"],
-                "Responsable": ["responsable", "owner", "asignado", "recurso"],
-                "Duración": ["duracion", "duración", "duration", "dias", "días", "days"]
-            }
-            
-            for col_name, combo in self.column_combos.items():
-                combo["values"] = self.columns
-                matched = False
-                
-                for excel_col in self.columns[1:]:
-                    excel_lower = excel_col.lower()
-                    for kw in keywords.get(col_name, []):
-                        if kw in excel_lower:
-                            combo.set(excel_col)
-                            matched = True
-                            break
-                    if matched:
-                        break
-                
-                if not matched:
-                    combo.set("(ninguno)")
-                        
-        except Exception as e:
+        except ValueError as e:
             print(f"Error cargando columnas: {e}")
+            return
+        self.tasks.submit(
+            "columns", _sheet_columns, self.file_path, self.sheet_var.get(), header_row,
+            on_done=self._on_columns_loaded,
+            on_error=lambda e: print(f"Error cargando columnas: {e}")
+        )
+    
+    def _on_columns_loaded(self, columns):
+        from src.utils.sheet_detection import match_column
+        self.columns = [NO_COLUMN] + columns
+        for col_name, combo in self.column_combos.items():
+            combo["values"] = self.columns
+            combo.set(match_column(col_name, self.columns[1:]) or NO_COLUMN)
     
     def _validate(self):
+        if self.tasks.running("sheets", "header", "columns") or self._header_after is not None:
+            messagebox.showwarning("Aviso", "Espera a que termine de leerse el libro")
+            return False
         if not self.file_path:
             messagebox.showwarning("Aviso", "Selecciona un archivo Excel")
             return False
@@ -186,36 +293,170 @@ class ExcelConfigGUI:
         
         for required in ["Fecha Inicio", "Fecha Fin"]:
             val = self.column_vars[required].get()
-            if not val or val == "(ninguno)":
+            if not val or val == NO_COLUMN:
                 messagebox.showwarning("Aviso", f"La columna '{required}' es requerida")
                 return False
         return True
     
-    def _confirm(self):
-        if not self._validate():
-            return
-        
+    def _config(self):
         column_mapping = {}
         for col_name, var in self.column_vars.items():
             val = var.get()
-            if val and val != "(ninguno)":
+            if val and val != NO_COLUMN:
                 column_mapping[col_name] = val
         
-        config = {
+        return {
             "file_path": self.file_path,
             "sheet_name": self.sheet_var.get(),
             "header": int(self.header_var.get()) - 1,
             "column_mapping": column_mapping
         }
-        if self.on_load:
+    
+    def _confirm(self):
+        if not self._validate():
+            return
+        config = self._config()
+        if self.load:
+            # Cargar otra vez antes de que acabe sustituye a la carga anterior
+            self.tasks.submit(
+                "load", self.load, config,
+                on_done=lambda data: self.on_load(config, data),
+                on_error=lambda e: messagebox.showerror("Error", f"Error al cargar las tareas: {e}")
+            )
+        elif self.on_load:
             self.on_load(config)
     
+    def _open_dashboard(self):
+        DashboardDialog(self)
+    
+    def _load_dashboard(self, sources):
+        if self.load_dashboard:
+            self.tasks.submit(
+                "load", self.load_dashboard, sources,
+                on_done=lambda data: self.on_dashboard(sources, data),
+                on_error=lambda e: messagebox.showerror("Error", f"Error al cargar las hojas: {e}")
+            )
+        else:
+            self.on_dashboard(sources)
+    
     def _cancel(self):
+        self.tasks.shutdown()
         self.root.destroy()
     
     def show(self):
         self.root.mainloop()
 
-def show_excel_config(on_load=None):
-    gui = ExcelConfigGUI(on_load=on_load)
+class DashboardDialog:
+    """
+    Elección de las hojas de un dashboard, de uno o varios libros. La hoja
+    configurada en la ventana principal usa su cabecera y sus columnas; en
+    las demás se detectan al cargarlas.
+    """
+
+    def __init__(self, gui):
+        self.gui = gui
+        self.items = []
+
+        self.window = tk.Toplevel(gui.root)
+        self.window.title("Dashboard")
+        self.window.geometry("375x350")
+        self.window.transient(gui.root)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text="Hojas (Ctrl/Mayús para elegir varias):").pack(anchor=tk.W)
+
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, exportselection=False)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.listbox.yview)
+        self.listbox.config(yscrollcommand=scrollbar.set)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(fill=tk.X)
+        ttk.Button(button_frame, text="Añadir libro…", command=self._add_file).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Cancelar", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Cargar", command=self._confirm).pack(side=tk.RIGHT)
+
+        if gui.file_path:
+            self._add_sheets(gui.file_path, gui.sheets)
+
+    def _add_sheets(self, file_path, sheets):
+        name = file_path.split("/")[-1].split("\\")[-1]
+        for sheet in sheets:
+            if (file_path, sheet) in self.items:
+                continue
+            self.items.append((file_path, sheet))
+            self.listbox.insert(tk.END, f"{name} / {sheet}")
+            if file_path == self.gui.file_path and sheet == self.gui.sheet_var.get():
+                self.listbox.selection_set(tk.END)
+
+    def _add_file(self):
+        paths = filedialog.askopenfilenames(
+            parent=self.window,
+            title="Añadir libros Excel",
+            filetypes=[("Excel files", "*.xlsx *.xls")]
+        )
+        for path in paths:
+            self.gui.tasks.submit(
+                ("sheets", path), _get_sheet_names, path,
+                on_done=lambda sheets, path=path: self._on_file_loaded(path, sheets),
+                on_error=lambda e: self._alive() and messagebox.showerror(
+                    "Error", f"Error al leer el archivo: {e}", parent=self.window)
+            )
+
+    def _alive(self):
+        return bool(self.window.winfo_exists())
+
+    def _on_file_loaded(self, path, sheets):
+        # El diálogo puede haberse cerrado mientras se leía el libro
+        if not self._alive():
+            return
+        first = self.listbox.size()
+        self._add_sheets(path, sheets)
+        self.listbox.selection_set(first, tk.END)
+
+    def _confirm(self):
+        selected = [self.items[i] for i in self.listbox.curselection()]
+        if not selected:
+            messagebox.showwarning("Aviso", "Selecciona al menos una hoja", parent=self.window)
+            return
+
+        try:
+            configured = self.gui._config() if self.gui.file_path else None
+        except ValueError:
+            # Fila de cabecera no válida: también se detecta
+            configured = None
+        sources = []
+        for file_path, sheet in selected:
+            if configured and (file_path, sheet) == (configured["file_path"], configured["sheet_name"]):
+                sources.append(dict(configured))
+            else:
+                sources.append({"file_path": file_path, "sheet_name": sheet, "header": None, "column_mapping": None})
+        self.window.destroy()
+        self.gui._load_dashboard(sources)
+
+
+@profiled("get_sheet_names")
+def _get_sheet_names(file_path):
+    from src.utils.workbook_cache import get_sheet_names
+    return get_sheet_names(file_path)
+
+
+@profiled("detect_header")
+def _detect_header(file_path, sheet_name):
+    from src.utils.sheet_detection import detect_header
+    return detect_header(file_path, sheet_name)
+
+
+@profiled("sheet_columns")
+def _sheet_columns(file_path, sheet_name, header):
+    from src.utils.sheet_detection import sheet_columns
+    return sheet_columns(file_path, sheet_name, header)
+
+
+def show_excel_config(on_load=None, on_dashboard=None, load=None, load_dashboard=None):
+    gui = ExcelConfigGUI(on_load=on_load, on_dashboard=on_dashboard, load=load, load_dashboard=load_dashboard)
     gui.show()
\ No newline at end of file
@@ -0,0 +1,183 @@
+import io
+import struct
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+from matplotlib import image as mimage
+
+from config.settings import EXPORT_CACHE_MAX_MB
+
+VECTOR_FORMATS = ("svg", "pdf")
+EXPORT_FORMATS = ("png",) + VECTOR_FORMATS
+# Cada cuánto se comprueba si ha terminado una exportación en segundo plano
+POLL_INTERVAL_MS = 100
+# Resolución declarada en la imagen copiada (96 ppp, como hasta ahora): los programas la pegan a ese tamaño
+CLIPBOARD_DPI = 96
+
+
+def rasterize(fig, dpi):
+    """
+    La imagen que guardaría savefig(dpi=dpi, bbox_inches='tight') como array
+    RGBA (alto, ancho, 4), sin codificarla: un solo dibujado.
+    """
+    shape = {}
+
+    def on_draw(event):
+        shape["size"] = (int(event.renderer.height), int(event.renderer.width))
+
+    cid = fig.canvas.mpl_connect("draw_event", on_draw)
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format="rgba", dpi=dpi, bbox_inches="tight")
+    finally:
+        fig.canvas.mpl_disconnect(cid)
+    return np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape(*shape["size"], 4)
+
+
+def rgba_to_dib(rgba, dpi=CLIPBOARD_DPI):
+    """
+    CF_DIB del portapapeles de Windows: BITMAPINFOHEADER y filas de abajo
+    arriba en BGR de 24 bits alineadas a 4 bytes (el BMP sin su cabecera de
+    fichero). El canal alfa se descarta.
+    """
+    height, width = rgba.shape[:2]
+    stride = (width * 3 + 3) & ~3
+    ppm = round(dpi / 0.0254)
+    header = struct.pack("<IiiHHIIiiII", 40, width, height, 1, 24, 0, stride * height, ppm, ppm, 0, 0)
+    pixels = np.zeros((height, stride), dtype=np.uint8)
+    pixels[:, :width * 3] = rgba[::-1, :, 2::-1].reshape(height, width * 3)
+    return header + pixels.tobytes()
+
+
+def _write_png(path, rgba, dpi):
+    # Los mismos metadatos y compresión que savefig
+    mimage.imsave(path, rgba, format="png", dpi=dpi)
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _copy_dib(rgba):
+    # Solo existe en Windows: se importa al copiar
+    import win32clipboard
+
+    dib = rgba_to_dib(rgba)
+    win32clipboard.OpenClipboard()
+    try:
+        win32clipboard.EmptyClipboard()
+        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, dib)
+    finally:
+        win32clipboard.CloseClipboard()
+
+
+class FigureExport:
+    """
+    Guardar y Copiar de una ventana del Gantt.
+
+    La figura se dibuja una vez a dpi en un búfer RGBA (sin botones y con
+    todas las filas) y ese mismo búfer sirve para guardar el PNG y para
+    copiar al portapapeles, hasta que cambia la vista exportada: el rango de
+    fechas, el tamaño de la ventana o las tareas (invalidate). El dibujado
+    es de matplotlib y se hace en el hilo de la ventana; codificar, escribir
+    el fichero y convertir al formato del portapapeles van a un hilo aparte,
+    y on_done se llama de vuelta en el hilo de la ventana al terminar.
+    SVG y PDF no rasterizan: con muchas barras son más rápidos que el PNG.
+    """
+
+    def __init__(self, fig, ax, dpi, rows=None):
+        self.fig = fig
+        self.ax = ax
+        self.dpi = dpi
+        self.rows = rows
+        self.hidden = []
+        self.version = 0
+        self.raster = None
+        self.vectors = {}
+        self.pending = []
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.timer = fig.canvas.new_timer(interval=POLL_INTERVAL_MS)
+        self.timer.add_callback(self._poll)
+        fig.canvas.mpl_connect('close_event', lambda event: self.close())
+
+    def invalidate(self):
+        """Las tareas dibujadas han cambiado: la próxima exportación vuelve a dibujar."""
+        self.version += 1
+        self.raster = None
+        self.vectors.clear()
+
+    def _key(self):
+        return (self.version, tuple(self.ax.get_xlim()), tuple(self.fig.get_size_inches()))
+
+    @contextmanager
+    def _export_view(self):
+        for ax in self.hidden:
+            ax.set_visible(False)
+        try:
+            # La imagen exportada lleva todas las filas, no solo las de la ventana
+            with self.rows.all_rows() if self.rows is not None else nullcontext():
+                yield
+        finally:
+            for ax in self.hidden:
+                ax.set_visible(True)
+            # savefig ha dibujado a otra resolución en el mismo lienzo
+            self.fig.canvas.draw_idle()
+
+    def rgba(self):
+        key = self._key()
+        if self.raster is not None and self.raster[0] == key:
+            return self.raster[1]
+        with self._export_view():
+            rgba = rasterize(self.fig, self.dpi)
+        # Una imagen muy alta no se guarda en memoria: se vuelve a dibujar
+        self.raster = (key, rgba) if rgba.nbytes <= EXPORT_CACHE_MAX_MB * 1024 * 1024 else None
+        return rgba
+
+    def vector(self, fmt):
+        key = self._key()
+        cached = self.vectors.get(fmt)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        buf = io.BytesIO()
+        with self._export_view():
+            self.fig.savefig(buf, format=fmt, bbox_inches="tight")
+        data = buf.getvalue()
+        self.vectors[fmt] = (key, data)
+        return data
+
+    def save(self, path, fmt="png", on_done=None):
+        if fmt in VECTOR_FORMATS:
+            task = partial(_write_bytes, path, self.vector(fmt))
+        else:
+            task = partial(_write_png, path, self.rgba(), self.dpi)
+        return self._submit(task, on_done)
+
+    def copy(self, on_done=None):
+        return self._submit(partial(_copy_dib, self.rgba()), on_done)
+
+    def _submit(self, task, on_done):
+        future = self.executor.submit(task)
+        self.pending.append((future, on_done))
+        self.timer.start()
+        return future
+
+    def _poll(self):
+        for item in [p for p in self.pending if p[0].done()]:
+            self.pending.remove(item)
+            future, on_done = item
+            error = None if future.cancelled() else future.exception()
+            if on_done is not None:
+                on_done(error)
+            elif error is not None:
+                print(f"Error al exportar: {error}")
+        if not self.pending:
+            self.timer.stop()
+
+    def close(self):
+        self.timer.stop()
+        # Lo ya pedido se termina de escribir aunque se cierre la ventana
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,92 @@
+from config.settings import (
+    TITLE_SIZE, TITLE_FONT_WEIGHT,
+    FONT_FAMILY, FONT_SANS_SERIF, FONT_COLOR,
+    LABEL_SIZE, DAY_FONT_SIZE, MONTH_FONT_SIZE, MONTH_FONT_WEIGHT,
+    X_LABEL, Y_LABEL,
+    BAR_COLOR, CRITICAL_COLOR, LINK_COLOR, OVERLOAD_COLOR, BASELINE_COLOR
+)
+
+# Resolución de las imágenes exportadas
+EXPORT_DPI = 300
+
+
+def _first_installed(families):
+    """Primera familia instalada de la lista, como resuelve matplotlib la genérica sans-serif."""
+    from matplotlib import font_manager
+
+    for family in families:
+        try:
+            font_manager.findfont(font_manager.FontProperties(family=family), fallback_to_default=False)
+            return family
+        except ValueError:
+            continue
+    return "sans-serif"
+
+
+class GanttStyle:
+    """
+    Aspecto de un Gantt: fuentes, tamaños, colores, textos de los ejes y
+    resolución de exportación. Por defecto, el de config/settings.py.
+
+    Se pasa explícitamente a cada render en lugar de tocar rcParams, que son
+    globales del proceso: dos gráficos con estilos distintos se pueden
+    dibujar a la vez en hilos distintos. replace() devuelve una copia con
+    algunos valores cambiados.
+    """
+
+    def __init__(self, title_size=TITLE_SIZE, title_font_weight=TITLE_FONT_WEIGHT,
+                 font_family=FONT_FAMILY, font_sans_serif=FONT_SANS_SERIF, font_color=FONT_COLOR,
+                 label_size=LABEL_SIZE, day_font_size=DAY_FONT_SIZE,
+                 month_font_size=MONTH_FONT_SIZE, month_font_weight=MONTH_FONT_WEIGHT,
+                 x_label=X_LABEL, y_label=Y_LABEL, bar_color=BAR_COLOR,
+                 critical_color=CRITICAL_COLOR, link_color=LINK_COLOR, overload_color=OVERLOAD_COLOR,
+                 baseline_color=BASELINE_COLOR, dpi=EXPORT_DPI):
+        self.title_size = title_size
+        self.title_font_weight = title_font_weight
+        self.font_family = font_family
+        self.font_sans_serif = list(font_sans_serif)
+        self.font_color = font_color
+        self.label_size = label_size
+        self.day_font_size = day_font_size
+        self.month_font_size = month_font_size
+        self.month_font_weight = month_font_weight
+        self.x_label = x_label
+        self.y_label = y_label
+        self.bar_color = bar_color
+        self.critical_color = critical_color
+        self.link_color = link_color
+        self.overload_color = overload_color
+        self.baseline_color = baseline_color
+        self.dpi = dpi
+        self._font = None
+
+    def replace(self, **changes):
+        values = {k: v for k, v in vars(self).items() if not k.startswith("_")}
+        return GanttStyle(**dict(values, **changes))
+
+    @property
+    def font(self):
+        """
+        Familia para fontfamily=. Con la genérica sans-serif, la primera de
+        font_sans_serif instalada: pasar la lista entera avisaría en cada
+        texto de cada fuente que falte.
+        """
+        if self._font is None:
+            self._font = _first_installed(self.font_sans_serif) if self.font_family == "sans-serif" else self.font_family
+        return self._font
+
+    def window_rc(self):
+        """
+        rcParams de una ventana: solo para el hilo de la interfaz, con
+        rc_context, para lo que no recibe la fuente explícitamente (botones).
+        """
+        return {
+            "font.family": self.font_family,
+            "font.sans-serif": self.font_sans_serif,
+            "axes.titlesize": self.title_size,
+            "axes.labelsize": self.label_size,
+            "toolbar": "None",
+        }
+
+
+DEFAULT_STYLE = GanttStyle()
@@ -1,117 +1,94 @@
 import os
-import io
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
-from matplotlib.widgets import Button
-import matplotlib.cm as cm
-from PIL import Image
-import win32clipboard
-
-from matplotlib import rcParams
-from config.settings import (
-    TITLE_SIZE, TITLE_FONT_WEIGHT,
-    FONT_FAMILY, FONT_SANS_SERIF, FONT_COLOR,
-    LABEL_SIZE, DAY_FONT_SIZE, MONTH_FONT_SIZE, MONTH_FONT_WEIGHT,
-    X_LABEL, Y_LABEL, 
-    BAR_COLOR,
-    DATE_FORMAT
-)
-
-rcParams['font.family'] = FONT_FAMILY
-rcParams['font.sans-serif'] = FONT_SANS_SERIF
-rcParams['axes.titlesize'] = TITLE_SIZE
-rcParams['axes.labelsize'] = LABEL_SIZE
-rcParams['toolbar'] = 'None'
-
-# Columnas esperadas del Excel
-COLUMN_NAMES = ['Tareas', 'Responsable', 'Fecha Inicio', 'Fecha Fin']
-
-hover_enabled = True
+from matplotlib import rc_context
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.path import Path
+from matplotlib.ticker import MaxNLocator
+from matplotlib.figure import Figure
+from matplotlib.widgets import Button, TextBox
+from matplotlib import colormaps
+
+from src.utils.bar_filter import BarFilter, compact_rows
+from src.utils.bar_index import BarIndex
+from src.utils.figure_export import FigureExport, EXPORT_FORMATS
+from src.utils.gantt_style import GanttStyle, DEFAULT_STYLE, EXPORT_DPI  # noqa: F401
+from src.utils.live_reload import LiveReload
+from src.utils.profiling import stage, profiled, time_first_draw
+from src.utils.level_of_detail import LevelOfDetail, WeekTickLocator, MonthTickLocator
+from src.utils.plan_diff import diff_plans, print_diff, NEW, SHIFTED, RESIZED, UNCHANGED
+from src.utils.resource_load import resource_load, overloads, load_matrix, capacities, print_overloads
+from src.utils.row_axis import RowAxis, StackedRows, export_height, dashboard_height, with_load_panel
+from src.utils.scheduling import Schedule
+# Reexportadas: la carga vive en task_loader para no arrastrar matplotlib
+from src.utils.task_loader import COLUMN_NAMES, PREDECESSORS, UNASSIGNED, load_tasks, group_tasks_by_group  # noqa: F401
+
+from config.settings import LIVE_RELOAD, EXPORT_FORMAT, SHOW_RESOURCE_LOAD
+
+# Sin rcParams globales ni pyplot al dibujar para exportar: el aspecto llega
+# en un GanttStyle y la figura es una Figure propia con lienzo Agg (ver
+# render_gantt). pyplot solo se usa para abrir ventanas, en el hilo de Tk.
+
+# Alto de cada barra en unidades de fila
+BAR_HEIGHT = 0.6
+# Botón de exportación mientras trabaja
+BUSY_COLOR = 'khaki'
+# Polilíneas o polígonos por trazado compuesto: un Path enorme supera el límite de celdas de Agg
+SHAPES_PER_PATH = 2000
+# Entradas de la leyenda de los responsables ocultos
+HIDDEN_ALPHA = 0.3
 
 def generate_color_palette(n_colors): 
     if n_colors <= 10:
-        cmap = cm.get_cmap('tab10')
+        cmap = colormaps['tab10']
     elif n_colors <= 12:
-        cmap = cm.get_cmap('Set3')
+        cmap = colormaps['Set3']
     else:
-        cmap = cm.get_cmap('hsv')
-    
-    colors = []
-    for i in range(n_colors):
-        rgba = cmap(i / max(n_colors - 1, 1) if n_colors > 1 else 0)
-        colors.append('#{:02x}{:02x}{:02x}'.format(
-            int(rgba[0]*255), int(rgba[1]*255), int(rgba[2]*255)
-        ))
-    return colors
+        cmap = colormaps['hsv']
 
-def build_responsable_colors(tasks):
-    def normalize(name):
-        if pd.isna(name) or not str(name).strip():
-            return "Sin responsable asignado"
-        return str(name).strip().title()
-    
-    tasks['Responsable'] = tasks['Responsable'].apply(normalize)
-    unique_resp = tasks['Responsable'].unique().tolist()
-    colors = generate_color_palette(len(unique_resp))
-    return {resp: colors[i] for i, resp in enumerate(unique_resp)}
+    rgb = (cmap(np.arange(n_colors) / max(n_colors - 1, 1))[:, :3] * 255).astype(int)
+    return ['#{:02x}{:02x}{:02x}'.format(*color) for color in rgb]
+
+def normalize_responsables(responsables):
+    """
+    Responsables sin espacios sobrantes y en formato título, como categorías
+    en orden de aparición. Se normalizan los nombres distintos, no las filas.
+    """
+    responsables = responsables.astype('category')
+    names = pd.Series(responsables.cat.categories.astype(str)).str.strip()
+    names = names.str.title().mask(names == '', UNASSIGNED).to_numpy(dtype=object)
 
+    # El código -1 (celda vacía) apunta al último nombre
+    name_codes, uniques = pd.factorize(np.append(names, UNASSIGNED))
+    codes, order = pd.factorize(name_codes[responsables.cat.codes.to_numpy()])
+    return pd.Series(
+        pd.Categorical.from_codes(codes, uniques[order]),
+        index=responsables.index,
+        name=responsables.name
+    )
+
+def build_responsable_colors(tasks):
+    """Un color por categoría de responsable: el código de la categoría es la posición en la paleta."""
+    return build_shared_responsable_colors([tasks])
 
-def load_tasks(file_path, sheet_name, header, nrows=None, skiprows=None, column_mapping=None):
+def build_shared_responsable_colors(frames):
     """
-    Loads data from an Excel spreadsheet into a Pandas dataframe.
+    Un color por responsable común a varias tablas de tareas (las hojas de
+    un dashboard): la paleta se reparte entre todos los nombres en orden de
+    aparición y cada responsable sale del mismo color en todas.
     """
-    try:
-        tasks = pd.read_excel(
-            file_path,
-            sheet_name=sheet_name,
-            header=header,
-            nrows=nrows,
-            skiprows=skiprows
-        )
+    names = {}
+    for tasks in frames:
+        tasks['Responsable'] = normalize_responsables(tasks['Responsable'])
+        names.update(dict.fromkeys(tasks['Responsable'].cat.categories))
+    return dict(zip(names, generate_color_palette(len(names))))
 
-        if column_mapping:
-            reverse_mapping = {v: k for k, v in column_mapping.items()}
-            tasks = tasks.rename(columns=reverse_mapping)
-            
-            for col in COLUMN_NAMES:
-                if col not in tasks.columns:
-                    if col == 'Tareas':
-                        tasks[col] = [f'Tarea {i+1}' for i in range(len(tasks))]
-                    elif col == 'Responsable':
-                        tasks[col] = 'Sin responsable asignado'
-                    else:
-                        tasks[col] = ''
-        else:
-            tasks.columns = COLUMN_NAMES
-        
-        tasks['Fecha Inicio'] = pd.to_datetime(tasks['Fecha Inicio'], format=DATE_FORMAT, errors='coerce')
-        tasks['Fecha Fin'] = pd.to_datetime(tasks['Fecha Fin'], format=DATE_FORMAT, errors='coerce')
-        
-        tasks = tasks.dropna(subset=['Fecha Inicio', 'Fecha Fin'])
-        tasks.set_index(pd.DatetimeIndex(tasks['Fecha Inicio'].values), inplace=True)
-        
-        return tasks
-    
-    except Exception as e:
-        print(f"Error al cargar las tareas: {e}")
-        raise
-
-def group_tasks_by_group(tasks):
-    grouped = tasks.groupby(by=['Responsable', 'Tareas']).agg({
-        'Fecha Inicio': 'min',
-        'Fecha Fin': 'max'
-    }).reset_index().sort_values(by=['Fecha Inicio', 'Tareas'], ascending=False)
-    return grouped
-
-def build_week_ticks(start_date, end_date):
-    """Identifica los lunes que se marcarán en el eje X."""
-    mondays = pd.date_range(start=start_date, end=end_date, freq='W-MON')
-    labels = [d.strftime('%d') for d in mondays]
-    return mondays, labels
-
-def _create_annotation(ax):
+
+def _create_annotation(ax, style=DEFAULT_STYLE):
     return ax.annotate(
         "",
         xy=(0, 0),
@@ -124,6 +101,7 @@ def _create_annotation(ax):
             edgecolor="gray"
         ),
         fontsize=10,
+        fontfamily=style.font,
         visible=False,
         zorder=100
     )
@@ -133,6 +111,18 @@ def _format_bar_annotation(task, duration):
         f"{task['Fecha Inicio'].strftime('%d/%b/%y')} - {task['Fecha Fin'].strftime('%d/%b/%y')}",
         f"{duration} dias"
     ]
+    if 'Holgura' in task:
+        lines.append("Ruta crítica" if task['Critica'] else f"Holgura: {task['Holgura']:g} dias")
+    if 'Estado' in task and pd.notna(task['Estado']):
+        if task['Estado'] == NEW:
+            lines.append("Nueva respecto a la base")
+        elif task['Estado'] == UNCHANGED:
+            lines.append("Sin cambios respecto a la base")
+        else:
+            lines.append(
+                f"Base: {task['Inicio base'].strftime('%d/%b/%y')} - {task['Fin base'].strftime('%d/%b/%y')} "
+                f"(inicio {task['Desplazamiento']:+g}, fin {task['Retraso fin']:+g} dias)"
+            )
     if task.get('Tareas') and str(task['Tareas']).strip():
         lines.append(str(task['Tareas']))
     if task.get('Responsable') and str(task['Responsable']).strip():
@@ -140,89 +130,257 @@ def _format_bar_annotation(task, duration):
     return '\n'.join(lines)
 
 
-def _setup_hover_handler(fig, ax, bars, annot):    
-    def on_hover(event):
+class _HoverTooltip:
+    """
+    Tooltip de hover dibujado por blitting: el fondo estático se guarda tras
+    cada dibujado completo (resize, zoom...) y en cada movimiento solo se
+    repinta la anotación, y únicamente si cambia la barra señalada.
+    """
+
+    def __init__(self, fig, ax, layout, annot):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = fig.canvas
+        self.annot = annot
+        self.index = BarIndex(layout, height=BAR_HEIGHT)
+        self.background = None
+        self.hovered = None
+        # Botón Menú flotante de la ventana
+        self.enabled = True
+
+        # Fuera del dibujado normal: solo se pinta encima del fondo cacheado
+        annot.set_animated(True)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self.on_hover)
+
+    def on_draw(self, event):
+        # savefig dibuja a otra resolución y en otro lienzo: no es el fondo en pantalla
+        if event is not None and event.canvas is not self.canvas:
+            return
+        if self.canvas.supports_blit:
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        if self.annot.get_visible():
+            self.ax.draw_artist(self.annot)
+
+    def on_hover(self, event):
         """Maneja el evento de hover sobre las barras"""
-        if not hover_enabled:
-            annot.set_visible(False)
-            fig.canvas.draw_idle()
+        if not self.enabled or event.inaxes != self.ax:
+            self.show(None)
             return
-            
-        if event.inaxes != ax:
-            annot.set_visible(False)
-            fig.canvas.draw_idle()
+        self.show(self.index.find(event.xdata, event.ydata))
+
+    def show(self, i):
+        if i == self.hovered:
+            return
+        self.hovered = i
+
+        if i is None:
+            self.annot.set_visible(False)
+        else:
+            self._place(i)
+        self._blit()
+
+    def _place(self, i):
+        # El texto se genera solo para la barra señalada
+        task = self.index.layout.iloc[i]
+        self.annot.xy = ((task['x0'] + task['x1']) / 2, task['y'])
+        self.annot.set_text(_format_bar_annotation(task, task['Duracion']))
+        self.annot.set_visible(True)
+
+    def reset(self, layout):
+        """Cambia las barras señaladas por el tooltip y lo oculta."""
+        self.index.reset(layout)
+        self.hovered = None
+        self.annot.set_visible(False)
+
+    def refresh(self, artist):
+        """Repinta un artista fuera del tooltip (p.ej. un botón) y actualiza el fondo cacheado."""
+        self.show(None)
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.fig.draw_artist(artist)
+        self.canvas.blit(artist.get_window_extent())
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def _blit(self):
+        if self.background is None:
+            self.canvas.draw_idle()
             return
-        
-        for rect in bars:
-            if rect.contains(event)[0]:
-                # Obtener posición de la barra
-                x = rect.get_x() + rect.get_width() / 2
-                y = rect.get_y() + rect.get_height() / 2
-                
-                annot.xy = (x, y)
-                annot.set_text(rect.annotation_text)
-                annot.set_visible(True)
-                fig.canvas.draw_idle()
-                return
-
-        annot.set_visible(False)
-        fig.canvas.draw_idle()
-
-    fig.canvas.mpl_connect('motion_notify_event', on_hover)
-
-
-def _configure_axes(ax, sec_ax, week_positions, week_labels, display_title):
+        self.canvas.restore_region(self.background)
+        if self.annot.get_visible():
+            self.ax.draw_artist(self.annot)
+        self.canvas.blit(self.fig.bbox)
+
+
+class _StackedTooltip(_HoverTooltip):
+    """
+    Tooltip de los paneles de un dashboard. Uno por panel se pisarían el
+    fondo cacheado al pasar de un panel a otro: este guarda un solo fondo
+    y muestra la anotación del panel bajo el ratón.
+    """
+
+    def __init__(self, fig, panels):
+        # panels: (ax, layout, annot) de cada panel
+        self.panels = {ax: (BarIndex(layout, height=BAR_HEIGHT), annot) for ax, layout, annot in panels}
+        ax, layout, annot = panels[0]
+        super().__init__(fig, ax, layout, annot)
+        for _, _, other in panels[1:]:
+            other.set_animated(True)
+
+    def on_hover(self, event):
+        panel = self.panels.get(event.inaxes) if self.enabled else None
+        if panel is None:
+            self.show(None)
+            return
+        i = panel[0].find(event.xdata, event.ydata)
+        self.show(None if i is None else (event.inaxes, i))
+
+    def show(self, hovered):
+        if hovered == self.hovered:
+            return
+        self.hovered = hovered
+        self.annot.set_visible(False)
+        if hovered is not None:
+            self.ax, i = hovered
+            self.index, self.annot = self.panels[self.ax]
+            self._place(i)
+        self._blit()
+
+
+def _setup_hover_handler(fig, ax, layout, annot):
+    return _HoverTooltip(fig, ax, layout, annot)
+
+
+def _configure_axes(ax, sec_ax, start_date, end_date, display_title, style=DEFAULT_STYLE):
     # Título y etiquetas
-    ax.set_title(display_title, fontsize=TITLE_SIZE, color=FONT_COLOR).set_fontweight(TITLE_FONT_WEIGHT)
-    ax.set_xlabel(X_LABEL, fontsize=LABEL_SIZE, color=FONT_COLOR)
-    ax.set_ylabel(Y_LABEL, fontsize=LABEL_SIZE, color=FONT_COLOR)
-    # Eje X primario (semanas)
-    ax.tick_params(axis='both', colors=FONT_COLOR)
-    ax.set_xticks(week_positions)
-    ax.set_xticklabels(week_labels, fontsize=DAY_FONT_SIZE, color=FONT_COLOR)
+    ax.set_title(display_title, fontsize=style.title_size, color=style.font_color,
+                 fontfamily=style.font).set_fontweight(style.title_font_weight)
+    ax.set_xlabel(style.x_label, fontsize=style.label_size, color=style.font_color, fontfamily=style.font)
+    ax.set_ylabel(style.y_label, fontsize=style.label_size, color=style.font_color, fontfamily=style.font)
+    # Eje X primario (lunes que caben a lo ancho del eje)
+    ax.tick_params(axis='both', colors=style.font_color, labelfontfamily=style.font)
+    ax.tick_params(axis='x', labelsize=style.day_font_size)
+    ax.xaxis.set_major_locator(WeekTickLocator(start_date, end_date))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d'))
     ax.grid(axis='x', linestyle='--', alpha=0.4)
 
-    # Eje X secundario (meses)
+    # Ocultar bordes innecesarios
+    for spine in ['top', 'right']:
+        ax.spines[spine].set_visible(False)
+
+    # Eje X secundario (meses); en un dashboard solo lo lleva el panel de abajo
+    if sec_ax is None:
+        return
     sec_ax.xaxis.set_major_formatter(mdates.DateFormatter('%b/%y'))
-    sec_ax.xaxis.set_major_locator(mdates.MonthLocator())
-    sec_ax.tick_params(axis='x', labelsize=MONTH_FONT_SIZE, colors=FONT_COLOR)
+    sec_ax.xaxis.set_major_locator(MonthTickLocator())
+    sec_ax.tick_params(axis='x', labelsize=style.month_font_size, colors=style.font_color,
+                       labelfontfamily=style.font)
     sec_ax.spines['bottom'].set_position(('outward', 20))
     for label in sec_ax.get_xticklabels():
-        label.set_fontsize(MONTH_FONT_SIZE)
-        label.set_weight(MONTH_FONT_WEIGHT)
-        label.set_color(FONT_COLOR)
-    # Ocultar bordes innecesarios
+        label.set_fontsize(style.month_font_size)
+        label.set_weight(style.month_font_weight)
+        label.set_color(style.font_color)
     for spine in ['top', 'right']:
-        ax.spines[spine].set_visible(False)
         sec_ax.spines[spine].set_visible(False)
 
 
-def _create_legend(ax, responsable_colors):
+def _create_legend(ax, responsable_colors, style=DEFAULT_STYLE, critical=False, baseline=False):
     handles = [
         mpatches.Patch(color=color, label=team)
         for team, color in responsable_colors.items()
     ]
-    ax.legend(handles=handles, loc='best', framealpha=0.8)
+    if critical:
+        handles.append(mpatches.Patch(facecolor='none', edgecolor=style.critical_color, linewidth=1.5,
+                                      label='Ruta crítica'))
+    if baseline:
+        handles.append(mpatches.Patch(facecolor=style.baseline_color, edgecolor=style.font_color, linestyle='--',
+                                      linewidth=0.8, label='Plan base'))
+    return ax.legend(handles=handles, loc='best', framealpha=0.8, prop={'family': style.font})
+
+
+class _LegendPlacer:
+    """
+    Coloca la leyenda en la esquina del eje que tapa menos barras. Es lo que
+    hace loc='best', pero sin recorrer cada polígono de cada PolyCollection
+    uno a uno, que con miles de barras domina el dibujado: se mide en bloque
+    el área que taparía en cada esquina con las cajas que dibuja ahora el
+    nivel de detalle (solo lo visible, y resumido si hay demasiado). Se
+    recalcula con cada cambio de vista; pin() la deja donde está.
+    """
+
+    CORNERS = ('upper right', 'upper left', 'lower left', 'lower right')
+
+    def __init__(self, legend, ax, lod):
+        self.legend = legend
+        self.ax = ax
+        self.lod = lod
+        self.pinned = False
+        self._size = None
+        # Después de los del nivel de detalle: las cajas ya son las de la vista nueva
+        ax.callbacks.connect('xlim_changed', self.place)
+        ax.callbacks.connect('ylim_changed', self.place)
+        ax.figure.canvas.mpl_connect('resize_event', self.place)
+        self.place()
+
+    def _corner_boxes(self):
+        """Caja en píxeles que ocuparía la leyenda en cada esquina, con el mismo margen que matplotlib."""
+        legend, fig = self.legend, self.ax.figure
+        # El tamaño de la leyenda solo cambia con los dpi; medirla maqueta todos sus textos
+        if self._size is None or self._size[0] != fig.dpi:
+            extent = legend.get_window_extent()
+            self._size = (fig.dpi, extent.width, extent.height)
+        _, width, height = self._size
+        pad = legend.borderaxespad * legend.prop.get_size_in_points() * fig.dpi / 72
+        x0, y0, x1, y1 = self.ax.bbox.extents
+        left, right = x0 + pad, x1 - pad - width
+        bottom, top = y0 + pad, y1 - pad - height
+        origins = {'upper right': (right, top), 'upper left': (left, top),
+                   'lower left': (left, bottom), 'lower right': (right, bottom)}
+        return {corner: (x, y, x + width, y + height) for corner, (x, y) in origins.items()}
+
+    def place(self, *args):
+        if self.pinned:
+            return
+        x0, x1, y0, y1 = self.lod.drawn_boxes()
+        lower = self.ax.transData.transform(np.column_stack([x0, y0]))
+        upper = self.ax.transData.transform(np.column_stack([x1, y1]))
+        bx0, bx1 = np.minimum(lower[:, 0], upper[:, 0]), np.maximum(lower[:, 0], upper[:, 0])
+        by0, by1 = np.minimum(lower[:, 1], upper[:, 1]), np.maximum(lower[:, 1], upper[:, 1])
+
+        def covered(box):
+            lx0, ly0, lx1, ly1 = box
+            width = np.clip(np.minimum(bx1, lx1) - np.maximum(bx0, lx0), 0, None)
+            height = np.clip(np.minimum(by1, ly1) - np.maximum(by0, ly0), 0, None)
+            return float((width * height).sum())
+
+        boxes = self._corner_boxes()
+        # A igualdad, el orden de CORNERS (arriba a la derecha primero, como 'best')
+        corner = min(self.CORNERS, key=lambda c: covered(boxes[c]))
+        self.legend.set_loc(corner)
+
+    def pin(self):
+        """Fija la leyenda donde está ahora (p.ej. al filtrar, para que no salte al cambiar las barras)."""
+        if self.pinned:
+            return
+        self.pinned = True
+        bbox = self.legend.get_window_extent().transformed(self.ax.transAxes.inverted())
+        self.legend.set_loc((bbox.x0, bbox.y0))
 
 
-def _create_floating_buttons(fig, display_title, file_path):
-    global hover_enabled
+def _create_floating_buttons(fig, display_title, file_path, tooltip=None, watcher=None, export=None, chart=None):
     button_axes = []
     buttons = []
-    
-    def with_hidden_buttons(func):
-        def wrapper(*args, **kwargs):
-            for ax in button_axes:
-                ax.set_visible(False)
-            fig.canvas.draw()
-            try:
-                return func(*args, **kwargs)
-            finally:
-                for ax in button_axes:
-                    ax.set_visible(True)
-                fig.canvas.draw_idle()
-        return wrapper
-    
+    if export is not None:
+        # Los botones no salen en la imagen exportada
+        export.hidden = button_axes
+
+    def repaint(ax):
+        if tooltip is not None:
+            tooltip.refresh(ax)
+        else:
+            fig.canvas.draw_idle()
+
     def create_button(pos, text, color='white', hovercolor='lightgray'):
         ax = fig.add_axes(pos)
         btn = Button(ax, text, color=color, hovercolor=hovercolor)
@@ -230,44 +388,118 @@ def _create_floating_buttons(fig, display_title, file_path):
         button_axes.append(ax)
         buttons.append(btn)
         return btn
-    
+
+    busy = set()
+
+    def run_export(btn, start):
+        """
+        Marca el botón como ocupado y lanza la exportación en el siguiente
+        ciclo de la ventana, para que el cambio se vea antes de dibujar.
+        """
+        if btn in busy:
+            return
+        busy.add(btn)
+        text, color = btn.label.get_text(), btn.color
+        btn.label.set_text(text + '…')
+        btn.ax.set_facecolor(BUSY_COLOR)
+        btn.color = BUSY_COLOR
+        repaint(btn.ax)
+
+        def done(error=None):
+            busy.discard(btn)
+            btn.label.set_text(text)
+            btn.ax.set_facecolor(color)
+            btn.color = color
+            repaint(btn.ax)
+            if error is not None:
+                print(f"Error al exportar: {error}")
+
+        def begin():
+            try:
+                start(done)
+            except Exception as e:
+                done(e)
+
+        timer = fig.canvas.new_timer(interval=10)
+        timer.single_shot = True
+        timer.add_callback(begin)
+        timer.start()
+
+    save_format = [EXPORT_FORMAT]
+
     # Botón Guardar
-    @with_hidden_buttons
     def save_click(event):
-        filepath = os.path.join(os.path.dirname(file_path), f"{display_title}.png")
-        fig.savefig(filepath, dpi=300, bbox_inches='tight')
+        fmt = save_format[0]
+        filepath = os.path.join(os.path.dirname(file_path), f"{display_title}.{fmt}")
+        run_export(btn_save, lambda done: export.save(filepath, fmt, on_done=done))
     
-    create_button([0.01, 0.94, 0.07, 0.05], 'Guardar').on_clicked(save_click)
+    btn_save = create_button([0.01, 0.94, 0.07, 0.05], 'Guardar')
+    btn_save.on_clicked(save_click)
     
     # Botón Copiar
-    @with_hidden_buttons
     def copy_click(event):
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-        buf.seek(0)
-        output = io.BytesIO()
-        Image.open(buf).convert('RGB').save(output, 'BMP')
-        win32clipboard.OpenClipboard()
-        win32clipboard.EmptyClipboard()
-        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, output.getvalue()[14:])
-        win32clipboard.CloseClipboard()
+        run_export(btn_copy, lambda done: export.copy(on_done=done))
             
-    create_button([0.085, 0.94, 0.06, 0.05], 'Copiar').on_clicked(copy_click)
+    btn_copy = create_button([0.085, 0.94, 0.06, 0.05], 'Copiar')
+    btn_copy.on_clicked(copy_click)
     
-    # Botón Menú flotante
-    initial_color = 'palegreen' if hover_enabled else 'white'
+    # Botón Menú flotante (el estado es de cada ventana)
+    initial_color = 'palegreen' if tooltip is None or tooltip.enabled else 'white'
     btn_hover = create_button([0.15, 0.94, 0.12, 0.05], 'Menú flotante', color=initial_color)
     ax_hover = button_axes[-1]
     
     def hover_click(event):
-        global hover_enabled
-        hover_enabled = not hover_enabled
-        new_color = 'palegreen' if hover_enabled else 'white'
+        if tooltip is None:
+            return
+        tooltip.enabled = not tooltip.enabled
+        if not tooltip.enabled:
+            tooltip.show(None)
+        new_color = 'palegreen' if tooltip.enabled else 'white'
         ax_hover.set_facecolor(new_color)
         btn_hover.color = new_color
-        fig.canvas.draw_idle()
+        repaint(ax_hover)
     
     btn_hover.on_clicked(hover_click)
+
+    # Botón Auto-recarga
+    if watcher is not None:
+        reload_color = 'palegreen' if watcher.enabled else 'white'
+        btn_reload = create_button([0.275, 0.94, 0.11, 0.05], 'Auto-recarga', color=reload_color)
+        ax_reload = button_axes[-1]
+
+        def reload_click(event):
+            if watcher.enabled:
+                watcher.stop()
+            else:
+                watcher.start()
+            new_color = 'palegreen' if watcher.enabled else 'white'
+            ax_reload.set_facecolor(new_color)
+            btn_reload.color = new_color
+            repaint(ax_reload)
+
+        btn_reload.on_clicked(reload_click)
+
+    # Botón Formato: formato de Guardar (PNG, o SVG/PDF sin rasterizar)
+    x = 0.39 if watcher is not None else 0.275
+    btn_format = create_button([x, 0.94, 0.05, 0.05], save_format[0].upper())
+    ax_format = button_axes[-1]
+
+    def format_click(event):
+        save_format[0] = EXPORT_FORMATS[(EXPORT_FORMATS.index(save_format[0]) + 1) % len(EXPORT_FORMATS)]
+        btn_format.label.set_text(save_format[0].upper())
+        repaint(ax_format)
+
+    btn_format.on_clicked(format_click)
+
+    # Buscar: filtra las tareas por nombre mientras se escribe
+    if chart is not None:
+        ax_search = fig.add_axes([x + 0.12, 0.94, 0.2, 0.05])
+        search = TextBox(ax_search, 'Buscar ')
+        search.label.set_fontsize(14)
+        search.text_disp.set_fontsize(12)
+        search.on_text_change(chart.set_text)
+        button_axes.append(ax_search)
+        buttons.append(search)
     
     return buttons
 
@@ -277,46 +509,770 @@ def _truncate_label(text, max_chars=50):
         return text[:max_chars-3] + "..."
     return text
 
-def plot_gantt(tasks, TITLE=None, sheet_name=None, output_path=None, file_path=None):
-    responsable_colors = build_responsable_colors(tasks)
-    fig, ax = plt.subplots(figsize=(12, 6))
+def _is_layout_sorted(tasks):
+    """True si ya está en el orden de group_tasks_by_group: inicio y tarea descendentes."""
+    start = tasks['Fecha Inicio'].to_numpy()
+    names = tasks['Tareas']
+    # sort_values ordena las categorías por código
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        codes = names.cat.codes.to_numpy()
+    else:
+        codes = pd.factorize(names, sort=True)[0]
+    ties = start[:-1] == start[1:]
+    return bool(np.all((start[:-1] > start[1:]) | (ties & (codes[:-1] >= codes[1:]))))
+
+def _build_bar_layout(tasks):
+    """
+    Calcula en bloque la geometría de todas las barras: filas del eje Y,
+    extremos en unidades de fecha de matplotlib y duración en días.
+    """
+    layout = tasks if _is_layout_sorted(tasks) else tasks.sort_values(by=['Fecha Inicio', 'Tareas'], ascending=False)
+    layout = layout.reset_index(drop=True)
+
+    # Misma asignación de filas que el eje categórico: una fila por etiqueta
+    # truncada, en orden de aparición.
+    task_codes, task_names = pd.factorize(layout['Tareas'])
+    row_of_name, labels = pd.factorize(pd.Index([_truncate_label(name) for name in task_names.astype(str)]))
+
+    layout['Duracion'] = (layout['Fecha Fin'] - layout['Fecha Inicio']).dt.days
+    layout['x0'] = mdates.date2num(layout['Fecha Inicio'])
+    layout['x1'] = layout['x0'] + layout['Duracion']
+    layout['y'] = row_of_name[task_codes]
+    return layout, list(labels)
+
+def _bar_verts(group):
+    """Rectángulos de las barras de un grupo como array (n, 4, 2)."""
+    half = BAR_HEIGHT / 2
+    x0 = group['x0'].to_numpy()
+    x1 = group['x1'].to_numpy()
+    y = group['y'].to_numpy()
+    verts = np.empty((len(group), 4, 2))
+    verts[:, 0] = np.column_stack([x0, y - half])
+    verts[:, 1] = np.column_stack([x0, y + half])
+    verts[:, 2] = np.column_stack([x1, y + half])
+    verts[:, 3] = np.column_stack([x1, y - half])
+    return verts
+
+def _add_bar_collection(ax, resp, group, color):
+    coll = PolyCollection(
+        _bar_verts(group),
+        facecolors=color,
+        edgecolors='none',
+        label=resp
+    )
+    coll.sticky_edges.x.append(group['x0'].min())
+    ax.add_collection(coll)
+    return coll
+
+def _draw_bars(ax, layout, responsable_colors, bar_color=DEFAULT_STYLE.bar_color):
+    """Dibuja una PolyCollection por responsable en lugar de un barh por tarea."""
+    collections = {}
+    for resp, group in layout.groupby('Responsable', sort=False, observed=True):
+        collections[resp] = _add_bar_collection(ax, resp, group, responsable_colors.get(resp, bar_color))
+    ax.autoscale_view()
+    return collections
+
+def _diff_bars(old, new):
+    """
+    Barras que aparecen, desaparecen o cambian de posición entre dos
+    layouts. Tras group_tasks_by_group, (Responsable, Tareas) identifica
+    cada barra. La columna _merge vale 'left_only' para las eliminadas,
+    'right_only' para las nuevas y 'both' para las que cambian.
+    """
+    keys = ['Responsable', 'Tareas']
+    columns = keys + ['x0', 'x1', 'y']
+    merged = pd.merge(
+        old[columns].astype({key: object for key in keys}),
+        new[columns].astype({key: object for key in keys}),
+        on=keys,
+        how='outer',
+        suffixes=('_old', '_new'),
+        indicator=True
+    )
+    moved = (
+        (merged['x0_old'] != merged['x0_new'])
+        | (merged['x1_old'] != merged['x1_new'])
+        | (merged['y_old'] != merged['y_new'])
+    )
+    return merged.loc[(merged['_merge'] != 'both') | moved, keys + ['_merge']]
+
+
+def _compound_paths(shapes, closed=False):
+    """
+    Las polilíneas (o con closed, polígonos) de un array (n, puntos, 2) en
+    trazados compuestos de SHAPES_PER_PATH: muchas menos rutas que dibujar.
+    """
+    if closed:
+        shapes = np.concatenate([shapes, shapes[:, :1]], axis=1)
+    points = shapes.shape[1]
+    codes = np.full((SHAPES_PER_PATH, points), Path.LINETO, dtype=Path.code_type)
+    codes[:, 0] = Path.MOVETO
+    if closed:
+        codes[:, -1] = Path.CLOSEPOLY
+    return [
+        Path(chunk.reshape(-1, 2), codes[:len(chunk)].ravel())
+        for chunk in np.split(shapes, np.arange(SHAPES_PER_PATH, len(shapes), SHAPES_PER_PATH))
+        if len(chunk)
+    ]
+
+
+class _DependencyOverlay:
+    """
+    Ruta crítica y dependencias de un gráfico con columna Predecesoras: un
+    contorno sobre las barras sin holgura y todas las dependencias en una
+    sola colección bajo las barras, en ángulo desde el final de la
+    predecesora hasta el inicio de la sucesora. La colección tiene unos
+    pocos trazados compuestos (de dependencias normales o críticas), no uno
+    por dependencia: con decenas de miles, un Path por línea domina el
+    dibujado. Añade al layout las columnas Holgura y Critica para el tooltip.
+
+    update() reaprovecha el Schedule si solo cambian fechas: recalcula a
+    partir de cada barra movida en lugar de todo el plan. show() vuelve a
+    colocar lo ya calculado cuando se filtran barras, sin tocar el Schedule.
+    """
+
+    def __init__(self, ax, layout, style=DEFAULT_STYLE):
+        self.style = style
+        self.outline = PolyCollection(np.empty((0, 4, 2)), facecolors='none', edgecolors=style.critical_color,
+                                      linewidths=1.5, zorder=2)
+        self.links = PathCollection([], facecolors='none', linewidths=0.8, zorder=0.9)
+        ax.add_collection(self.outline, autolim=False)
+        ax.add_collection(self.links, autolim=False)
+        self.has_critical = False
+        self._schedule(layout)
+        self._apply(layout, self.nodes['node'].to_numpy())
+
+    @staticmethod
+    def applies(tasks):
+        return PREDECESSORS in tasks.columns and bool((tasks[PREDECESSORS] != '').any())
+
+    @staticmethod
+    def _nodes(layout):
+        keys = ['Responsable', 'Tareas']
+        return layout[keys + ['Fecha Inicio', 'Fecha Fin', PREDECESSORS]].astype({key: object for key in keys}).set_index(keys)
+
+    def _schedule(self, layout):
+        self.schedule = Schedule.from_tasks(layout)
+        self.nodes = self._nodes(layout).assign(node=np.arange(len(layout)))
+        schedule = self.schedule
+        if schedule.unknown:
+            print(f"Aviso: predecesoras que no son ninguna tarea: {', '.join(sorted(schedule.unknown)[:10])}")
+        if schedule.cycles:
+            print(f"Aviso: {len(schedule.cycles)} tareas con dependencias circulares; se ignoran esas dependencias")
+        delayed = len(schedule.delayed())
+        if delayed:
+            print(f"Aviso: {delayed} tareas empiezan antes de que acaben sus predecesoras")
+
+    def update(self, layout):
+        new = self._nodes(layout)
+        old = self.nodes.reindex(new.index)
+        # Mismas barras con las mismas predecesoras: el grafo no cambia
+        same_graph = (len(new) == len(self.nodes) and old['node'].notna().all()
+                      and (old[PREDECESSORS] == new[PREDECESSORS]).all())
+        if not same_graph:
+            self._schedule(layout)
+        else:
+            moved = (old['Fecha Inicio'] != new['Fecha Inicio']) | (old['Fecha Fin'] != new['Fecha Fin'])
+            for node, start, end in zip(old.loc[moved, 'node'].astype(int), new.loc[moved, 'Fecha Inicio'],
+                                        new.loc[moved, 'Fecha Fin']):
+                self.schedule.update(node, start, end)
+            self.nodes = new.assign(node=old['node'].astype(int).to_numpy())
+        self._apply(layout, self.nodes['node'].to_numpy())
+
+    def _apply(self, layout, node_of_row):
+        schedule = self.schedule
+        row_of_node = np.empty(len(node_of_row), dtype=np.intp)
+        row_of_node[node_of_row] = np.arange(len(node_of_row))
+
+        slack = schedule.slack_days()
+        critical_nodes = slack <= 0
+        self.critical = critical_nodes[node_of_row]
+        layout['Holgura'] = slack[node_of_row]
+        layout['Critica'] = self.critical
+        self.has_critical = bool(self.critical.any())
+
+        src, dst = schedule.links()
+        self.link_rows = (row_of_node[src], row_of_node[dst])
+        # Una dependencia es crítica si une dos tareas críticas sin margen entre ellas
+        es = np.array(schedule.es, dtype=np.int64)
+        ef = np.array(schedule.ef, dtype=np.int64)
+        self.on_path = critical_nodes[src] & critical_nodes[dst] & (ef[src] == es[dst])
+        self.x0 = layout['x0'].to_numpy()
+        self.x1 = layout['x1'].to_numpy()
+        self.show(np.ones(len(layout), dtype=bool), layout['y'].to_numpy())
+
+    def show(self, visible, y):
+        """
+        Contorno y dependencias de las barras visibles, con cada barra del
+        layout en la fila y. Una dependencia con un extremo oculto no se dibuja.
+        """
+        x0, x1, y = self.x0, self.x1, y.astype(float)
+        critical = self.critical & visible
+        self.outline.set_verts(_bar_verts(pd.DataFrame({'x0': x0[critical], 'x1': x1[critical], 'y': y[critical]})))
+
+        pred, succ = self.link_rows
+        keep = visible[pred] & visible[succ]
+        pred, succ, on_path = pred[keep], succ[keep], self.on_path[keep]
+        segments = np.stack([
+            np.column_stack([x1[pred], y[pred]]),
+            np.column_stack([x0[succ], y[pred]]),
+            np.column_stack([x0[succ], y[succ]])
+        ], axis=1)
+        normal, critical_links = _compound_paths(segments[~on_path]), _compound_paths(segments[on_path])
+        self.links.set_paths(normal + critical_links)
+        self.links.set_edgecolor([self.style.link_color] * len(normal) + [self.style.critical_color] * len(critical_links))
+
+    def remove(self):
+        self.outline.remove()
+        self.links.remove()
+
+
+class _BaselineOverlay:
+    """
+    Plan base detrás del actual (ver plan_diff): en la fila de cada tarea
+    que ha cambiado de fechas, una barra fantasma con las de la base, todas
+    en trazados compuestos bajo las barras. Las tareas eliminadas no tienen
+    fila y solo aparecen en el resumen. Añade al layout Estado, Inicio base,
+    Fin base, Desplazamiento y Retraso fin para el tooltip. show() las
+    vuelve a colocar al filtrar barras sin repetir la comparación.
+    """
+
+    def __init__(self, ax, layout, baseline, style=DEFAULT_STYLE):
+        self.baseline = baseline
+        self.ghosts = PathCollection([], facecolors=style.baseline_color, edgecolors=style.font_color,
+                                     linestyles='--', linewidths=0.8, zorder=0.8)
+        ax.add_collection(self.ghosts, autolim=False)
+        self.update(layout)
+
+    def update(self, layout):
+        self.diff = diff_plans(self.baseline, layout)
+        # Las que no cambian quedarían justo debajo de su barra
+        kept = self.diff[self.diff['Estado'].isin([SHIFTED, RESIZED])]
+        self.rows = kept['fila'].to_numpy()
+        self.x0 = mdates.date2num(kept['Inicio base'])
+        self.x1 = mdates.date2num(kept['Fin base'])
+        self.x_range = (self.x0.min(), self.x1.max()) if len(kept) else None
+        self.dates = (kept['Inicio base'].min(), kept['Fin base'].max()) if len(kept) else None
+        self.show(np.ones(len(layout), dtype=bool), layout['y'].to_numpy())
+
+        current = self.diff[self.diff['fila'] >= 0].set_index('fila').reindex(np.arange(len(layout)))
+        for col in ('Estado', 'Inicio base', 'Fin base', 'Desplazamiento', 'Retraso fin'):
+            layout[col] = current[col].to_numpy()
+
+    def show(self, visible, y):
+        """Barras fantasma de las tareas visibles, con cada barra del layout en la fila y."""
+        shown = visible[self.rows]
+        self.ghosts.set_paths(_compound_paths(_bar_verts(pd.DataFrame({
+            'x0': self.x0[shown], 'x1': self.x1[shown], 'y': y[self.rows[shown]]
+        })), closed=True))
+
+    def date_range(self, start, end):
+        """Rango de fechas del eje que incluye también las barras de la base."""
+        if self.dates is None:
+            return start, end
+        return min(start, self.dates[0]), max(end, self.dates[1])
+
+
+class _LoadPanel:
+    """
+    Panel de carga bajo las barras (ver resource_load): las tareas
+    simultáneas de cada responsable apiladas en escalones con su color, y
+    rayados los tramos en que cada uno supera su capacidad. Una
+    PolyCollection para las bandas y otra colección para las sobrecargas,
+    haya los responsables que haya; las sobrecargas van en trazados
+    compuestos porque Agg raya cada trazado por separado.
+    """
+
+    def __init__(self, ax, tasks, responsable_colors, capacity=None, style=DEFAULT_STYLE):
+        self.ax = ax
+        self.capacity = capacity
+        self.style = style
+        self.bands = PolyCollection(np.empty((0, 4, 2)), edgecolors='none')
+        self.over = PathCollection([], facecolors='none', edgecolors=style.overload_color,
+                                   hatch='////', linewidths=0, zorder=2)
+        ax.add_collection(self.bands, autolim=False)
+        ax.add_collection(self.over, autolim=False)
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        self.update(tasks, responsable_colors)
+
+    def update(self, tasks, responsable_colors):
+        load = resource_load(tasks)
+        self.overloads = overloads(load, self.capacity)
+        times, owners, matrix = load_matrix(load)
+        if not len(times):
+            # Sin tareas (p.ej. todas filtradas)
+            self.bands.set_verts([])
+            self.over.set_paths([])
+            self.ax.set_ylim(0, 1.05)
+            return
+        x = mdates.date2num(times)
+        stacked = np.vstack([np.zeros((1, len(x)), dtype=matrix.dtype), np.cumsum(matrix, axis=0)])
+
+        # Escalones: el valor de cada fecha se mantiene hasta la siguiente
+        step_x = np.broadcast_to(np.repeat(x, 2)[1:], (len(owners), 2 * len(x) - 1))
+        step_y = np.repeat(stacked, 2, axis=1)[:, :-1]
+        top = np.stack([step_x, step_y[1:]], axis=-1)
+        bottom = np.stack([step_x, step_y[:-1]], axis=-1)[:, ::-1]
+        self.bands.set_verts(np.concatenate([top, bottom], axis=1))
+        self.bands.set_facecolor([responsable_colors.get(owner, self.style.bar_color) for owner in owners])
+
+        # Sobrecarga por responsable y tramo entre dos fechas, en su banda
+        limit = capacities(pd.Series(owners, dtype=object), self.capacity)[:, None]
+        k, i = np.nonzero(matrix[:, :-1] > limit)
+        x0, x1 = x[i], x[i + 1]
+        y0, y1 = stacked[k, i], stacked[k + 1, i]
+        self.over.set_paths(_compound_paths(np.stack([
+            np.column_stack([x0, y0]),
+            np.column_stack([x0, y1]),
+            np.column_stack([x1, y1]),
+            np.column_stack([x1, y0])
+        ], axis=1), closed=True))
+        self.ax.set_ylim(0, max(1, stacked[-1].max()) * 1.05)
+
+
+class _GanttChart:
+    """
+    Artistas de un gráfico abierto junto con el layout del que salen.
+
+    update() compara las tareas nuevas con las dibujadas y rehace solo las
+    colecciones de los responsables con barras distintas; etiquetas del eje
+    Y, ticks semanales y leyenda se tocan únicamente si cambian.
+
+    Un clic en un responsable de la leyenda lo oculta o lo vuelve a mostrar
+    y un clic derecho deja solo ese; set_text() filtra por nombre de tarea.
+    apply_filter() no rehace nada: pasa a las colecciones, al nivel de
+    detalle, a las capas y al tooltip las barras que quedan, con las filas
+    vacías quitadas del eje Y.
+    """
+
+    def __init__(self, ax, layout, labels, collections, responsable_colors, legend, tooltip, lod, rows, export=None,
+                 style=DEFAULT_STYLE, dependencies=None, load_panel=None, baseline=None, placer=None):
+        self.ax = ax
+        self.layout = layout
+        self.labels = labels
+        self.collections = collections
+        self.responsable_colors = responsable_colors
+        self.legend = legend
+        self.tooltip = tooltip
+        self.lod = lod
+        self.rows = rows
+        self.export = export
+        self.style = style
+        self.dependencies = dependencies
+        self.load_panel = load_panel
+        self.baseline = baseline
+        self.filter = BarFilter(layout)
+        self._set_legend(legend, placer)
+        ax.figure.canvas.mpl_connect('pick_event', self.on_pick)
+
+    def _set_legend(self, legend, placer=None):
+        """Leyenda nueva: sus entradas de responsables se pueden pulsar."""
+        self.legend = legend
+        self.placer = placer or _LegendPlacer(legend, self.ax, self.lod)
+        self.ax.figure._legend_placer = self.placer
+        self.entries = {}
+        for handle, text in zip(legend.legend_handles, legend.get_texts()):
+            owner = text.get_text()
+            if owner in self.responsable_colors:
+                for artist in (handle, text):
+                    artist.set_picker(True)
+                    self.entries[artist] = owner
+        self._mark_legend()
+
+    def _mark_legend(self):
+        for artist, owner in self.entries.items():
+            artist.set_alpha(HIDDEN_ALPHA if owner in self.filter.hidden else None)
+
+    def on_pick(self, event):
+        owner = self.entries.get(event.artist)
+        if owner is None:
+            return
+        if event.mouseevent.button == 3:
+            self.filter.solo(owner)
+        else:
+            self.filter.toggle(owner)
+        self.placer.pin()
+        self.apply_filter()
+
+    def set_text(self, text):
+        """Muestra solo las tareas cuyo nombre contiene text (sin distinguir mayúsculas)."""
+        self.filter.set_text(text)
+        self.placer.pin()
+        self.apply_filter()
+
+    @profiled("filter_chart")
+    def apply_filter(self):
+        """Muestra las barras que pasan el filtro, en filas seguidas."""
+        ax, layout = self.ax, self.layout
+        visible = self.filter.visible()
+        y, kept = compact_rows(layout['y'].to_numpy(), visible, len(self.labels))
+        view = layout[visible].assign(y=y[visible])
+
+        bars = view[['Responsable', 'x0', 'x1', 'y']]
+        groups = dict(tuple(bars.groupby('Responsable', sort=False, observed=True)))
+        for resp, coll in self.collections.items():
+            self.lod.set_bars(resp, coll, groups.get(resp, bars.iloc[:0]), refresh=False)
+        if self.dependencies is not None:
+            self.dependencies.show(visible, y)
+        if self.baseline is not None:
+            self.baseline.show(visible, y)
+        if self.load_panel is not None:
+            self.load_panel.update(view, self.responsable_colors)
+
+        half = BAR_HEIGHT / 2
+        (x0, _), (x1, _) = ax.dataLim.get_points()
+        ax.dataLim.set_points(np.array([[x0, -half], [x1, max(len(kept) - 1, 0) + half]]))
+        self.rows.set_labels([self.labels[row] for row in kept])
+        self.rows.fit()
+        self.lod.refresh()
+
+        self.tooltip.reset(view)
+        if self.export is not None:
+            self.export.invalidate()
+        self._mark_legend()
+        ax.figure.canvas.draw_idle()
+
+    @profiled("update_chart")
+    def update(self, tasks):
+        """Aplica unas tareas agrupadas nuevas; devuelve cuántas barras han cambiado, aparecido y desaparecido."""
+        ax = self.ax
+        responsable_colors = build_responsable_colors(tasks)
+        layout, labels = _build_bar_layout(tasks)
+
+        diff = _diff_bars(self.layout, layout)
+        affected = set(diff['Responsable'])
+        groups = dict(tuple(
+            layout[layout['Responsable'].isin(affected)].groupby('Responsable', sort=False, observed=True)
+        ))
+        for resp in affected:
+            coll = self.collections.pop(resp, None)
+            group = groups.get(resp)
+            if group is None:
+                coll.remove()
+                self.lod.remove(resp)
+                continue
+            if coll is None:
+                coll = _add_bar_collection(ax, resp, group, responsable_colors[resp])
+            else:
+                coll.sticky_edges.x[:] = [group['x0'].min()]
+            self.lod.set_bars(resp, coll, group, refresh=False)
+            self.collections[resp] = coll
+
+        # Un responsable nuevo puede desplazar la paleta de los demás
+        for resp, coll in self.collections.items():
+            if responsable_colors[resp] != self.responsable_colors.get(resp):
+                coll.set_facecolor(responsable_colors[resp])
+
+        if labels != self.labels:
+            self.rows.set_labels(labels)
+
+        start, end = tasks['Fecha Inicio'].min(), tasks['Fecha Fin'].max()
+        x0, x1 = layout['x0'].min(), layout['x1'].max()
+        if self.baseline is not None:
+            self.baseline.update(layout)
+            start, end = self.baseline.date_range(start, end)
+            if self.baseline.x_range is not None:
+                x0, x1 = min(x0, self.baseline.x_range[0]), max(x1, self.baseline.x_range[1])
+        ax.xaxis.get_major_locator().set_range(start, end)
+
+        # Límites como los calcularía add_collection; respeta el zoom del usuario
+        half = BAR_HEIGHT / 2
+        ax.dataLim.set_points(np.array([
+            [x0, layout['y'].min() - half],
+            [x1, layout['y'].max() + half]
+        ]))
+        ax.autoscale_view()
+        self.lod.refresh()
+        if self.load_panel is not None:
+            self.load_panel.update(tasks, responsable_colors)
+
+        had_critical = self.dependencies is not None and self.dependencies.has_critical
+        if _DependencyOverlay.applies(layout):
+            if self.dependencies is None:
+                self.dependencies = _DependencyOverlay(ax, layout, self.style)
+            else:
+                self.dependencies.update(layout)
+        elif self.dependencies is not None:
+            self.dependencies.remove()
+            self.dependencies = None
+        has_critical = self.dependencies is not None and self.dependencies.has_critical
+
+        if list(responsable_colors.items()) != list(self.responsable_colors.items()) or has_critical != had_critical:
+            self.legend.remove()
+            self.responsable_colors = responsable_colors
+            self._set_legend(_create_legend(ax, responsable_colors, self.style, has_critical,
+                                            self.baseline is not None))
+        else:
+            self.placer.place()
+
+        # Otras etiquetas pueden necesitar otro margen, como al crear el gráfico
+        if labels != self.labels:
+            ax.figure.tight_layout()
+
+        self.tooltip.reset(layout)
+        if self.export is not None:
+            self.export.invalidate()
+        self.layout = layout
+        self.labels = labels
+        self.responsable_colors = responsable_colors
+        self.filter.reset(layout)
+        if self.filter.active:
+            self.apply_filter()
+
+        merge = diff['_merge']
+        return {
+            'changed': int((merge == 'both').sum()),
+            'added': int((merge == 'right_only').sum()),
+            'removed': int((merge == 'left_only').sum())
+        }
+
+
+def _new_figure(figsize, window=False):
+    """
+    Figura vacía. Para una ventana, gestionada por pyplot con el lienzo del
+    backend (solo en el hilo de la interfaz); si no, una Figure propia con
+    lienzo Agg que pyplot no conoce: no hace falta cerrarla y no comparte
+    estado con otras figuras.
+    """
+    if window:
+        return plt.figure(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _build_gantt_figure(tasks, TITLE=None, sheet_name=None, window=False, file_path=None, reload=None,
+                        style=DEFAULT_STYLE, load=False, capacity=None, baseline=None):
+    """
+    Figura del Gantt para exportar o, con window, para mostrar en una
+    ventana; ver render_gantt y plot_gantt. Con load, el panel de carga de
+    los responsables debajo, con el mismo eje de fechas; con baseline
+    (otras tareas agrupadas), ese plan como barras fantasma detrás.
+    """
+    with stage("layout"):
+        responsable_colors = build_responsable_colors(tasks)
+        layout, labels = _build_bar_layout(tasks)
+    with stage("subplots"):
+        # Una exportación crece en alto para que quepan todas las filas
+        height = 6 if window else export_height(len(labels))
+        if load:
+            height, ratios = with_load_panel(height)
+            fig = _new_figure((12, height), window)
+            ax, load_ax = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': ratios})
+            load_ax.format_coord = lambda x, y: ''
+        else:
+            fig = _new_figure((12, height), window)
+            ax = fig.subplots()
+            load_ax = None
     ax.format_coord = lambda x, y: ''
     display_title = f"{TITLE} ({sheet_name})" if sheet_name else TITLE
-    fig.canvas.manager.set_window_title(display_title)
+    if window:
+        fig.canvas.manager.set_window_title(display_title)
     
     start_date = tasks['Fecha Inicio'].min()
     end_date = tasks['Fecha Fin'].max()
-    tasks = tasks.sort_values(by=['Fecha Inicio', 'Tareas'], ascending=False)
 
-    bars = []
-    for _, task in tasks.iterrows():
-        duration = (task['Fecha Fin'] - task['Fecha Inicio']).days
-        label = _truncate_label(task['Tareas'])
-        color = responsable_colors.get(task['Responsable'], BAR_COLOR)
+    with stage("artists"):
+        ax.xaxis_date()
+        collections = _draw_bars(ax, layout, responsable_colors, style.bar_color)
+        dependencies = _DependencyOverlay(ax, layout, style) if _DependencyOverlay.applies(layout) else None
+        ghosts = None
+        if baseline is not None:
+            with stage("plan_diff"):
+                ghosts = _BaselineOverlay(ax, layout, baseline, style)
+            print_diff(ghosts.diff)
+            start_date, end_date = ghosts.date_range(start_date, end_date)
+            if ghosts.x_range is not None:
+                ax.update_datalim([(ghosts.x_range[0], layout['y'].min()), (ghosts.x_range[1], layout['y'].min())])
+                ax.autoscale_view()
+        lod = LevelOfDetail(ax, collections, layout, BAR_HEIGHT / 2)
+        fig._lod = lod
+        rows = RowAxis(ax, labels, interactive=window, load_panel=load)
+        fig._rows = rows
 
-        bar = ax.barh(label, width=duration, height=0.6, left=task['Fecha Inicio'], color=color)
+        tooltip = None
+        if window:
+            annot = _create_annotation(ax, style)
+            tooltip = _setup_hover_handler(fig, ax, layout, annot)
+            fig._tooltip = tooltip
 
-        for rect in bar:
-            rect.annotation_text = _format_bar_annotation(task, duration)
-            bars.append(rect)
+        # Los meses, bajo el panel de carga si lo hay
+        sec_ax = (load_ax or ax).secondary_xaxis('bottom')
 
-    annot = _create_annotation(ax)
-    _setup_hover_handler(fig, ax, bars, annot)
-
-    week_positions, week_labels = build_week_ticks(start_date, end_date)
-    sec_ax = ax.secondary_xaxis('bottom')
-    
-    _configure_axes(ax, sec_ax, week_positions, week_labels, display_title)
-    _create_legend(ax, responsable_colors)
+        _configure_axes(ax, None if load else sec_ax, start_date, end_date, display_title, style)
+        load_panel = None
+        if load:
+            with stage("resource_load"):
+                load_panel = _LoadPanel(load_ax, tasks, responsable_colors, capacity, style)
+            _configure_axes(load_ax, sec_ax, start_date, end_date, '', style)
+            load_ax.set_ylabel("Tareas a la vez", fontsize=style.label_size, color=style.font_color,
+                               fontfamily=style.font)
+            ax.set_xlabel('')
+            print_overloads(load_panel.overloads)
+        legend = _create_legend(ax, responsable_colors, style, dependencies is not None and dependencies.has_critical,
+                                ghosts is not None)
+        placer = _LegendPlacer(legend, ax, lod)
+        fig._legend_placer = placer
     
-    if not output_path:
-        buttons = _create_floating_buttons(fig, display_title, file_path)
-        fig._buttons = buttons
+    if window:
+        with stage("widgets"):
+            export = FigureExport(fig, ax, style.dpi, rows)
+            fig._export = export
+            chart = _GanttChart(ax, layout, labels, collections, responsable_colors, legend, tooltip, lod, rows,
+                                export, style, dependencies, load_panel, ghosts, placer)
+            fig._chart = chart
+            watcher = None
+            if reload is not None and file_path:
+                watcher = LiveReload(fig, chart, file_path, reload)
+                if LIVE_RELOAD:
+                    watcher.start()
+                fig._watcher = watcher
+            buttons = _create_floating_buttons(fig, display_title, file_path, tooltip, watcher, export, chart)
+            fig._buttons = buttons
+
+    with stage("tight_layout"):
+        fig.tight_layout()
+    with stage("level_of_detail"):
+        # El detalle depende del tamaño final del área de dibujo
+        lod.refresh()
+        placer.place()
+    return fig
 
-    plt.tight_layout()
 
+def render_gantt(tasks, title=None, sheet_name=None, style=None, load=None, capacity=None, baseline=None):
+    """
+    Figura del Gantt de unas tareas agrupadas lista para exportar, con
+    todas las filas y sin botones. Es una Figure con lienzo Agg propio, sin
+    pyplot ni rcParams, y tasks no se modifica: se puede llamar a la vez
+    desde varios hilos. Se guarda con save_figure o fig.savefig.
+    load, capacity y baseline como en plot_gantt.
+    """
+    load = SHOW_RESOURCE_LOAD if load is None else load
+    return _build_gantt_figure(tasks.copy(), title, sheet_name, style=style or DEFAULT_STYLE,
+                               load=load, capacity=capacity, baseline=baseline)
+
+
+def save_figure(fig, output_path, style=None):
+    """Guarda una figura de render_gantt/render_dashboard; el formato sale de la extensión."""
+    with stage("savefig"):
+        fig.savefig(output_path, dpi=(style or DEFAULT_STYLE).dpi, bbox_inches='tight')
+
+
+@profiled()
+def plot_gantt(tasks, TITLE=None, sheet_name=None, output_path=None, file_path=None, reload=None, style=None,
+               load=None, capacity=None, baseline=None):
+    """
+    Dibuja el Gantt de unas tareas agrupadas y lo guarda en output_path o
+    lo muestra en una ventana. reload es una función sin argumentos que
+    vuelve a cargar las tareas agrupadas: con ella, la ventana vigila
+    file_path y se actualiza al guardar el libro (ver LiveReload).
+    Guardar usa render_gantt y vale desde cualquier hilo; la ventana, solo
+    desde el hilo de la interfaz. En la ventana, la leyenda y la caja Buscar
+    filtran las barras sin volver a cargar ni dibujar el gráfico desde cero.
+
+    load añade debajo la carga de cada responsable (por defecto,
+    SHOW_RESOURCE_LOAD) y capacity es el número de tareas a la vez por
+    encima del cual se marca sobrecarga: un número o un dict por
+    responsable (por defecto, RESOURCE_CAPACITY). baseline son las tareas
+    agrupadas de otra versión del plan: se dibujan como barras fantasma
+    detrás de las actuales y se resumen los cambios (ver plan_diff).
+    """
+    style = style or DEFAULT_STYLE
+    load = SHOW_RESOURCE_LOAD if load is None else load
     if output_path:
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-    else:
-        plt.show(block=False)
\ No newline at end of file
+        save_figure(render_gantt(tasks, TITLE, sheet_name, style, load, capacity, baseline), output_path, style)
+        return
+    with rc_context(style.window_rc()):
+        fig = _build_gantt_figure(tasks, TITLE, sheet_name, True, file_path, reload, style, load, capacity, baseline)
+    # El primer dibujado llega después, desde el bucle de la ventana
+    time_first_draw(fig)
+    plt.show(block=False)
+
+
+def _build_dashboard_figure(panels, TITLE=None, window=False, file_path=None, style=DEFAULT_STYLE):
+    """
+    Figura de un dashboard: un Gantt por hoja, apilados con el eje de fechas
+    compartido y un color por responsable común a todos. panels es una lista
+    de (título del panel, tareas agrupadas); ver render_dashboard.
+    """
+    with stage("layout"):
+        responsable_colors = build_shared_responsable_colors([tasks for _, tasks in panels])
+        layouts = [_build_bar_layout(tasks) for _, tasks in panels]
+        height, ratios = dashboard_height([len(labels) for _, labels in layouts], export=not window)
+    with stage("subplots"):
+        fig = _new_figure((12, height), window)
+        axes = fig.subplots(len(panels), 1, sharex=True, squeeze=False, gridspec_kw={'height_ratios': ratios})
+    axes = list(axes[:, 0])
+    if window:
+        fig.canvas.manager.set_window_title(TITLE)
+
+    start_date = min(tasks['Fecha Inicio'].min() for _, tasks in panels)
+    end_date = max(tasks['Fecha Fin'].max() for _, tasks in panels)
+
+    with stage("artists"):
+        lods, row_axes, hover_panels = [], [], []
+        critical = False
+        for ax, (panel_title, _), (layout, labels) in zip(axes, panels, layouts):
+            ax.format_coord = lambda x, y: ''
+            ax.xaxis_date()
+            collections = _draw_bars(ax, layout, responsable_colors, style.bar_color)
+            if _DependencyOverlay.applies(layout):
+                critical = _DependencyOverlay(ax, layout, style).has_critical or critical
+            lods.append(LevelOfDetail(ax, collections, layout, BAR_HEIGHT / 2))
+            row_axes.append(RowAxis(ax, labels, interactive=window, focus_keys=True))
+            if window:
+                hover_panels.append((ax, layout, _create_annotation(ax, style)))
+
+            # Los meses, una sola vez bajo el último panel
+            sec_ax = ax.secondary_xaxis('bottom') if ax is axes[-1] else None
+            _configure_axes(ax, sec_ax, start_date, end_date, panel_title, style)
+            if ax is not axes[-1]:
+                ax.set_xlabel('')
+        fig._lod = lods
+        rows = StackedRows(row_axes)
+        fig._rows = rows
+
+        # Una sola leyenda con todos los responsables, en el panel de arriba
+        legend = _create_legend(axes[0], responsable_colors, style, critical)
+        fig._legend_placer = _LegendPlacer(legend, axes[0], lods[0])
+
+    if window:
+        with stage("widgets"):
+            tooltip = _StackedTooltip(fig, hover_panels)
+            fig._tooltip = tooltip
+            export = FigureExport(fig, axes[0], style.dpi, rows)
+            fig._export = export
+            buttons = _create_floating_buttons(fig, TITLE, file_path, tooltip, export=export)
+            fig._buttons = buttons
+
+    with stage("tight_layout"):
+        fig.tight_layout()
+    with stage("level_of_detail"):
+        for lod in lods:
+            lod.refresh()
+        fig._legend_placer.place()
+    return fig
+
+
+def render_dashboard(panels, title=None, style=None):
+    """Como render_gantt para un dashboard: Figure con lienzo Agg propio y sin modificar las tareas de panels."""
+    panels = [(panel_title, tasks.copy()) for panel_title, tasks in panels]
+    return _build_dashboard_figure(panels, title, style=style or DEFAULT_STYLE)
+
+
+@profiled()
+def plot_dashboard(panels, TITLE=None, output_path=None, file_path=None, style=None):
+    """
+    Dibuja varias hojas como paneles apilados que comparten el eje de fechas
+    y los colores de los responsables, y lo guarda en output_path o lo
+    muestra en una ventana. Guardar escribe '<TITLE>.<formato>' junto a
+    file_path. No se vigilan los libros: la auto-recarga es de plot_gantt.
+    """
+    style = style or DEFAULT_STYLE
+    if output_path:
+        save_figure(render_dashboard(panels, TITLE, style), output_path, style)
+        return
+    with rc_context(style.window_rc()):
+        fig = _build_dashboard_figure(panels, TITLE, True, file_path, style)
+    time_first_draw(fig)
+    plt.show(block=False)
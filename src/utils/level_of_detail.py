@@ -0,0 +1,198 @@
+import math
+
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.ticker import Locator
+
+from config.settings import (
+    LOD_MAX_BARS, LOD_MERGE_GAP_PT, LOD_ROW_PT,
+    DAY_TICK_SPACING_PT, MONTH_TICK_SPACING_PT
+)
+
+# Pasos de los meses del eje secundario, alineados con enero
+MONTH_STEPS = (1, 2, 3, 4, 6, 12, 24, 60, 120)
+
+
+def _axis_points(axes):
+    """Ancho y alto del área de dibujo en puntos: no dependen de los dpi de pantalla o de savefig."""
+    scale = 72 / axes.figure.dpi
+    return axes.bbox.width * scale, axes.bbox.height * scale
+
+
+def _verts(x0, x1, y0, y1):
+    verts = np.empty((len(x0), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = x0
+    verts[:, 2, 0] = verts[:, 3, 0] = x1
+    verts[:, 0, 1] = verts[:, 3, 1] = y0
+    verts[:, 1, 1] = verts[:, 2, 1] = y1
+    return verts
+
+
+def merge_spans(x0, x1, y, half, rows_per_band, gap):
+    """
+    Resume barras en tramos: las filas se agrupan en bandas de
+    rows_per_band y, dentro de cada banda, las barras que se solapan o
+    quedan a menos de gap días se funden en un tramo. Devuelve los
+    extremos (x0, x1, y0, y1) de cada tramo.
+    """
+    bands = np.floor_divide(y, rows_per_band)
+    order = np.lexsort((x0, bands))
+    x0, x1, y, bands = x0[order], x1[order], y[order], bands[order]
+
+    # Fin más lejano alcanzado dentro de cada banda; el desplazamiento por
+    # banda impide que el máximo acumulado pase de una banda a la siguiente
+    offset = bands * (x1.max() - x0.min() + gap + 1)
+    reach = np.maximum.accumulate(x1 + offset) - offset
+
+    starts = np.ones(len(x0), dtype=bool)
+    starts[1:] = (bands[1:] != bands[:-1]) | (x0[1:] > reach[:-1] + gap)
+    idx = np.flatnonzero(starts)
+    return (
+        x0[idx],
+        np.maximum.reduceat(x1, idx),
+        np.minimum.reduceat(y, idx) - half,
+        np.maximum.reduceat(y, idx) + half
+    )
+
+
+class LevelOfDetail:
+    """
+    Ajusta el detalle de las barras a lo que se ve.
+
+    Con cada cambio de xlim/ylim (zoom, desplazamiento, tamaño de ventana)
+    se descartan las barras fuera de la vista y, si aun así quedan más de
+    LOD_MAX_BARS, cada responsable se dibuja como tramos resumen con
+    merge_spans. Así el coste del dibujado depende del tamaño de la
+    ventana y no de la duración del proyecto. Los datos completos de cada
+    responsable se conservan para volver al detalle al acercarse.
+    """
+
+    def __init__(self, ax, collections, layout, half):
+        self.ax = ax
+        self.half = half
+        self.bars = {}
+        self.drawn = {}
+        self.detail = True
+        for resp, group in layout.groupby('Responsable', sort=False, observed=True):
+            self.set_bars(resp, collections[resp], group, refresh=False)
+
+        ax.callbacks.connect('xlim_changed', self.refresh)
+        ax.callbacks.connect('ylim_changed', self.refresh)
+        ax.figure.canvas.mpl_connect('resize_event', self.refresh)
+
+    def set_bars(self, resp, coll, group, refresh=True):
+        """Sustituye las barras de un responsable (p.ej. al recargar)."""
+        self.bars[resp] = (
+            coll,
+            group['x0'].to_numpy(dtype=float),
+            group['x1'].to_numpy(dtype=float),
+            group['y'].to_numpy(dtype=float)
+        )
+        if refresh:
+            self.refresh()
+
+    def remove(self, resp):
+        self.bars.pop(resp, None)
+        self.drawn.pop(resp, None)
+
+    def drawn_boxes(self):
+        """Extremos (x0, x1, y0, y1) de los rectángulos dibujados ahora mismo."""
+        if not self.drawn:
+            return (np.empty(0),) * 4
+        return tuple(np.concatenate(parts) for parts in zip(*self.drawn.values()))
+
+    def refresh(self, *args):
+        xmin, xmax = sorted(self.ax.get_xlim())
+        ymin, ymax = sorted(self.ax.get_ylim())
+        width_pt, height_pt = _axis_points(self.ax)
+
+        visible = {}
+        for resp, (coll, x0, x1, y) in self.bars.items():
+            mask = (x1 >= xmin) & (x0 <= xmax) & (y + self.half >= ymin) & (y - self.half <= ymax)
+            visible[resp] = (x0[mask], x1[mask], y[mask])
+        self.detail = sum(len(x0) for x0, _, _ in visible.values()) <= LOD_MAX_BARS
+
+        if self.detail:
+            self.drawn = {
+                resp: (x0, x1, y - self.half, y + self.half)
+                for resp, (x0, x1, y) in visible.items()
+            }
+        else:
+            self.drawn = self._summarize(visible, xmax - xmin, ymax - ymin, width_pt, height_pt)
+        for resp, (coll, _, _, _) in self.bars.items():
+            coll.set_verts(_verts(*self.drawn[resp]))
+
+    def _summarize(self, visible, x_span, y_span, width_pt, height_pt):
+        """
+        Tramos por responsable. Si con bandas de LOD_ROW_PT siguen saliendo
+        más de LOD_MAX_BARS (muchos responsables con una barra por fila), se
+        duplica el alto de las bandas y, cuando ya abarcan todas las filas,
+        el hueco que se funde (al menos un punto), hasta que quepan.
+        """
+        gap = LOD_MERGE_GAP_PT * x_span / max(width_pt, 1)
+        rows_per_band = max(1, math.ceil(LOD_ROW_PT * y_span / max(height_pt, 1)))
+        while True:
+            drawn = {
+                resp: merge_spans(x0, x1, y, self.half, rows_per_band, gap) if len(x0) else (x0, x1, y, y)
+                for resp, (x0, x1, y) in visible.items()
+            }
+            if sum(len(x0) for x0, _, _, _ in drawn.values()) <= LOD_MAX_BARS or gap > x_span:
+                return drawn
+            if rows_per_band <= y_span:
+                rows_per_band *= 2
+            else:
+                # Con LOD_MERGE_GAP_PT = 0 el hueco no crecería nunca: como poco, un punto
+                gap = max(gap * 2, x_span / max(width_pt, 1))
+
+
+class WeekTickLocator(Locator):
+    """
+    Lunes entre start y end como ticks del eje X. Si no caben a
+    DAY_TICK_SPACING_PT, se muestra uno de cada k semanas, contando desde
+    el primer lunes para que no cambien al desplazarse.
+    """
+
+    def __init__(self, start, end):
+        self.set_range(start, end)
+
+    def set_range(self, start, end):
+        self.first = mdates.date2num(pd.Timestamp(start).normalize() + pd.offsets.Week(weekday=0, n=0))
+        self.last = mdates.date2num(pd.Timestamp(end))
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        vmin, vmax = sorted((vmin, vmax))
+        width_pt = _axis_points(self.axis.axes)[0]
+        pt_per_week = width_pt * 7 / max(vmax - vmin, 1e-9)
+        step = 7 * max(1, math.ceil(DAY_TICK_SPACING_PT / pt_per_week))
+
+        lo = max(vmin, self.first)
+        hi = min(vmax, self.last)
+        if hi < lo:
+            return []
+        k0 = math.ceil((lo - self.first) / step)
+        k1 = math.floor((hi - self.first) / step)
+        return self.first + step * np.arange(k0, k1 + 1)
+
+
+class MonthTickLocator(Locator):
+    """Meses del eje secundario: cada mes si caben a MONTH_TICK_SPACING_PT, si no cada 2, 3, 6... meses o años."""
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        vmin, vmax = sorted((vmin, vmax))
+        width_pt = _axis_points(self.axis.axes)[0]
+        pt_per_month = width_pt * 30.44 / max(vmax - vmin, 1e-9)
+        step = next((s for s in MONTH_STEPS if s * pt_per_month >= MONTH_TICK_SPACING_PT), MONTH_STEPS[-1])
+        if step <= 12:
+            locator = mdates.MonthLocator(bymonth=range(1, 13, step))
+        else:
+            locator = mdates.YearLocator(step // 12)
+        return locator.tick_values(mdates.num2date(vmin), mdates.num2date(vmax))
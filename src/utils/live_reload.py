@@ -0,0 +1,104 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import LIVE_RELOAD_INTERVAL_MS
+from src.utils.task_cache import file_hash
+
+
+def _file_stat(file_path):
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        # Excel sustituye el fichero al guardar: puede no existir un instante
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class LiveReload:
+    """
+    Vigila el libro de un gráfico abierto y aplica los cambios al guardarlo.
+
+    Un temporizador del lienzo compara la fecha de modificación y el tamaño
+    del fichero; si cambian, un hilo calcula el hash del contenido y, solo
+    si es distinto, vuelve a cargar la hoja con load. El resultado se
+    aplica en el hilo de la interfaz con chart.update, que toca únicamente
+    las barras que han cambiado.
+    """
+
+    def __init__(self, fig, chart, file_path, load, interval=LIVE_RELOAD_INTERVAL_MS):
+        self.fig = fig
+        self.chart = chart
+        self.file_path = file_path
+        self.load = load
+        self.stat = _file_stat(file_path)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = self.executor.submit(file_hash, file_path)
+        self.hash = None
+        self.changed_at = None
+        self.enabled = False
+
+        self.timer = fig.canvas.new_timer(interval=interval)
+        self.timer.add_callback(self._poll)
+        fig.canvas.mpl_connect('close_event', lambda event: self.close())
+
+    def start(self):
+        self.enabled = True
+        self.timer.start()
+
+    def stop(self):
+        self.enabled = False
+        self.timer.stop()
+
+    def close(self):
+        self.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        if self.pending is not None:
+            if self.pending.done():
+                self._apply(self.pending)
+            return
+
+        stat = _file_stat(self.file_path)
+        if stat is None or stat == self.stat:
+            return
+        self.stat = stat
+        self.changed_at = time.perf_counter()
+        self.pending = self.executor.submit(self._reload, self.hash)
+
+    def _reload(self, previous_hash):
+        """En el hilo de trabajo: None si el contenido no ha cambiado (solo se ha tocado el fichero)."""
+        content_hash = file_hash(self.file_path)
+        if content_hash == previous_hash:
+            return content_hash, None
+        return content_hash, self.load()
+
+    def _apply(self, future):
+        self.pending = None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Error al recargar {os.path.basename(self.file_path)}: {e}")
+            return
+
+        # La primera tarea solo calcula el hash de partida
+        if isinstance(result, str):
+            self.hash = result
+            return
+        self.hash, tasks = result
+        if tasks is None:
+            return
+        if tasks.empty:
+            print(f"{os.path.basename(self.file_path)} sin tareas tras recargar: se mantiene el gráfico")
+            return
+
+        load_time = time.perf_counter() - self.changed_at
+        start = time.perf_counter()
+        changes = self.chart.update(tasks)
+        print(
+            f"{os.path.basename(self.file_path)} recargado: {changes['changed']} cambiadas, "
+            f"{changes['added']} nuevas, {changes['removed']} eliminadas "
+            f"(carga {load_time:.2f}s, actualización {time.perf_counter() - start:.3f}s)"
+        )
+        self.fig.canvas.draw_idle()
@@ -0,0 +1,131 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.task_loader import normalize_name
+
+# Sin matplotlib: compara dos planes de tareas agrupadas y sirve también fuera del gráfico
+
+NEW = 'nueva'
+REMOVED = 'eliminada'
+SHIFTED = 'desplazada'
+RESIZED = 'duracion'
+UNCHANGED = 'sin cambios'
+STATUSES = [NEW, REMOVED, SHIFTED, RESIZED, UNCHANGED]
+
+# Columnas de la tabla exportada, en orden
+TABLE_COLUMNS = ['Responsable', 'Tareas', 'Estado', 'Inicio base', 'Fin base', 'Fecha Inicio', 'Fecha Fin',
+                 'Desplazamiento', 'Retraso fin', 'Cambio duracion']
+
+
+def normalize_names(values):
+    """
+    Códigos enteros de unos textos sin distinguir mayúsculas ni espacios:
+    dos valores tienen el mismo código si son el mismo nombre. Se normaliza
+    una vez por valor distinto.
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = [normalize_name(value) for value in uniques]
+    return pd.factorize(np.array(normalized, dtype=object))[0][codes]
+
+
+def _plan_keys(current, baseline):
+    """Clave entera de cada tarea de los dos planes, codificadas juntas para que sean comparables."""
+    keys = np.zeros(len(current) + len(baseline), dtype=np.int64)
+    for col in ('Responsable', 'Tareas'):
+        codes = normalize_names(np.concatenate([
+            np.asarray(current[col], dtype=object), np.asarray(baseline[col], dtype=object)
+        ]))
+        keys = keys * (codes.max(initial=0) + 1) + codes
+    return keys[:len(current)], keys[len(current):]
+
+
+def _keyed(tasks, keys, collapse=False):
+    """
+    Tareas con su clave. Con collapse, una fila por clave: dos filas con la
+    misma clave (p.ej. 'Diseño' y 'diseño ') son una tarea del plan base.
+    """
+    frame = pd.DataFrame({
+        'key': keys,
+        'Responsable': np.asarray(tasks['Responsable'], dtype=object),
+        'Tareas': np.asarray(tasks['Tareas'], dtype=object),
+        'Fecha Inicio': tasks['Fecha Inicio'].to_numpy(),
+        'Fecha Fin': tasks['Fecha Fin'].to_numpy(),
+        'fila': np.arange(len(tasks))
+    })
+    if collapse and frame['key'].duplicated().any():
+        frame = frame.groupby('key', sort=False, as_index=False).agg({
+            'Responsable': 'first', 'Tareas': 'first', 'Fecha Inicio': 'min', 'Fecha Fin': 'max', 'fila': 'first'
+        })
+    return frame
+
+
+def diff_plans(baseline, current):
+    """
+    Compara dos planes de tareas agrupadas (group_tasks_by_group) por
+    (Responsable, Tareas) normalizados. Las claves de los dos planes se
+    codifican juntas como enteros y se cruzan con un merge, que es un hash
+    join: O(n) y no una búsqueda de cada tarea en el otro plan.
+
+    Cada tarea queda como nueva, eliminada, desplazada (cambia su inicio),
+    duracion (mismo inicio y otro fin) o sin cambios, con el desplazamiento
+    del inicio, el retraso del fin y el cambio de duración en días. fila y
+    fila base son su posición en current y en baseline (-1 si no está).
+    Cada fila de current sale una vez aunque comparta clave con otra: las
+    dos se comparan con la misma tarea de la base.
+    """
+    current_keys, baseline_keys = _plan_keys(current, baseline)
+    cur = _keyed(current, current_keys)
+    base = _keyed(baseline, baseline_keys, collapse=True)
+
+    merged = cur.merge(
+        base.rename(columns={'Fecha Inicio': 'Inicio base', 'Fecha Fin': 'Fin base', 'fila': 'fila base'}),
+        on='key', how='outer', suffixes=('', '_base'), sort=False, indicator=True
+    )
+    missing = merged['Responsable'].isna()
+    merged['Responsable'] = merged['Responsable'].where(~missing, merged['Responsable_base'])
+    merged['Tareas'] = merged['Tareas'].where(~missing, merged['Tareas_base'])
+
+    day = np.timedelta64(1, 'D')
+    shift = (merged['Fecha Inicio'] - merged['Inicio base']) / day
+    end_shift = (merged['Fecha Fin'] - merged['Fin base']) / day
+    merged['Desplazamiento'] = shift
+    merged['Retraso fin'] = end_shift
+    merged['Cambio duracion'] = end_shift - shift
+
+    side = merged['_merge']
+    merged['Estado'] = pd.Categorical(np.select(
+        [side == 'left_only', side == 'right_only', shift != 0, end_shift != 0],
+        [NEW, REMOVED, SHIFTED, RESIZED],
+        default=UNCHANGED
+    ), categories=STATUSES)
+    for col in ('fila', 'fila base'):
+        merged[col] = merged[col].fillna(-1).astype(np.int64)
+    return merged[TABLE_COLUMNS + ['fila', 'fila base']]
+
+
+def summarize(diff):
+    """Número de tareas de cada estado, en el orden de STATUSES."""
+    return diff['Estado'].value_counts(sort=False).reindex(STATUSES, fill_value=0)
+
+
+def print_diff(diff, limit=10):
+    """Resumen por consola: tareas por estado y los mayores desplazamientos."""
+    counts = summarize(diff)
+    print("Cambios respecto a la base: " + ", ".join(f"{n} {status}" for status, n in counts.items() if n))
+    moved = diff[diff['Estado'].isin([SHIFTED, RESIZED])]
+    order = moved['Retraso fin'].abs().sort_values(ascending=False).index[:limit]
+    for _, task in moved.loc[order].iterrows():
+        print(f"  {task['Tareas']} ({task['Responsable']}): inicio {task['Desplazamiento']:+g} dias, "
+              f"fin {task['Retraso fin']:+g} dias")
+
+
+def write_diff(diff, path):
+    """Guarda la comparación como tabla: .xlsx o, con cualquier otra extensión, CSV."""
+    table = diff[TABLE_COLUMNS].sort_values(['Estado', 'Responsable', 'Tareas'])
+    if os.path.splitext(path)[1].lower() == '.xlsx':
+        table.to_excel(path, index=False, sheet_name='Cambios')
+    else:
+        # Con BOM: Excel abre bien los acentos
+        table.to_csv(path, index=False, encoding='utf-8-sig')
@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import cProfile
+import threading
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from functools import wraps
+
+from config.settings import PROFILE_ENABLED, PROFILE_MEMORY, PROFILE_DIR
+
+# Solo biblioteca estándar: la ventana de configuración también se instrumenta
+# y no debe esperar a pandas/matplotlib
+
+MB = 1024 * 1024
+
+
+def _env_mode():
+    """GANTT_PROFILE: vacío o 0 desactiva, 'cprofile' añade volcados de cProfile, cualquier otro valor activa."""
+    value = os.environ.get("GANTT_PROFILE", "").strip().lower()
+    if value in ("", "0"):
+        return None
+    return value
+
+
+_mode = _env_mode()
+_enabled = PROFILE_ENABLED or _mode is not None
+_cprofile = _mode == "cprofile"
+
+_NULL = nullcontext()
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(cprofile=False):
+    """
+    Activa el perfilado en este proceso y, a través de GANTT_PROFILE, en los
+    procesos que se lancen después (p.ej. el pool de batch.py).
+    """
+    global _enabled, _cprofile
+    _enabled = True
+    _cprofile = _cprofile or cprofile
+    os.environ["GANTT_PROFILE"] = "cprofile" if _cprofile else "1"
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _Stage:
+    """
+    Etapa medida: tiempo de reloj y, con PROFILE_MEMORY, memoria reservada
+    por encima de la que había al entrar. Las etapas anidadas quedan como
+    hijas de la que las contiene; al cerrar la más externa se emite el árbol.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+        self.error = None
+        self.peak = None
+        self.profiler = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        if PROFILE_MEMORY:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            # El pico se reinicia para esta etapa: el de la madre hasta aquí se le guarda a ella
+            if self.parent is not None and self.parent.peak is not None:
+                self.parent.peak = max(self.parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.base = current
+            self.peak = current
+        if self.parent is None and _cprofile:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Ya hay otro perfilador activo (p.ej. en otro hilo)
+                self.profiler = None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+        _stack().pop()
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        if self.peak is not None:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if self.parent is not None and self.parent.peak is not None:
+                self.parent.peak = max(self.parent.peak, self.peak)
+
+        if self.parent is not None:
+            self.parent.children.append(self)
+        else:
+            _emit(self)
+        return False
+
+    def records(self, path="", depth=0):
+        path = f"{path}/{self.name}" if path else self.name
+        record = {"stage": path, "depth": depth, "seconds": round(self.seconds, 6)}
+        if self.peak is not None:
+            record["peak_mb"] = round((self.peak - self.base) / MB, 3)
+        if self.error:
+            record["error"] = self.error
+        yield record
+        for child in self.children:
+            yield from child.records(path, depth + 1)
+
+
+def stage(name):
+    """
+    Contexto que mide una etapa si el perfilado está activo. Desactivado
+    devuelve siempre el mismo nullcontext: el coste es una comprobación.
+    """
+    if not _enabled:
+        return _NULL
+    return _Stage(name)
+
+
+def profiled(name=None):
+    """Decorador: la llamada entera es una etapa (por defecto, con el nombre de la función)."""
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds):
+    """Emite una etapa medida fuera de un contexto (p.ej. desde un callback)."""
+    if not _enabled:
+        return
+    _write({"stage": name, "depth": 0, "seconds": round(seconds, 6)})
+    print(f"Perfil {name}: {seconds:.3f}s")
+
+
+def time_first_draw(fig, name="first_draw"):
+    """Mide desde ahora hasta el final del primer dibujado de la figura (en pantalla, tras show)."""
+    if not _enabled:
+        return
+    start = time.perf_counter()
+
+    def on_draw(event):
+        fig.canvas.mpl_disconnect(cid)
+        record(name, time.perf_counter() - start)
+
+    cid = fig.canvas.mpl_connect("draw_event", on_draw)
+
+
+def _run_id():
+    return f"{datetime.now():%Y%m%d-%H%M%S-%f}-{os.getpid()}"
+
+
+def _write(records):
+    """Añade los registros a PROFILE_DIR/profile.jsonl, uno por línea, con un id común."""
+    run = _run_id()
+    if isinstance(records, dict):
+        records = [records]
+    now = datetime.now().isoformat(timespec="milliseconds")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with _write_lock, open(os.path.join(PROFILE_DIR, "profile.jsonl"), "a", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(dict(rec, run=run, time=now, pid=os.getpid()), ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"No se pudo guardar el perfil: {e}")
+    return run
+
+
+def _emit(top):
+    records = list(top.records())
+    run = _write(records)
+
+    width = max(2 * r["depth"] + len(r["stage"].rsplit("/", 1)[-1]) for r in records)
+    lines = [f"Perfil {top.name} ({run}):"]
+    for r in records:
+        label = "  " * r["depth"] + r["stage"].rsplit("/", 1)[-1]
+        memory = f"  {r['peak_mb']:+9.1f} MB" if "peak_mb" in r else ""
+        error = f"  [{r['error']}]" if "error" in r else ""
+        lines.append(f"  {label:<{width}}  {r['seconds']:8.3f}s{memory}{error}")
+
+    if top.profiler is not None:
+        dump = os.path.join(PROFILE_DIR, f"{run}.prof")
+        try:
+            top.profiler.dump_stats(dump)
+            lines.append(f"  cProfile: {dump}")
+        except OSError as e:
+            lines.append(f"  cProfile no guardado: {e}")
+    print("\n".join(lines))
@@ -0,0 +1,230 @@
+import os
+import json
+import glob
+import hashlib
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from config.settings import (
+    SERVICE_WORKERS, SERVICE_MAX_PENDING, SERVICE_TIMEOUT_S,
+    SERVICE_CACHE_DIR, SERVICE_CACHE_MAX_MB
+)
+from src.utils.batch_render import _init_worker
+
+# Se incrementa cuando cambia lo que dibuja plot_gantt: las imágenes en caché de otra versión no se usan
+RENDER_VERSION = 2
+FORMATS = {"png": "image/png", "svg": "image/svg+xml", "pdf": "application/pdf"}
+
+
+class RenderError(Exception):
+    """La hoja no se puede dibujar (sin cabecera, sin columnas de fechas, sin tareas...)."""
+
+
+class ServiceBusy(Exception):
+    """Demasiados renders en cola."""
+
+
+def cache_key(data, sheet_name=None, header=None, column_mapping=None, fmt="png", title=None):
+    """Hash del contenido del libro y de todo lo que cambia la imagen."""
+    params = json.dumps(
+        [RENDER_VERSION, sheet_name, header, sorted((column_mapping or {}).items()), fmt, title],
+        ensure_ascii=False
+    )
+    digest = hashlib.sha256(data)
+    digest.update(params.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_workbook(data, filename="libro.xlsx", sheet_name=None, header=None, column_mapping=None,
+                    fmt="png", title=None):
+    """
+    Dibuja una hoja de un libro recibido como bytes y devuelve la imagen.
+    Se ejecuta en un proceso del pool: leer el Excel y dibujar no sueltan
+    el GIL, así que los renders en paralelo necesitan procesos.
+    """
+    from src.utils.batch_render import load_sheet
+    from src.utils.gantt_utils import plot_gantt
+    from src.utils.workbook_cache import workbook_cache, get_sheet_names
+
+    title = title or os.path.splitext(os.path.basename(filename))[0] or "Gantt"
+    suffix = os.path.splitext(filename)[1].lower() or ".xlsx"
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "libro" + suffix)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        try:
+            try:
+                sheets = get_sheet_names(file_path)
+            except Exception as e:
+                raise RenderError(f"no es un libro Excel válido ({type(e).__name__}: {e})")
+            if sheet_name is None:
+                sheet_name = sheets[0]
+            elif sheet_name not in sheets:
+                raise RenderError(f"no existe la hoja {sheet_name!r}")
+            # Sin caché de tareas: el libro temporal desaparece al terminar
+            grouped, reason = load_sheet(file_path, sheet_name, header, column_mapping, use_cache=False)
+            if grouped is None:
+                raise RenderError(reason)
+            output_path = os.path.join(tmp, f"gantt.{fmt}")
+            plot_gantt(grouped, TITLE=title, sheet_name=sheet_name, output_path=output_path)
+            with open(output_path, "rb") as f:
+                return f.read()
+        finally:
+            # Las hojas de un libro temporal no se vuelven a pedir
+            workbook_cache.clear()
+
+
+class ResultCache:
+    """
+    Imágenes ya dibujadas en disco, una por clave: '<clave>.<formato>'. Al
+    superar max_bytes se borran las de uso más antiguo (fecha de modificación,
+    que se actualiza en cada acierto).
+    """
+
+    def __init__(self, directory=SERVICE_CACHE_DIR, max_bytes=SERVICE_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, fmt):
+        return os.path.join(self.directory, f"{key}.{fmt}")
+
+    def get(self, key, fmt):
+        path = self._path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key, fmt, data):
+        path = self._path(key, fmt)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"No se pudo guardar en la caché de render ({path}): {e}")
+            return
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in glob.glob(os.path.join(glob.escape(self.directory), "*.*")):
+            if path.endswith(".tmp"):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+class RenderService:
+    """
+    Renders de Gantt con un pool fijo de procesos y caché por contenido.
+
+    Una petición cuya clave ya está en la caché se responde sin tocar el
+    pool; si la misma clave ya se está dibujando, se espera a ese mismo
+    render en lugar de lanzar otro. Con max_pending renders distintos en
+    marcha, las peticiones nuevas se rechazan con ServiceBusy.
+    """
+
+    def __init__(self, workers=SERVICE_WORKERS, cache=None, max_pending=SERVICE_MAX_PENDING,
+                 timeout=SERVICE_TIMEOUT_S):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self.cache = cache if cache is not None else ResultCache()
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.inflight = {}
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def render(self, data, filename="libro.xlsx", sheet_name=None, header=None, column_mapping=None,
+               fmt="png", title=None):
+        """
+        Devuelve (imagen, 'hit' | 'miss' | 'shared', clave); lanza
+        RenderError, ServiceBusy, TimeoutError o BrokenProcessPool.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"formato no válido: {fmt!r}")
+        key = cache_key(data, sheet_name, header, column_mapping, fmt, title)
+        cached = self.cache.get(key, fmt)
+        if cached is not None:
+            self._count("hit")
+            return cached, "hit", key
+
+        pool = None
+        try:
+            with self._lock:
+                # Cada render recuerda su pool para sustituir solo el que se ha roto
+                future, pool = self.inflight.get(key, (None, self.pool))
+                outcome = "shared"
+                if future is None:
+                    if len(self.inflight) >= self.max_pending:
+                        self.stats["busy"] += 1
+                        raise ServiceBusy(f"{len(self.inflight)} renders en curso")
+                    future = pool.submit(render_workbook, data, filename, sheet_name, header,
+                                         column_mapping, fmt, title)
+                    self.inflight[key] = (future, pool)
+                    future.add_done_callback(lambda f: self._finish(key, fmt, f))
+                    outcome = "miss"
+
+            image = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            self._count("timeout")
+            raise TimeoutError(f"el render no terminó en {self.timeout}s")
+        except RenderError:
+            self._count("rejected")
+            raise
+        except BrokenProcessPool:
+            # Un proceso ha muerto (p.ej. sin memoria): el pool no admite más trabajo y se sustituye
+            self._count("error")
+            self._restart_pool(pool)
+            raise
+        self._count(outcome)
+        return image, outcome, key
+
+    def _restart_pool(self, broken):
+        """Sustituye el pool roto; si otra petición ya lo ha hecho, no hay nada que hacer."""
+        with self._lock:
+            if self.pool is not broken:
+                return
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, key, fmt, future):
+        # En el hilo del pool al terminar el render: la imagen queda en caché antes de liberar la clave
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, fmt, future.result())
+        with self._lock:
+            self.inflight.pop(key, None)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def status(self):
+        with self._lock:
+            return {"workers": self.workers, "in_flight": len(self.inflight), **self.stats}
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from config.settings import RESOURCE_CAPACITY
+
+# Sin matplotlib: es análisis de las tareas agrupadas y sirve también fuera del gráfico
+
+
+def resource_load(tasks):
+    """
+    Tareas simultáneas de cada responsable a lo largo del tiempo.
+
+    Barrido de eventos: +1 en cada inicio y -1 en cada fin, ordenados una
+    sola vez por (responsable, fecha) y acumulados con cumsum; O(n log n)
+    sin bucles por responsable. Una tarea que acaba cuando empieza otra no
+    se solapa con ella. Devuelve un DataFrame Responsable, Fecha, Carga: la
+    carga vale Carga desde Fecha hasta la siguiente fila del mismo
+    responsable, y la última fila de cada uno vale 0.
+    """
+    codes, owners = pd.factorize(tasks['Responsable'])
+    start = tasks['Fecha Inicio'].to_numpy(dtype='datetime64[ns]').view('i8')
+    end = tasks['Fecha Fin'].to_numpy(dtype='datetime64[ns]').view('i8')
+    n = len(codes)
+
+    code = np.concatenate([codes, codes])
+    time = np.concatenate([start, end])
+    delta = np.concatenate([np.ones(n, dtype=np.int32), -np.ones(n, dtype=np.int32)])
+    # A igual fecha, los fines antes que los inicios
+    order = np.lexsort((delta, time, code))
+    code, time, delta = code[order], time[order], delta[order]
+    # Los eventos de cada responsable suman 0: el acumulado global es el suyo
+    load = np.cumsum(delta)
+
+    # Con varios eventos en la misma fecha vale el último
+    last = np.ones(len(code), dtype=bool)
+    last[:-1] = (code[1:] != code[:-1]) | (time[1:] != time[:-1])
+    code, time, load = code[last], time[last], load[last]
+    # Y solo las fechas en que la carga cambia
+    changed = np.ones(len(code), dtype=bool)
+    changed[1:] = (code[1:] != code[:-1]) | (load[1:] != load[:-1])
+    return pd.DataFrame({
+        'Responsable': pd.Categorical.from_codes(code[changed], categories=pd.Index(list(owners))),
+        'Fecha': time[changed].view('datetime64[ns]'),
+        'Carga': load[changed]
+    })
+
+
+def capacities(owners, capacity):
+    """Capacidad de cada fila: un número para todos o un dict por responsable (los que falten, RESOURCE_CAPACITY)."""
+    if isinstance(capacity, dict):
+        return owners.map(lambda owner: capacity.get(owner, RESOURCE_CAPACITY)).to_numpy(dtype=float)
+    return np.full(len(owners), RESOURCE_CAPACITY if capacity is None else capacity, dtype=float)
+
+
+def overloads(load, capacity=None):
+    """
+    Tramos en los que un responsable tiene más tareas a la vez que su
+    capacidad, a partir de resource_load. Los tramos seguidos se unen en uno
+    con la carga máxima. Devuelve un DataFrame Responsable, Inicio, Fin,
+    Dias, Carga ordenado por responsable e inicio.
+    """
+    owners = load['Responsable']
+    code = owners.cat.codes.to_numpy()
+    over = load['Carga'].to_numpy() > capacities(owners.astype(object), capacity)
+    # La última fila de cada responsable vale 0: nunca está por encima y el siguiente Fecha es suyo
+    next_time = np.roll(load['Fecha'].to_numpy(), -1)
+
+    previous = np.zeros(len(over), dtype=bool)
+    previous[1:] = over[:-1] & (code[1:] == code[:-1])
+    run = np.cumsum(over & ~previous)[over]
+    spans = pd.DataFrame({
+        'Responsable': owners[over].to_numpy(),
+        'Inicio': load['Fecha'].to_numpy()[over],
+        'Fin': next_time[over],
+        'Carga': load['Carga'].to_numpy()[over],
+        'run': run
+    }).groupby('run', sort=True).agg({'Responsable': 'first', 'Inicio': 'first', 'Fin': 'last', 'Carga': 'max'})
+    spans.insert(3, 'Dias', (spans['Fin'] - spans['Inicio']).dt.days)
+    return spans.reset_index(drop=True)
+
+
+def load_matrix(load):
+    """
+    Carga de todos los responsables sobre las fechas en que cambia alguna:
+    (fechas, responsables, matriz responsables x fechas). Para apilarlas en
+    un gráfico; las fechas son como mucho los días distintos del plan.
+    """
+    times, column = np.unique(load['Fecha'].to_numpy(), return_inverse=True)
+    owners = load['Responsable']
+    code = owners.cat.codes.to_numpy()
+    carga = load['Carga'].to_numpy()
+    # Cambio de carga en cada fecha; la primera fila de cada responsable parte de 0
+    change = np.diff(carga, prepend=0)
+    first = np.ones(len(code), dtype=bool)
+    first[1:] = code[1:] != code[:-1]
+    change[first] = carga[first]
+
+    matrix = np.zeros((len(owners.cat.categories), len(times)), dtype=np.int32)
+    matrix[code, column] = change
+    return times, list(owners.cat.categories), np.cumsum(matrix, axis=1)
+
+
+def print_overloads(spans, limit=10):
+    """Resumen por consola: los tramos más largos primero."""
+    if spans.empty:
+        return
+    print(f"Sobrecargas: {len(spans)} tramos de {spans['Responsable'].nunique()} responsables")
+    for _, span in spans.sort_values(['Dias', 'Carga'], ascending=False).head(limit).iterrows():
+        print(f"  {span['Responsable']}: {span['Carga']} tareas a la vez del "
+              f"{span['Inicio']:%d/%m/%y} al {span['Fin']:%d/%m/%y} ({span['Dias']} dias)")
@@ -0,0 +1,212 @@
+import math
+from contextlib import contextmanager
+
+import numpy as np
+from matplotlib.ticker import Locator, Formatter
+
+from config.settings import VISIBLE_ROWS, ROW_LABEL_SPACING_PT, EXPORT_MAX_HEIGHT_IN
+
+# Alto de la figura cuando caben todas las filas (como el figsize original)
+BASE_HEIGHT_IN = 6
+# Filas que avanza cada paso de la rueda del ratón
+SCROLL_ROWS = 3
+# Dashboard: filas mínimas de cada panel, alto de su título y ejes, y alto máximo de la ventana
+PANEL_MIN_ROWS = 8
+PANEL_EXTRA_IN = 0.6
+WINDOW_MAX_HEIGHT_IN = 10
+# Alto del panel de carga de responsables bajo las barras
+LOAD_PANEL_IN = 1.8
+
+
+def export_height(n_rows):
+    """Alto de figura para exportar todas las filas con el mismo espacio por fila que en pantalla."""
+    if n_rows <= VISIBLE_ROWS:
+        return BASE_HEIGHT_IN
+    return min(BASE_HEIGHT_IN * n_rows / VISIBLE_ROWS, EXPORT_MAX_HEIGHT_IN)
+
+
+def dashboard_height(row_counts, export=False):
+    """
+    Alto de la figura y proporción de alto de cada panel de un dashboard,
+    con el mismo espacio por fila que un Gantt suelto. En la ventana cada
+    panel muestra como mucho VISIBLE_ROWS filas; al exportar, todas.
+    """
+    rows = [max(n, PANEL_MIN_ROWS) if export else min(max(n, PANEL_MIN_ROWS), VISIBLE_ROWS) for n in row_counts]
+    ratios = [BASE_HEIGHT_IN * n / VISIBLE_ROWS + PANEL_EXTRA_IN for n in rows]
+    limit = EXPORT_MAX_HEIGHT_IN if export else WINDOW_MAX_HEIGHT_IN
+    return min(max(sum(ratios), BASE_HEIGHT_IN), limit), ratios
+
+
+def with_load_panel(height):
+    """Alto de la figura y proporciones (barras, carga) al añadir el panel de carga a unas barras de alto height."""
+    return height + LOAD_PANEL_IN, [height, LOAD_PANEL_IN]
+
+
+@contextmanager
+def _all_rows(fig, row_axes, height, ratios=None):
+    """Figura de alto height con todas las filas de cada eje a la vista mientras dura el bloque."""
+    size = fig.get_size_inches()
+    params = fig.subplotpars
+    margins = dict(left=params.left, right=params.right, bottom=params.bottom, top=params.top,
+                   wspace=params.wspace, hspace=params.hspace)
+    views = [(rows.ax.get_ylim(), rows.ax.get_autoscaley_on()) for rows in row_axes]
+    gridspec = row_axes[0].ax.get_gridspec() if ratios is not None else None
+    old_ratios = gridspec.get_height_ratios() if gridspec is not None else None
+
+    fig.set_size_inches(size[0], height, forward=False)
+    if gridspec is not None:
+        gridspec.set_height_ratios(ratios)
+    for rows in row_axes:
+        rows.ax.set_autoscaley_on(True)
+        rows.ax.autoscale_view(scalex=False)
+    fig.tight_layout()
+    try:
+        yield
+    finally:
+        fig.set_size_inches(size, forward=False)
+        if gridspec is not None:
+            gridspec.set_height_ratios(old_ratios)
+        fig.subplots_adjust(**margins)
+        for rows, (ylim, autoscale) in zip(row_axes, views):
+            if autoscale:
+                rows.ax.set_autoscaley_on(True)
+            else:
+                rows.ax.set_ylim(ylim)
+
+
+class RowLocator(Locator):
+    """
+    Ticks en las filas enteras visibles. Si no caben a ROW_LABEL_SPACING_PT,
+    una de cada k filas, contadas desde la 0 para que no bailen al desplazarse.
+    """
+
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        vmin, vmax = sorted((vmin, vmax))
+        axes = self.axis.axes
+        height_pt = axes.bbox.height * 72 / axes.figure.dpi
+        pt_per_row = height_pt / max(vmax - vmin, 1e-9)
+        step = max(1, math.ceil(ROW_LABEL_SPACING_PT / pt_per_row))
+
+        lo = max(0, math.ceil(vmin))
+        hi = min(self.n_rows - 1, math.floor(vmax))
+        return np.arange(math.ceil(lo / step) * step, hi + 1, step)
+
+
+class RowFormatter(Formatter):
+    """Etiqueta de cada fila a partir de la lista de etiquetas; solo se formatean los ticks visibles."""
+
+    def __init__(self, labels):
+        self.labels = labels
+
+    def __call__(self, y, pos=None):
+        row = int(round(y))
+        return self.labels[row] if 0 <= row < len(self.labels) else ''
+
+
+class RowAxis:
+    """
+    Eje Y de tareas: barras en filas enteras y etiquetas buscadas por fila.
+
+    Solo se crean y maquetan las etiquetas de las filas visibles. En una
+    ventana con más de VISIBLE_ROWS filas se muestran las primeras y el
+    resto se recorre con la rueda del ratón, AvPág/RePág e Inicio/Fin.
+    all_rows() amplía temporalmente la figura para exportar todas; con
+    load_panel, el panel de carga de debajo conserva su alto.
+    """
+
+    def __init__(self, ax, labels, interactive=True, focus_keys=False, load_panel=False):
+        self.ax = ax
+        self.load_panel = load_panel
+        # Con varios ejes en la figura, las teclas solo mueven el que está bajo el ratón
+        self.focus_keys = focus_keys
+        self.locator = RowLocator(len(labels))
+        self.formatter = RowFormatter(labels)
+        ax.yaxis.set_major_locator(self.locator)
+        ax.yaxis.set_major_formatter(self.formatter)
+
+        if interactive:
+            canvas = ax.figure.canvas
+            canvas.mpl_connect('scroll_event', self.on_scroll)
+            canvas.mpl_connect('key_press_event', self.on_key)
+            if len(labels) > VISIBLE_ROWS:
+                # Las filas altas son las tareas que empiezan antes
+                top = self.bounds()[1]
+                ax.set_ylim(top - VISIBLE_ROWS, top)
+
+    @property
+    def n_rows(self):
+        return len(self.formatter.labels)
+
+    def bounds(self):
+        """Hasta dónde se puede desplazar la vista: todas las filas y media fila de margen."""
+        return -1.0, self.n_rows
+
+    def set_labels(self, labels):
+        """Cambia las filas (p.ej. al recargar) conservando la posición de la vista."""
+        at_top = self.ax.get_ylim()[1] >= self.bounds()[1]
+        self.formatter.labels = labels
+        self.locator.n_rows = len(labels)
+        if not self.ax.get_autoscaley_on():
+            # Quien miraba las primeras filas sigue viéndolas aunque cambie su número
+            self.scroll(self.n_rows if at_top else 0)
+
+    def fit(self):
+        """Vista como al crear el eje: todas las filas si caben; si no, las VISIBLE_ROWS primeras."""
+        if self.n_rows > VISIBLE_ROWS:
+            top = self.bounds()[1]
+            self.ax.set_ylim(top - VISIBLE_ROWS, top)
+        else:
+            self.ax.set_autoscaley_on(True)
+            self.ax.autoscale_view(scalex=False)
+
+    def scroll(self, rows):
+        """Desplaza la vista rows filas (positivo: hacia arriba) sin salirse de las filas."""
+        lo, hi = self.ax.get_ylim()
+        span = hi - lo
+        low, high = self.bounds()
+        lo = min(max(lo + rows, low), max(high - span, low))
+        self.ax.set_ylim(lo, lo + span)
+        self.ax.figure.canvas.draw_idle()
+
+    def on_scroll(self, event):
+        if event.inaxes is self.ax and not self.ax.get_autoscaley_on():
+            self.scroll(event.step * SCROLL_ROWS)
+
+    def on_key(self, event):
+        if self.ax.get_autoscaley_on() or (self.focus_keys and event.inaxes is not self.ax):
+            return
+        lo, hi = self.ax.get_ylim()
+        page = max(1, int(hi - lo) - 1)
+        rows = {
+            'pageup': page,
+            'pagedown': -page,
+            'home': self.n_rows,
+            'end': -self.n_rows
+        }.get(event.key)
+        if rows is not None:
+            self.scroll(rows)
+
+    def all_rows(self):
+        """Figura con el alto de exportación y todas las filas a la vista mientras dura el bloque."""
+        height = export_height(self.n_rows)
+        if self.load_panel:
+            return _all_rows(self.ax.figure, [self], *with_load_panel(height))
+        return _all_rows(self.ax.figure, [self], height)
+
+
+class StackedRows:
+    """Los RowAxis de los paneles de un dashboard, que se exportan juntos con todas sus filas."""
+
+    def __init__(self, row_axes):
+        self.row_axes = row_axes
+
+    def all_rows(self):
+        height, ratios = dashboard_height([rows.n_rows for rows in self.row_axes], export=True)
+        return _all_rows(self.row_axes[0].ax.figure, self.row_axes, height, ratios)
@@ -0,0 +1,269 @@
+import re
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from src.utils.task_loader import normalize_name
+
+# Separadores entre predecesoras de una misma celda
+PREDECESSOR_SEPARATOR = re.compile(r"[;\n]+")
+NS_PER_DAY = 24 * 3600 * 10**9
+
+
+def _resolve_links(names, predecessors):
+    """
+    Dependencias (predecesora, sucesora) como listas de nodos y nombres de
+    predecesora que no corresponden a ninguna tarea. Cada celda es
+    'Fase 1; Fase 2' (o un nombre por línea).
+    """
+    normalized = {}
+
+    def normalize(name):
+        # Los nombres se repiten mucho
+        key = normalized.get(name)
+        if key is None:
+            key = normalized[name] = normalize_name(name)
+        return key
+
+    by_name = {}
+    for node, name in enumerate(names):
+        by_name.setdefault(normalize(name), []).append(node)
+
+    src, dst, unknown = [], [], set()
+    for node, cell in enumerate(predecessors):
+        if not isinstance(cell, str) or not cell.strip():
+            continue
+        seen = set()
+        for ref in PREDECESSOR_SEPARATOR.split(cell):
+            key = normalize(ref)
+            if not key:
+                continue
+            targets = by_name.get(key)
+            if targets is None:
+                unknown.add(ref.strip())
+                continue
+            for pred in targets:
+                if pred != node and pred not in seen:
+                    seen.add(pred)
+                    src.append(pred)
+                    dst.append(node)
+    return src, dst, unknown
+
+
+def _strongly_connected(succs):
+    """
+    Componentes fuertemente conexas de un grafo dado por sus sucesores
+    (Tarjan, O(V+E)), sin recursión para no chocar con el límite de Python
+    en cadenas largas de dependencias.
+    """
+    n = len(succs)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack, components = [], []
+    counter = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, i = work[-1]
+            if i < len(succs[node]):
+                work[-1] = (node, i + 1)
+                succ = succs[node][i]
+                if index[succ] < 0:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = True
+                    work.append((succ, 0))
+                elif on_stack[succ] and index[succ] < low[node]:
+                    low[node] = index[succ]
+                continue
+            work.pop()
+            if work and low[node] < low[work[-1][0]]:
+                low[work[-1][0]] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def _as_ns(dates):
+    return pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[ns]").view("i8").tolist()
+
+
+class Schedule:
+    """
+    Camino crítico de un plan con dependencias fin-a-inicio.
+
+    Cada nodo es una barra (una fila de las tareas agrupadas) y cada
+    predecesora nombra una tarea por su columna Tareas, sin distinguir
+    mayúsculas ni espacios; si varias barras comparten ese nombre, la tarea
+    depende de todas. La fecha de inicio del Excel es un "no antes de":
+
+        inicio temprano ES = max(inicio, EF de las predecesoras), EF = ES + duración
+        resto R = duración + max(R de las sucesoras): trabajo hasta el final del plan
+        inicio tardío LS = fin del plan - R, holgura = LS - ES
+
+    R no depende del fin del plan, así que alargar el plan no obliga a
+    rehacer la pasada hacia atrás. Orden topológico (Kahn) y las dos
+    pasadas son O(V+E); update() cambia las fechas de una tarea y recorre
+    solo los nodos cuyo valor cambia, en orden topológico. Las dependencias
+    entre las tareas de un mismo ciclo se ignoran (esas tareas quedan en
+    cycles) y los nombres que no existen, en unknown.
+    """
+
+    def __init__(self, names, starts, ends, predecessors):
+        n = len(names)
+        self.start = _as_ns(starts)
+        end = _as_ns(ends)
+        self.duration = np.maximum(np.subtract(end, self.start), 0).tolist()
+
+        self.preds = [[] for _ in range(n)]
+        self.succs = [[] for _ in range(n)]
+        src, dst, self.unknown = _resolve_links(names, predecessors)
+        for pred, succ in zip(src, dst):
+            self.preds[succ].append(pred)
+            self.succs[pred].append(succ)
+
+        self.order, self.cycles = self._topological_order()
+        self.position = [0] * n
+        for i, node in enumerate(self.order):
+            self.position[node] = i
+        self.es = [0] * n
+        self.ef = [0] * n
+        self.rest = [0] * n
+        self._forward(self.order)
+        self._backward(reversed(self.order))
+        self.end = max(self.ef, default=0)
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """Plan de unas tareas agrupadas; los nodos siguen el orden de sus filas."""
+        predecessors = tasks["Predecesoras"] if "Predecesoras" in tasks else [None] * len(tasks)
+        return cls(list(tasks["Tareas"]), tasks["Fecha Inicio"], tasks["Fecha Fin"], list(predecessors))
+
+    @property
+    def n_links(self):
+        return sum(len(p) for p in self.preds)
+
+    def _topological_order(self):
+        order = self._kahn()
+        if len(order) == len(self.preds):
+            return order, []
+
+        # Solo las dependencias dentro de cada ciclo se ignoran: las tareas
+        # que dependen de un ciclo sin estar en él conservan las suyas
+        cycles = []
+        for component in _strongly_connected(self.succs):
+            if len(component) < 2:
+                continue
+            cycles.extend(component)
+            members = set(component)
+            for node in component:
+                self.preds[node] = [p for p in self.preds[node] if p not in members]
+                self.succs[node] = [s for s in self.succs[node] if s not in members]
+        return self._kahn(), sorted(cycles)
+
+    def _kahn(self):
+        """Orden topológico de los nodos sin ciclo; los de un ciclo, y lo que depende de ellos, quedan fuera."""
+        indegree = [len(p) for p in self.preds]
+        order = [node for node, d in enumerate(indegree) if d == 0]
+        for node in order:
+            for succ in self.succs[node]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    order.append(succ)
+        return order
+
+    def _forward(self, nodes):
+        es, ef, preds, start, duration = self.es, self.ef, self.preds, self.start, self.duration
+        for node in nodes:
+            t = start[node]
+            for pred in preds[node]:
+                if ef[pred] > t:
+                    t = ef[pred]
+            es[node] = t
+            ef[node] = t + duration[node]
+
+    def _backward(self, nodes):
+        rest, succs, duration = self.rest, self.succs, self.duration
+        for node in nodes:
+            longest = 0
+            for succ in succs[node]:
+                if rest[succ] > longest:
+                    longest = rest[succ]
+            rest[node] = duration[node] + longest
+
+    def update(self, node, start, end):
+        """
+        Cambia las fechas de una tarea y propaga: hacia delante, ES/EF de las
+        sucesoras mientras cambian; hacia atrás, el resto de las predecesoras.
+        Devuelve cuántos nodos se han recalculado.
+        """
+        self.start[node] = _as_ns([start])[0]
+        self.duration[node] = max(_as_ns([end])[0] - self.start[node], 0)
+        visited = 0
+
+        heap, queued = [(self.position[node], node)], {node}
+        while heap:
+            _, v = heapq.heappop(heap)
+            visited += 1
+            old_ef = self.ef[v]
+            self._forward((v,))
+            if self.ef[v] != old_ef or v == node:
+                for succ in self.succs[v]:
+                    if succ not in queued:
+                        queued.add(succ)
+                        heapq.heappush(heap, (self.position[succ], succ))
+
+        heap, queued = [(-self.position[node], node)], {node}
+        while heap:
+            _, v = heapq.heappop(heap)
+            visited += 1
+            old_rest = self.rest[v]
+            self._backward((v,))
+            if self.rest[v] != old_rest:
+                for pred in self.preds[v]:
+                    if pred not in queued:
+                        queued.add(pred)
+                        heapq.heappush(heap, (-self.position[pred], pred))
+
+        self.end = max(self.ef, default=0)
+        return visited
+
+    def slack_days(self):
+        """Holgura de cada nodo en días (LS - ES)."""
+        es = np.array(self.es, dtype=np.int64)
+        rest = np.array(self.rest, dtype=np.int64)
+        return (self.end - rest - es) / NS_PER_DAY
+
+    def critical(self):
+        """Nodos sin holgura: cualquier retraso suyo retrasa el final del plan."""
+        return self.slack_days() <= 0
+
+    def links(self):
+        """Dependencias como arrays (predecesora, sucesora)."""
+        src = [pred for node, preds in enumerate(self.preds) for pred in preds]
+        dst = [node for node, preds in enumerate(self.preds) for _ in preds]
+        return np.array(src, dtype=np.intp), np.array(dst, dtype=np.intp)
+
+    def dates(self):
+        """Inicio y fin tempranos como datetime64."""
+        return (np.array(self.es, dtype="datetime64[ns]"), np.array(self.ef, dtype="datetime64[ns]"))
+
+    def delayed(self):
+        """Nodos que empiezan en el Excel antes de que acaben sus predecesoras."""
+        return np.flatnonzero(np.array(self.es, dtype=np.int64) > np.array(self.start, dtype=np.int64))
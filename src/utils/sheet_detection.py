@@ -0,0 +1,47 @@
+from src.utils.workbook_cache import read_sheet
+
+# Palabras clave para asociar columnas del Excel a cada campo del Gantt
+COLUMN_KEYWORDS = {
+    "Fecha Inicio": ["inicio", "start", "fecha inicio"],
+    "Fecha Fin": ["fin", "end", "fecha fin", "termino"],
+    "Tareas": ["tarea", "task", "actividad", "descripcion", "fase", "phase", "etapa"],
+    "Responsable": ["responsable", "owner", "asignado", "recurso"],
+    "Duración": ["duracion", "duración", "duration", "dias", "días", "days"],
+    "Predecesoras": ["predecesor", "predecessor", "precedente"]
+}
+
+FIELDS = ["Fecha Inicio", "Fecha Fin", "Tareas", "Responsable", "Duración", "Predecesoras"]
+
+
+def detect_header(file_path, sheet_name, max_rows=20):
+    """Primera fila (0-based) con al menos dos celdas con valor, o None."""
+    df = read_sheet(file_path, sheet_name=sheet_name, header=None, nrows=max_rows)
+    for idx, row in df.iterrows():
+        if len(row.dropna()) >= 2:
+            return idx
+    return None
+
+
+def sheet_columns(file_path, sheet_name, header):
+    df = read_sheet(file_path, sheet_name=sheet_name, header=header, nrows=1)
+    return list(df.columns.astype(str))
+
+
+def match_column(field, columns):
+    """Primera columna cuyo nombre contiene alguna palabra clave del campo, o None."""
+    for excel_col in columns:
+        excel_lower = excel_col.lower()
+        for kw in COLUMN_KEYWORDS.get(field, []):
+            if kw in excel_lower:
+                return excel_col
+    return None
+
+
+def detect_column_mapping(columns):
+    """Mapeo campo -> columna del Excel con las columnas que se han podido asociar."""
+    mapping = {}
+    for field in FIELDS:
+        excel_col = match_column(field, columns)
+        if excel_col is not None:
+            mapping[field] = excel_col
+    return mapping
@@ -0,0 +1,241 @@
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl.reader.strings import read_string_table
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import from_excel, WINDOWS_EPOCH, MAC_EPOCH
+
+from config.settings import DATE_FORMAT, STREAM_EMPTY_ROWS
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+ROW = MAIN_NS + "row"
+CELL = MAIN_NS + "c"
+VALUE = MAIN_NS + "v"
+INLINE = MAIN_NS + "is"
+TEXT = MAIN_NS + "t"
+SHEET_DATA = MAIN_NS + "sheetData"
+
+CELL_REF = re.compile(r"([A-Z]+)")
+
+# Por qué no load_workbook(read_only=True) + iter_rows(min_col, max_col,
+# values_only=True): openpyxl convierte igualmente cada celda de cada fila
+# del XML antes de recortar las columnas, y convierte las fechas una a una.
+# Con 100k filas y las columnas mapeadas seguidas (sin columnas sobrantes en
+# medio) tardaba el doble que este lector (24 s frente a 12 s con fechas
+# nativas, 27 s frente a 17 s con fechas en texto) con la misma memoria
+# máxima. Aquí solo se convierten las celdas de las columnas mapeadas y las
+# fechas van en bloque; de openpyxl se usan los textos compartidos, los
+# formatos de fecha y las épocas.
+
+
+class _Workbook:
+    """Lo mínimo del paquete .xlsx para leer una hoja: ruta del XML, textos compartidos y estilos de fecha."""
+
+    def __init__(self, archive):
+        self.archive = archive
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        pr = workbook.find(MAIN_NS + "workbookPr")
+        self.epoch = MAC_EPOCH if pr is not None and pr.get("date1904") in ("1", "true") else WINDOWS_EPOCH
+
+        rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(PKG_REL_NS + "Relationship")}
+        self.sheets = {}
+        for sheet in workbook.iter(MAIN_NS + "sheet"):
+            target = targets[sheet.get(REL_NS + "id")]
+            path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            self.sheets[sheet.get("name")] = path
+
+        self.shared_strings = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            with archive.open("xl/sharedStrings.xml") as src:
+                self.shared_strings = list(read_string_table(src))
+
+        self.date_styles = set()
+        if "xl/styles.xml" in archive.namelist():
+            styles = ET.fromstring(archive.read("xl/styles.xml"))
+            formats = dict(BUILTIN_FORMATS)
+            for fmt in styles.iter(MAIN_NS + "numFmt"):
+                formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+            cell_xfs = styles.find(MAIN_NS + "cellXfs")
+            if cell_xfs is not None:
+                for i, xf in enumerate(cell_xfs.iter(MAIN_NS + "xf")):
+                    fmt = formats.get(int(xf.get("numFmtId", 0)))
+                    if fmt and is_date_format(fmt):
+                        self.date_styles.add(str(i))
+
+    def sheet_path(self, sheet_name):
+        if isinstance(sheet_name, int):
+            return list(self.sheets.values())[sheet_name]
+        return self.sheets[sheet_name]
+
+
+def _cell_value(cell, book, as_serial=False):
+    """
+    Valor de una celda como lo devuelve openpyxl. Con as_serial, los números
+    con formato de fecha se devuelven como serial de Excel (float) para
+    convertirlos después en bloque.
+    """
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        inline = cell.find(INLINE)
+        return "".join(t.text or "" for t in inline.iter(TEXT)) if inline is not None else None
+    value = cell.findtext(VALUE)
+    if value is None:
+        return None
+    if kind == "s":
+        return book.shared_strings[int(value)]
+    if kind in ("str", "d"):
+        return datetime.fromisoformat(value) if kind == "d" else value
+    if kind == "b":
+        return value == "1"
+    if kind == "e":
+        return None
+    number = float(value)
+    if cell.get("s") in book.date_styles:
+        return ("serial", number) if as_serial else from_excel(number, book.epoch)
+    return int(number) if number.is_integer() else number
+
+
+def _header_names(row):
+    """Nombres de columna como los genera pd.read_excel: 'Unnamed: i' y sufijos .1, .2 en duplicados."""
+    names, seen = [], {}
+    for i, value in enumerate(row):
+        if value is None or value == "":
+            name = f"Unnamed: {i}"
+        else:
+            name = str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _to_dates(values, epoch):
+    """
+    Fechas nativas de Excel (seriales con formato de fecha) convertidas en
+    bloque; solo el texto pasa por pd.to_datetime con DATE_FORMAT.
+    """
+    result = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[us]")
+    serial_pos, serials, native_pos, native, text_pos, text = [], [], [], [], [], []
+    for i, value in enumerate(values):
+        if isinstance(value, tuple):
+            serial_pos.append(i)
+            serials.append(value[1])
+        elif isinstance(value, datetime):
+            native_pos.append(i)
+            native.append(value)
+        elif isinstance(value, str):
+            text_pos.append(i)
+            text.append(value)
+    if serials:
+        serials = np.asarray(serials)
+        if epoch == WINDOWS_EPOCH:
+            # Excel cuenta un 29/02/1900 inexistente (igual que openpyxl.from_excel)
+            serials = np.where((serials > 0) & (serials < 60), serials + 1, serials)
+        dates = pd.Timestamp(epoch) + pd.to_timedelta(serials, unit="D").round("ms")
+        result[serial_pos] = dates.to_numpy(dtype="datetime64[us]")
+    if native:
+        result[native_pos] = pd.to_datetime(native).to_numpy(dtype="datetime64[us]")
+    if text:
+        parsed = pd.to_datetime(pd.Series(text, dtype=object), format=DATE_FORMAT, errors="coerce")
+        result[text_pos] = parsed.to_numpy(dtype="datetime64[us]")
+    return pd.Series(result)
+
+
+def _column_letter(cell, position):
+    ref = cell.get("r")
+    if ref is None:
+        return position
+    return column_index_from_string(CELL_REF.match(ref).group(1))
+
+
+def read_mapped_columns(file_path, sheet_name, header, columns, date_columns=(), nrows=None,
+                        empty_rows=STREAM_EMPTY_ROWS):
+    """
+    Lee en streaming el XML de la hoja y extrae solo las columnas indicadas.
+
+    Las celdas de otras columnas se descartan sin convertir su valor; las
+    fechas nativas se convierten en bloque y el texto de date_columns se
+    interpreta con DATE_FORMAT. La lectura se detiene tras empty_rows filas
+    seguidas sin valor en ninguna de esas columnas, en lugar de recorrer
+    todo el rango usado de la hoja. Devuelve un DataFrame con los nombres de
+    columna del Excel.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        book = _Workbook(archive)
+        with archive.open(book.sheet_path(sheet_name)) as src:
+            data, positions = None, None
+            pending = 0
+            row_number = 0
+            date_set = set()
+            sheet_data = None
+
+            for event, elem in ET.iterparse(src, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == SHEET_DATA:
+                        sheet_data = elem
+                    continue
+                if elem.tag != ROW:
+                    continue
+
+                # Filas ausentes en el XML (vacías) cuentan igual que filas vacías
+                ref = elem.get("r")
+                current = int(ref) if ref else row_number + 1
+                gap = current - row_number - 1
+                row_number = current
+
+                if current == header + 1:
+                    cells = {}
+                    for position, cell in enumerate(elem.iter(CELL), start=1):
+                        cells[_column_letter(cell, position)] = _cell_value(cell, book)
+                    width = max(cells) if cells else 0
+                    names = _header_names([cells.get(i) for i in range(1, width + 1)])
+                    missing = [c for c in columns if c not in names]
+                    if missing:
+                        raise KeyError(f"Columnas no encontradas en la cabecera: {missing}")
+                    positions = {names.index(c) + 1: j for j, c in enumerate(columns)}
+                    date_set = {j for j, c in enumerate(columns) if c in date_columns}
+                    data = [[] for _ in columns]
+                elif data is not None:
+                    pending += gap
+                    values = [None] * len(columns)
+                    found = False
+                    for position, cell in enumerate(elem.iter(CELL), start=1):
+                        j = positions.get(_column_letter(cell, position))
+                        if j is not None:
+                            values[j] = _cell_value(cell, book, as_serial=j in date_set)
+                            found = found or values[j] is not None
+                    if not found:
+                        pending += 1
+                    else:
+                        # Las filas vacías intermedias se conservan para no desplazar los datos
+                        for col, value in zip(data, values):
+                            col.extend([None] * pending)
+                            col.append(value)
+                        pending = 0
+                    if pending >= empty_rows or (nrows is not None and len(data[0]) >= nrows):
+                        break
+
+                # Libera las filas ya procesadas
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+    if data is None:
+        raise KeyError(f"La fila de cabecera {header} no existe en la hoja")
+    return pd.DataFrame({
+        name: _to_dates(values, book.epoch) if j in date_set else pd.Series(values, dtype=object).infer_objects()
+        for j, (name, values) in enumerate(zip(columns, data))
+    })
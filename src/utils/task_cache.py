@@ -0,0 +1,188 @@
+import os
+import glob
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from config.settings import TASK_CACHE_ENABLED, TASK_CACHE_DIR, DATE_FORMAT
+from src.utils.profiling import stage, profiled
+from src.utils.task_loader import COLUMN_NAMES, load_tasks, group_tasks_by_group
+
+# Se incrementa cuando cambia el formato de los ficheros o lo que calculan
+# load_tasks/group_tasks_by_group; los ficheros de otra versión se ignoran.
+CACHE_VERSION = 2
+
+
+def cache_enabled(use_cache=None):
+    """use_cache explícito > variable GANTT_NO_CACHE > TASK_CACHE_ENABLED."""
+    if use_cache is not None:
+        return use_cache
+    if os.environ.get("GANTT_NO_CACHE", "").strip() not in ("", "0"):
+        return False
+    return TASK_CACHE_ENABLED
+
+
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_dir(file_path):
+    # Una ruta relativa se entiende junto al libro Excel
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), TASK_CACHE_DIR)
+
+
+def _cache_prefix(file_path, sheet_name, header, column_mapping):
+    """Nombre común a todas las versiones en caché de una misma carga."""
+    params = json.dumps(
+        [CACHE_VERSION, str(sheet_name), header, sorted((column_mapping or {}).items()), DATE_FORMAT],
+        ensure_ascii=False
+    )
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return f"{stem}-{hashlib.sha256(params.encode('utf-8')).hexdigest()[:12]}"
+
+
+def cache_path(file_path, sheet_name, header, column_mapping=None, content_hash=None):
+    content_hash = content_hash or file_hash(file_path)
+    prefix = _cache_prefix(file_path, sheet_name, header, column_mapping)
+    return os.path.join(_cache_dir(file_path), f"{prefix}-{content_hash[:16]}.npz")
+
+
+def _encode_frame(df, name, arrays):
+    """Guarda cada columna como un array: fechas como enteros, números tal cual y el resto como diccionario."""
+    columns = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        key = f"{name}_{i}"
+        if s.dtype.kind == "M":
+            values = s.to_numpy()
+            arrays[key] = values.view("i8")
+            kind = str(values.dtype)
+        elif s.dtype.kind in "biuf":
+            arrays[key] = s.to_numpy()
+            kind = "numeric"
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            arrays[key] = s.cat.codes.to_numpy().astype(np.int32)
+            arrays[key + "_values"] = np.array([str(v) for v in s.cat.categories], dtype=str)
+            kind = "category"
+        else:
+            codes, uniques = pd.factorize(s)
+            arrays[key] = codes.astype(np.int32)
+            arrays[key + "_values"] = np.array([str(v) for v in uniques], dtype=str)
+            kind = "text"
+        columns.append([str(col), kind])
+    return columns
+
+
+def _decode_frame(data, name, columns):
+    result = {}
+    for i, (col, kind) in enumerate(columns):
+        values = data[f"{name}_{i}"]
+        if kind.startswith("datetime64"):
+            result[col] = values.view(kind)
+        elif kind == "numeric":
+            result[col] = values
+        elif kind == "category":
+            categories = pd.Index(data[f"{name}_{i}_values"].astype(object))
+            if categories.is_unique:
+                result[col] = pd.Categorical.from_codes(values, categories)
+            else:
+                # Categorías distintas que coinciden al pasarlas a texto (1 y "1")
+                decoded = categories.to_numpy()[values]
+                decoded[values < 0] = np.nan
+                result[col] = pd.Categorical(decoded)
+        else:
+            text = data[f"{name}_{i}_values"].astype(object)
+            decoded = text[values] if len(text) else np.full(len(values), np.nan, dtype=object)
+            decoded[values < 0] = np.nan
+            result[col] = decoded
+    return pd.DataFrame(result)
+
+
+def read_cache(path):
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_VERSION:
+                return None
+            tasks = _decode_frame(data, "tasks", meta["tasks"])
+            grouped = _decode_frame(data, "grouped", meta["grouped"])
+            grouped.index = data["grouped_index"]
+        tasks.set_index(pd.DatetimeIndex(tasks['Fecha Inicio'].values), inplace=True)
+        return tasks, grouped
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Caché de tareas ignorada ({path}): {e}")
+        return None
+
+
+def write_cache(path, tasks, grouped):
+    arrays = {}
+    meta = {
+        "version": CACHE_VERSION,
+        "tasks": _encode_frame(tasks[COLUMN_NAMES], "tasks", arrays),
+        "grouped": _encode_frame(grouped, "grouped", arrays),
+    }
+    arrays["grouped_index"] = grouped.index.to_numpy(dtype="i8")
+    arrays["meta"] = np.array(json.dumps(meta, ensure_ascii=False))
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"No se pudo guardar la caché de tareas ({path}): {e}")
+        return
+
+    # Las versiones anteriores del mismo libro y la misma carga quedan obsoletas
+    prefix = path.rsplit("-", 1)[0]
+    for old in glob.glob(glob.escape(prefix) + "-*.npz"):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def cached_tasks(file_path, sheet_name, header, column_mapping=None, use_cache=None):
+    """Lo que devolvería load_grouped_tasks si ya está en la caché, sin abrir el Excel; si no, None."""
+    if not cache_enabled(use_cache):
+        return None
+    path = cache_path(file_path, sheet_name, header, column_mapping)
+    return read_cache(path) if os.path.exists(path) else None
+
+
+@profiled()
+def load_grouped_tasks(file_path, sheet_name, header, column_mapping=None, use_cache=None, engine=None):
+    """
+    load_tasks + group_tasks_by_group con caché persistente en disco.
+
+    La entrada se identifica por el hash del contenido del libro, la hoja, la
+    fila de cabecera, el mapeo de columnas, DATE_FORMAT y CACHE_VERSION; si
+    cualquiera cambia, se vuelve a leer el Excel. De las tareas solo se
+    devuelven (y se guardan) las columnas de COLUMN_NAMES, que son las que
+    usa el gráfico, haya caché o no; las agrupadas llevan todas las suyas.
+    """
+    if not cache_enabled(use_cache):
+        tasks = load_tasks(file_path, sheet_name, header, column_mapping=column_mapping, engine=engine)
+        return tasks[COLUMN_NAMES], group_tasks_by_group(tasks)
+
+    with stage("cache_lookup"):
+        path = cache_path(file_path, sheet_name, header, column_mapping)
+        cached = read_cache(path) if os.path.exists(path) else None
+    if cached is not None:
+        return cached
+
+    tasks = load_tasks(file_path, sheet_name, header, column_mapping=column_mapping, engine=engine)
+    # Agrupadas antes de recortar: Predecesoras pasa a las agrupadas
+    grouped = group_tasks_by_group(tasks)
+    tasks = tasks[COLUMN_NAMES]
+    with stage("write_cache"):
+        write_cache(path, tasks, grouped)
+    return tasks, grouped
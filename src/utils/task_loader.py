@@ -0,0 +1,124 @@
+import pandas as pd
+
+from config.settings import DATE_FORMAT, LOAD_ENGINE
+from src.utils.profiling import stage, profiled
+from src.utils.workbook_cache import read_sheet
+
+# Columnas esperadas del Excel
+COLUMN_NAMES = ['Tareas', 'Responsable', 'Fecha Inicio', 'Fecha Fin']
+TEXT_COLUMNS = ['Tareas', 'Responsable']
+# Columna opcional: nombres de las tareas de las que depende cada una
+PREDECESSORS = 'Predecesoras'
+UNASSIGNED = 'Sin responsable asignado'
+
+
+def normalize_name(text):
+    """
+    Nombre sin distinguir mayúsculas ni espacios sobrantes. Es la única
+    comparación de nombres de tarea: predecesoras, comparación de planes y
+    búsqueda en la ventana.
+    """
+    return " ".join(str(text).split()).casefold()
+
+
+def _read_tasks(file_path, sheet_name, header, nrows, skiprows, column_mapping, engine):
+    # El formato .xls no es un paquete XML: siempre pasa por workbook_cache
+    streamable = str(file_path).lower().endswith((".xlsx", ".xlsm"))
+    if engine == "stream" and streamable and column_mapping and skiprows is None:
+        from src.utils.stream_reader import read_mapped_columns
+        dates = ['Fecha Inicio', 'Fecha Fin']
+        return read_mapped_columns(
+            file_path,
+            sheet_name,
+            header,
+            columns=list(dict.fromkeys(column_mapping.values())),
+            date_columns=[column_mapping[c] for c in dates if c in column_mapping],
+            nrows=nrows
+        )
+    if engine not in ("cache", "stream"):
+        raise ValueError(f"Motor de carga desconocido: {engine!r}")
+    return read_sheet(
+        file_path,
+        sheet_name=sheet_name,
+        header=header,
+        nrows=nrows,
+        skiprows=skiprows
+    )
+
+
+@profiled("prepare")
+def _prepare_tasks(tasks, column_mapping):
+    """Columnas del Gantt a partir de las del Excel: renombra, convierte fechas y descarta filas sin fechas."""
+    if column_mapping:
+        reverse_mapping = {v: k for k, v in column_mapping.items()}
+        # Una columna sin mapear con el mismo nombre que un campo mapeado
+        # a otra columna quedaría duplicada tras renombrar
+        shadowed = [k for k in column_mapping if k in tasks.columns and k not in reverse_mapping]
+        tasks = tasks.drop(columns=shadowed).rename(columns=reverse_mapping)
+        
+        for col in COLUMN_NAMES:
+            if col not in tasks.columns:
+                if col == 'Tareas':
+                    tasks[col] = [f'Tarea {i+1}' for i in range(len(tasks))]
+                elif col == 'Responsable':
+                    tasks[col] = UNASSIGNED
+                else:
+                    tasks[col] = ''
+    else:
+        tasks.columns = COLUMN_NAMES
+    
+    with stage("to_datetime"):
+        tasks['Fecha Inicio'] = pd.to_datetime(tasks['Fecha Inicio'], format=DATE_FORMAT, errors='coerce')
+        tasks['Fecha Fin'] = pd.to_datetime(tasks['Fecha Fin'], format=DATE_FORMAT, errors='coerce')
+    
+    tasks = tasks.dropna(subset=['Fecha Inicio', 'Fecha Fin'])
+    if PREDECESSORS in tasks.columns:
+        # Texto sin vacíos; un nombre numérico se lee igual que en Tareas
+        predecessors = tasks[PREDECESSORS]
+        tasks[PREDECESSORS] = predecessors.where(predecessors.notna(), '').astype(str).str.strip()
+    # Tareas y responsables se repiten mucho: como categorías cada fila
+    # ocupa un código y no un objeto str
+    tasks[TEXT_COLUMNS] = tasks[TEXT_COLUMNS].astype('category')
+    tasks.set_index(pd.DatetimeIndex(tasks['Fecha Inicio'].values), inplace=True)
+    return tasks
+
+
+@profiled()
+def load_tasks(file_path, sheet_name, header, nrows=None, skiprows=None, column_mapping=None, engine=None):
+    """
+    Loads data from an Excel spreadsheet into a Pandas dataframe.
+
+    engine: "cache" lee la hoja completa a través de workbook_cache; "stream"
+    lee en streaming solo las columnas de column_mapping (sin mapeo o con
+    skiprows, o con libros .xls, se usa "cache"). Por defecto, LOAD_ENGINE.
+    """
+    try:
+        with stage("read_excel"):
+            tasks = _read_tasks(file_path, sheet_name, header, nrows, skiprows, column_mapping, engine or LOAD_ENGINE)
+        return _prepare_tasks(tasks, column_mapping)
+    
+    except Exception as e:
+        print(f"Error al cargar las tareas: {e}")
+        raise
+
+@profiled("group_tasks")
+def group_tasks_by_group(tasks):
+    """
+    Una fila por (Responsable, Tareas) con el primer inicio y el último fin,
+    ordenada por inicio y tarea descendentes: plot_gantt dibuja en este
+    orden sin volver a ordenar. Con Predecesoras, la primera celda no vacía
+    de cada tarea (se suelen escribir en su primer tramo).
+    """
+    aggregations = {
+        'Fecha Inicio': 'min',
+        'Fecha Fin': 'max'
+    }
+    if PREDECESSORS in tasks.columns:
+        tasks = tasks.assign(**{PREDECESSORS: tasks[PREDECESSORS].replace('', None)})
+        aggregations[PREDECESSORS] = 'first'
+    grouped = tasks.groupby(by=['Responsable', 'Tareas'], observed=True).agg(
+        aggregations
+    ).reset_index().sort_values(by=['Fecha Inicio', 'Tareas'], ascending=False)
+    if PREDECESSORS in grouped.columns:
+        grouped[PREDECESSORS] = grouped[PREDECESSORS].fillna('')
+    return grouped
@@ -0,0 +1,124 @@
+import os
+import threading
+from collections import OrderedDict
+
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from config.settings import WORKBOOK_CACHE_MAX_MB
+
+
+class WorkbookCache:
+    """
+    Caché de hojas Excel ya parseadas, compartida por la GUI y load_tasks.
+
+    Cada hoja se lee del disco una sola vez como celdas en bruto (sin
+    cabecera); las vistas previas de cabecera y las cargas completas se
+    construyen a partir de esas celdas con el mismo parser que usa
+    pd.read_excel. Las entradas se identifican por ruta, mtime y tamaño, de
+    modo que un fichero modificado se vuelve a leer, y se descartan por LRU
+    cuando se supera el límite de memoria.
+    """
+
+    def __init__(self, max_bytes=WORKBOOK_CACHE_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._sheets = OrderedDict()
+        self._sheet_names = {}
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_key(file_path):
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+    def sheet_names(self, file_path):
+        file_key = self._file_key(file_path)
+        with self._lock:
+            names = self._sheet_names.get(file_key)
+        if names is None:
+            if file_path.lower().endswith(('.xlsx', '.xlsm')):
+                # En modo read_only solo se lee el índice del libro, no las hojas
+                wb = openpyxl.load_workbook(file_path, read_only=True)
+                names = list(wb.sheetnames)
+                wb.close()
+            else:
+                with pd.ExcelFile(file_path) as xl:
+                    names = list(xl.sheet_names)
+            with self._lock:
+                self._drop_stale(file_key)
+                self._sheet_names[file_key] = names
+        return names
+
+    def rows(self, file_path, sheet_name):
+        """Celdas de la hoja como lista de filas, con '' en las celdas vacías."""
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names(file_path)[sheet_name]
+        key = self._file_key(file_path) + (sheet_name,)
+
+        with self._lock:
+            rows = self._sheets.get(key)
+            if rows is not None:
+                self._sheets.move_to_end(key)
+                return rows
+
+        raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, dtype=object, na_filter=False)
+        rows = raw.values.tolist()
+        size = int(raw.memory_usage(deep=True).sum())
+
+        with self._lock:
+            self._drop_stale(key[:3])
+            self._sheets[key] = rows
+            self._sizes[key] = size
+            self._evict()
+        return rows
+
+    def read(self, file_path, sheet_name, header=0, nrows=None, skiprows=None):
+        """Equivalente a pd.read_excel servido desde la caché."""
+        rows = self.rows(file_path, sheet_name)
+        if nrows is not None and skiprows is None:
+            # Solo se pasan al parser las filas que puede llegar a usar
+            rows = rows[:(header or 0) + 1 + nrows]
+        if not rows:
+            return pd.DataFrame()
+        parser = TextParser(
+            [list(row) for row in rows],
+            header=header,
+            skiprows=skiprows,
+            nrows=nrows,
+            skip_blank_lines=False
+        )
+        return parser.read(nrows=nrows)
+
+    def clear(self):
+        with self._lock:
+            self._sheets.clear()
+            self._sheet_names.clear()
+            self._sizes.clear()
+
+    def _drop_stale(self, file_key):
+        """Olvida versiones anteriores del mismo fichero."""
+        path = file_key[0]
+        for key in [k for k in self._sheets if k[0] == path and k[:3] != file_key]:
+            del self._sheets[key]
+            del self._sizes[key]
+        for key in [k for k in self._sheet_names if k[0] == path and k != file_key]:
+            del self._sheet_names[key]
+
+    def _evict(self):
+        # Siempre se conserva la última hoja leída aunque supere el límite
+        while len(self._sheets) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            key, _ = self._sheets.popitem(last=False)
+            del self._sizes[key]
+
+
+workbook_cache = WorkbookCache()
+
+
+def get_sheet_names(file_path):
+    return workbook_cache.sheet_names(file_path)
+
+
+def read_sheet(file_path, sheet_name, header=0, nrows=None, skiprows=None):
+    return workbook_cache.read(file_path, sheet_name, header=header, nrows=nrows, skiprows=skiprows)
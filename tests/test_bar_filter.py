@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.bar_filter import BarFilter, compact_rows
+
+
+def layout():
+    return pd.DataFrame({
+        'Responsable': ['Ana', 'Luis', 'Ana', 'Eva', 'Luis'],
+        'Tareas': ['Diseño inicial', 'Compras', 'Pruebas', 'Diseño  final', 'Cierre'],
+    })
+
+
+def test_nothing_hidden_by_default():
+    bars = BarFilter(layout())
+    assert not bars.active
+    assert bars.visible().all()
+
+
+def test_toggle_hides_and_shows_an_owner():
+    bars = BarFilter(layout())
+    bars.toggle('Luis')
+    assert bars.active
+    assert bars.visible().tolist() == [True, False, True, True, False]
+    bars.toggle('Luis')
+    assert not bars.active
+    assert bars.visible().all()
+
+
+def test_solo_and_un_solo():
+    bars = BarFilter(layout())
+    bars.solo('Ana')
+    assert bars.hidden == {'Luis', 'Eva'}
+    assert bars.visible().tolist() == [True, False, True, False, False]
+    bars.solo('Ana')
+    assert bars.hidden == set()
+    bars.solo('Ana')
+    bars.solo('Eva')
+    assert bars.visible().tolist() == [False, False, False, True, False]
+
+
+def test_text_search_ignores_case_and_spacing():
+    bars = BarFilter(layout())
+    bars.set_text('  DISEÑO ')
+    assert bars.visible().tolist() == [True, False, False, True, False]
+    bars.set_text('diseño final')
+    assert bars.visible().tolist() == [False, False, False, True, False]
+    bars.toggle('Eva')
+    assert not bars.visible().any()
+    bars.set_text('')
+    assert bars.visible().tolist() == [True, True, True, False, True]
+
+
+def test_hiding_every_owner():
+    bars = BarFilter(layout())
+    for owner in ('Ana', 'Luis', 'Eva'):
+        bars.toggle(owner)
+    visible = bars.visible()
+    assert not visible.any()
+    new_row, kept = compact_rows(np.arange(5), visible, 5)
+    assert len(new_row) == 5
+    assert len(kept) == 0
+
+
+def test_reset_keeps_the_filter():
+    bars = BarFilter(layout())
+    bars.toggle('Ana')
+    bars.set_text('c')
+    bars.reset(layout().iloc[1:3])
+    assert bars.visible().tolist() == [True, False]
+    bars.reset(None)
+    assert len(bars.visible()) == 0
+
+
+def test_compact_rows_drops_empty_rows_in_order():
+    y = np.array([0, 1, 1, 3, 4])
+    visible = np.array([True, False, True, False, True])
+    new_row, kept = compact_rows(y, visible, 6)
+    assert kept.tolist() == [0, 1, 4]
+    # Solo cuentan las filas de las barras visibles
+    assert new_row[visible].tolist() == [0, 1, 2]
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from src.utils.bar_index import BarIndex
+from src.utils.gantt_utils import BAR_HEIGHT
+
+HALF = BAR_HEIGHT / 2
+
+
+def index():
+    # Fila 0: tres barras que se solapan; fila 1: una barra suelta; la fila 2 no tiene barras
+    layout = pd.DataFrame({
+        'x0': [0.0, 2.0, 3.0, 10.0, 1.0],
+        'x1': [5.0, 4.0, 8.0, 12.0, 2.0],
+        'y': [0, 0, 0, 1, 3],
+    })
+    return BarIndex(layout, height=BAR_HEIGHT)
+
+
+@pytest.mark.parametrize('x, expected', [
+    (1.0, 0),    # solo la primera
+    (2.5, 0),    # la primera y la segunda: gana la primera del layout
+    (3.5, 0),    # las tres
+    (4.5, 0),    # la primera y la tercera
+    (6.0, 2),    # solo la tercera, aunque otras empiecen antes
+    (8.0, 2),    # borde derecho incluido
+    (0.0, 0),    # borde izquierdo incluido
+])
+def test_overlapping_bars_in_one_row(x, expected):
+    assert index().find(x, 0.0) == expected
+
+
+@pytest.mark.parametrize('x', [-0.5, 8.5, 100.0])
+def test_miss_outside_the_bars_of_the_row(x):
+    assert index().find(x, 0.0) is None
+
+
+def test_earliest_layout_position_wins_regardless_of_start():
+    layout = pd.DataFrame({'x0': [3.0, 0.0], 'x1': [6.0, 10.0], 'y': [0, 0]})
+    bars = BarIndex(layout, height=BAR_HEIGHT)
+    assert bars.find(4.0, 0.0) == 0
+    assert bars.find(8.0, 0.0) == 1
+
+
+@pytest.mark.parametrize('dy, hit', [
+    (0.0, True),
+    (HALF - 1e-9, True),
+    (-(HALF - 1e-9), True),
+    (HALF + 1e-9, False),
+    (-(HALF + 1e-9), False),
+    (0.5, False),
+])
+def test_vertical_edges_of_bar_height(dy, hit):
+    assert (index().find(11.0, 1.0 + dy) == 3) is hit
+
+
+def test_rows_without_bars_or_out_of_range():
+    bars = index()
+    assert bars.find(1.5, 2.0) is None
+    assert bars.find(1.5, 3.0) == 4
+    assert bars.find(1.5, -1.0) is None
+    assert bars.find(1.5, 4.0) is None
+
+
+def test_empty_and_missing_coordinates():
+    assert BarIndex(None).find(1.0, 0.0) is None
+    assert index().find(None, 0.0) is None
+    empty = BarIndex(pd.DataFrame({'x0': [], 'x1': [], 'y': []}))
+    assert empty.find(0.0, 0.0) is None
+
+
+def test_reset_rebuilds_the_index():
+    bars = index()
+    assert bars.find(11.0, 1.0) == 3
+    bars.reset(pd.DataFrame({'x0': [20.0], 'x1': [21.0], 'y': [1]}))
+    assert bars.find(11.0, 1.0) is None
+    assert bars.find(20.5, 1.0) == 0
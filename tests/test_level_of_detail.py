@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.utils.level_of_detail import merge_spans
+
+
+def spans(x0, x1, y, rows_per_band=4, gap=0.0, half=0.3):
+    result = merge_spans(np.array(x0, dtype=float), np.array(x1, dtype=float), np.array(y), half,
+                         rows_per_band, gap)
+    return sorted(zip(*(part.tolist() for part in result)))
+
+
+def test_overlapping_bars_merge_into_one_span():
+    assert spans([0, 2, 6], [3, 5, 7], [0, 1, 2]) == [(0, 5, -0.3, 1.3), (6, 7, 1.7, 2.3)]
+
+
+def test_nested_bar_does_not_shorten_the_reach():
+    # La segunda barra acaba antes que la primera: la tercera sigue solapando con la primera
+    assert spans([0, 1, 8], [10, 2, 12], [0, 0, 0]) == [(0, 12, -0.3, 0.3)]
+
+
+def test_gap_merges_nearby_bars():
+    x0, x1, y = [0, 5, 12], [3, 8, 13], [0, 0, 0]
+    assert len(spans(x0, x1, y, gap=1.0)) == 3
+    # A exactamente gap días todavía se funden
+    assert spans(x0, x1, y, gap=2.0) == [(0, 8, -0.3, 0.3), (12, 13, -0.3, 0.3)]
+    assert spans(x0, x1, y, gap=4.0) == [(0, 13, -0.3, 0.3)]
+
+
+def test_band_boundaries_split_spans():
+    # Filas 3 y 4 quedan en bandas distintas con rows_per_band=4 aunque las barras se solapen
+    x0, x1, y = [0, 1, 2], [5, 6, 7], [2, 3, 4]
+    assert spans(x0, x1, y) == [(0, 6, 1.7, 3.3), (2, 7, 3.7, 4.3)]
+    assert spans(x0, x1, y, rows_per_band=8) == [(0, 7, 1.7, 4.3)]
+
+
+def test_reach_does_not_leak_into_the_next_band():
+    # Una barra larga en la banda 0 no absorbe barras de la banda 1 que empiezan antes de su fin
+    x0, x1, y = [0, 1, 3], [100, 2, 4], [0, 4, 4]
+    assert spans(x0, x1, y) == [(0, 100, -0.3, 0.3), (1, 2, 3.7, 4.3), (3, 4, 3.7, 4.3)]
+
+
+def test_input_order_does_not_matter():
+    x0, x1, y = [6, 0, 2], [7, 3, 5], [2, 0, 1]
+    assert spans(x0, x1, y) == spans(x0[::-1], x1[::-1], y[::-1])
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.plan_diff import (
+    diff_plans, write_diff, summarize, TABLE_COLUMNS, NEW, REMOVED, SHIFTED, RESIZED, UNCHANGED
+)
+
+
+def plan(rows):
+    return pd.DataFrame(rows, columns=['Responsable', 'Tareas', 'Fecha Inicio', 'Fecha Fin']).astype({
+        'Fecha Inicio': 'datetime64[ns]', 'Fecha Fin': 'datetime64[ns]'
+    })
+
+
+BASE = plan([
+    ('Ana', 'Diseño', '2024-01-01', '2024-01-05'),
+    ('Ana', 'Pruebas', '2024-01-06', '2024-01-10'),
+    ('Luis', 'Compras', '2024-01-02', '2024-01-03'),
+    ('Luis', 'Cierre', '2024-01-20', '2024-01-21'),
+])
+CURRENT = plan([
+    ('Ana', 'Diseño', '2024-01-01', '2024-01-05'),
+    ('Ana', 'Pruebas', '2024-01-08', '2024-01-11'),
+    ('Luis', 'Compras', '2024-01-02', '2024-01-06'),
+    ('Eva', 'Formación', '2024-01-15', '2024-01-16'),
+])
+
+
+def by_task(diff):
+    return diff.set_index('Tareas')
+
+
+def test_statuses_and_day_deltas():
+    diff = by_task(diff_plans(BASE, CURRENT))
+    assert diff.loc['Diseño', 'Estado'] == UNCHANGED
+    assert diff.loc['Pruebas', 'Estado'] == SHIFTED
+    assert diff.loc['Pruebas', ['Desplazamiento', 'Retraso fin', 'Cambio duracion']].tolist() == [2, 1, -1]
+    assert diff.loc['Compras', 'Estado'] == RESIZED
+    assert diff.loc['Compras', ['Desplazamiento', 'Retraso fin', 'Cambio duracion']].tolist() == [0, 3, 3]
+    assert diff.loc['Formación', 'Estado'] == NEW
+    assert diff.loc['Cierre', 'Estado'] == REMOVED
+
+
+def test_rows_point_back_to_each_plan():
+    diff = by_task(diff_plans(BASE, CURRENT))
+    assert diff.loc['Formación', ['fila', 'fila base']].tolist() == [3, -1]
+    assert diff.loc['Cierre', ['fila', 'fila base']].tolist() == [-1, 3]
+    assert diff.loc['Cierre', 'Responsable'] == 'Luis'
+    assert pd.isna(diff.loc['Formación', 'Inicio base'])
+
+
+def test_names_differing_in_case_or_spacing_are_the_same_task():
+    current = plan([('  ana ', 'diseño', '2024-01-01', '2024-01-05')])
+    diff = diff_plans(BASE.iloc[:1], current)
+    assert len(diff) == 1
+    assert diff['Estado'].iloc[0] == UNCHANGED
+
+
+def test_every_current_row_is_kept_when_names_collide():
+    current = plan([
+        ('Ana', 'Diseño', '2024-01-01', '2024-01-05'),
+        ('Ana', 'diseño ', '2024-01-03', '2024-01-05'),
+    ])
+    diff = diff_plans(BASE.iloc[:1], current).sort_values('fila')
+    assert diff['fila'].tolist() == [0, 1]
+    assert diff['Estado'].tolist() == [UNCHANGED, SHIFTED]
+    assert diff['Estado'].notna().all()
+
+
+def test_duplicated_baseline_names_are_one_task():
+    baseline = plan([
+        ('Ana', 'Diseño', '2024-01-01', '2024-01-03'),
+        ('ANA', 'Diseño', '2024-01-02', '2024-01-05'),
+    ])
+    diff = diff_plans(baseline, BASE.iloc[:1])
+    assert len(diff) == 1
+    assert diff['Estado'].iloc[0] == UNCHANGED
+
+
+@pytest.mark.parametrize('empty_side', ['baseline', 'current', 'both'])
+def test_empty_plan(empty_side):
+    empty = BASE.iloc[:0]
+    baseline = empty if empty_side in ('baseline', 'both') else BASE
+    current = empty if empty_side in ('current', 'both') else CURRENT
+    diff = diff_plans(baseline, current)
+    assert list(diff.columns) == TABLE_COLUMNS + ['fila', 'fila base']
+    expected = {'baseline': [NEW] * 4, 'current': [REMOVED] * 4, 'both': []}[empty_side]
+    assert diff['Estado'].tolist() == expected
+    assert summarize(diff).sum() == len(expected)
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.xlsx'])
+def test_write_diff_round_trip(tmp_path, suffix):
+    diff = diff_plans(BASE, CURRENT)
+    path = str(tmp_path / f'cambios{suffix}')
+    write_diff(diff, path)
+    if suffix == '.xlsx':
+        table = pd.read_excel(path, sheet_name='Cambios')
+    else:
+        with open(path, 'rb') as f:
+            assert f.read(3) == b'\xef\xbb\xbf'
+        table = pd.read_csv(path, encoding='utf-8-sig')
+    assert list(table.columns) == TABLE_COLUMNS
+    assert sorted(table['Tareas']) == sorted(['Diseño', 'Pruebas', 'Compras', 'Formación', 'Cierre'])
+    assert np.isclose(table.set_index('Tareas').loc['Compras', 'Retraso fin'], 3)
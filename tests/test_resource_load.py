@@ -0,0 +1,88 @@
+import pandas as pd
+
+from src.utils.resource_load import resource_load, overloads, load_matrix
+
+
+def tasks(rows):
+    return pd.DataFrame(rows, columns=['Responsable', 'Tareas', 'Fecha Inicio', 'Fecha Fin']).astype({
+        'Fecha Inicio': 'datetime64[ns]', 'Fecha Fin': 'datetime64[ns]'
+    })
+
+
+def steps(load, owner):
+    rows = load[load['Responsable'] == owner]
+    return [(f"{date:%m-%d}", carga) for date, carga in zip(rows['Fecha'], rows['Carga'])]
+
+
+def test_back_to_back_tasks_do_not_overlap():
+    load = resource_load(tasks([
+        ('Ana', 'a', '2024-01-01', '2024-01-05'),
+        ('Ana', 'b', '2024-01-05', '2024-01-09'),
+    ]))
+    assert steps(load, 'Ana') == [('01-01', 1), ('01-09', 0)]
+    assert overloads(load, 1).empty
+
+
+def test_overlapping_tasks_make_an_overload():
+    load = resource_load(tasks([
+        ('Ana', 'a', '2024-01-01', '2024-01-05'),
+        ('Ana', 'b', '2024-01-03', '2024-01-09'),
+        ('Ana', 'c', '2024-01-04', '2024-01-06'),
+    ]))
+    assert steps(load, 'Ana') == [('01-01', 1), ('01-03', 2), ('01-04', 3), ('01-05', 2), ('01-06', 1),
+                                  ('01-09', 0)]
+    spans = overloads(load, 1)
+    # Los tramos seguidos por encima de la capacidad son uno, con la carga máxima
+    assert spans[['Responsable', 'Dias', 'Carga']].values.tolist() == [['Ana', 3, 3]]
+    assert spans['Inicio'].iloc[0] == pd.Timestamp('2024-01-03')
+    assert spans['Fin'].iloc[0] == pd.Timestamp('2024-01-06')
+
+
+def test_same_day_task_adds_no_load():
+    load = resource_load(tasks([
+        ('Ana', 'a', '2024-01-01', '2024-01-09'),
+        ('Ana', 'hito', '2024-01-04', '2024-01-04'),
+        ('Luis', 'hito', '2024-01-02', '2024-01-02'),
+    ]))
+    assert steps(load, 'Ana') == [('01-01', 1), ('01-09', 0)]
+    assert steps(load, 'Luis') == [('01-02', 0)]
+    assert (load['Carga'] >= 0).all()
+
+
+def test_capacity_per_owner():
+    load = resource_load(tasks([
+        ('Ana', 'a', '2024-01-01', '2024-01-05'),
+        ('Ana', 'b', '2024-01-02', '2024-01-05'),
+        ('Luis', 'c', '2024-01-01', '2024-01-05'),
+        ('Luis', 'd', '2024-01-02', '2024-01-05'),
+        ('Eva', 'e', '2024-01-01', '2024-01-05'),
+        ('Eva', 'f', '2024-01-01', '2024-01-05'),
+    ]))
+    # Eva no está en el dict: usa RESOURCE_CAPACITY (1)
+    spans = overloads(load, {'Ana': 2, 'Luis': 1})
+    assert sorted(spans['Responsable']) == ['Eva', 'Luis']
+    assert overloads(load, 2).empty
+
+
+def test_load_matrix_stacks_owners_on_shared_dates():
+    load = resource_load(tasks([
+        ('Ana', 'a', '2024-01-01', '2024-01-05'),
+        ('Luis', 'b', '2024-01-03', '2024-01-07'),
+        ('Luis', 'c', '2024-01-04', '2024-01-05'),
+    ]))
+    times, owners, matrix = load_matrix(load)
+    assert [f"{t:%m-%d}" for t in pd.to_datetime(times)] == ['01-01', '01-03', '01-04', '01-05', '01-07']
+    assert owners == ['Ana', 'Luis']
+    assert matrix.tolist() == [[1, 1, 1, 0, 0], [0, 1, 2, 1, 0]]
+
+
+def test_empty_input():
+    load = resource_load(tasks([]))
+    assert list(load.columns) == ['Responsable', 'Fecha', 'Carga']
+    assert load.empty
+    spans = overloads(load)
+    assert list(spans.columns) == ['Responsable', 'Inicio', 'Fin', 'Dias', 'Carga']
+    assert spans.empty
+    times, owners, matrix = load_matrix(load)
+    assert len(times) == 0 and owners == []
+    assert matrix.shape == (0, 0)
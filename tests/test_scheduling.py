@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.scheduling import Schedule
+
+
+def day(n):
+    return pd.Timestamp("2024-01-01") + pd.Timedelta(days=n)
+
+
+def days(values):
+    return [(pd.Timestamp(v) - day(0)).days for v in values]
+
+
+def chain():
+    # A(0-2) -> B(1-4) -> D(5-6); A -> C(2-3), C sin sucesoras
+    names = ["A", "B", "C", "D"]
+    starts = [day(0), day(1), day(2), day(5)]
+    ends = [day(2), day(4), day(3), day(6)]
+    preds = [None, "A", "a ", "B"]
+    return Schedule(names, starts, ends, preds)
+
+
+def test_forward_pass_pushes_successors_after_predecessors():
+    schedule = chain()
+    es, ef = schedule.dates()
+    # B no puede empezar antes de que acabe A; D empieza en su fecha, ya posterior a B
+    assert days(es) == [0, 2, 2, 5]
+    assert days(ef) == [2, 5, 3, 6]
+    assert list(schedule.delayed()) == [1]
+
+
+def test_backward_pass_gives_slack_and_critical_path():
+    schedule = chain()
+    assert days([np.datetime64(schedule.end, "ns")]) == [6]
+    assert list(schedule.slack_days()) == [0, 0, 3, 0]
+    assert list(schedule.critical()) == [True, True, False, True]
+
+
+def test_update_matches_full_rebuild():
+    schedule = chain()
+    visited = schedule.update(0, day(1), day(4))
+
+    names = ["A", "B", "C", "D"]
+    starts = [day(1), day(1), day(2), day(5)]
+    ends = [day(4), day(4), day(3), day(6)]
+    rebuilt = Schedule(names, starts, ends, [None, "A", "a ", "B"])
+
+    assert schedule.es == rebuilt.es
+    assert schedule.ef == rebuilt.ef
+    assert schedule.rest == rebuilt.rest
+    assert schedule.end == rebuilt.end
+    assert list(schedule.slack_days()) == list(rebuilt.slack_days())
+    assert visited >= 1
+
+
+def test_update_without_changes_elsewhere_stops_early():
+    schedule = chain()
+    # Acortar C (sin sucesoras) no toca B ni D hacia delante
+    visited = schedule.update(2, day(2), day(2))
+    assert visited <= 3
+    assert days(schedule.dates()[1]) == [2, 5, 2, 6]
+
+
+def test_unknown_predecessors_are_reported_and_ignored():
+    schedule = Schedule(["A", "B"], [day(0), day(0)], [day(1), day(1)], ["", "A; Fase X\nfase y "])
+    assert schedule.unknown == {"Fase X", "fase y"}
+    src, dst = schedule.links()
+    assert list(zip(src, dst)) == [(0, 1)]
+
+
+def test_names_match_ignoring_case_and_spacing():
+    schedule = Schedule(["Diseño  final", "Pruebas"], [day(0), day(0)], [day(3), day(1)],
+                        [None, "  diseño final "])
+    assert schedule.unknown == set()
+    assert days(schedule.dates()[0]) == [0, 3]
+
+
+def test_dependency_downstream_of_a_cycle_is_kept():
+    # A <-> B es un ciclo; C depende de A y D de C
+    names = ["A", "B", "C", "D"]
+    starts = [day(0), day(0), day(0), day(0)]
+    ends = [day(2), day(3), day(1), day(1)]
+    schedule = Schedule(names, starts, ends, ["B", "A", "A", "C"])
+
+    assert schedule.cycles == [0, 1]
+    src, dst = schedule.links()
+    assert sorted(zip(src.tolist(), dst.tolist())) == [(0, 2), (2, 3)]
+    assert len(schedule.order) == 4
+    assert days(schedule.dates()[0]) == [0, 0, 2, 3]
+
+
+def test_from_tasks_without_predecessors_column():
+    tasks = pd.DataFrame({"Tareas": ["A", "B"], "Fecha Inicio": [day(0), day(1)], "Fecha Fin": [day(2), day(3)]})
+    schedule = Schedule.from_tasks(tasks)
+    assert schedule.n_links == 0
+    assert schedule.cycles == []
+    assert list(schedule.critical()) == [False, True]